@@ -2,6 +2,8 @@
 import os
 from typing import Dict, Any, List
 
+from ..readers import pandas_read_code
+
 def generate_sample_code(file: str, metadata: Dict[str, Any], recommendations: List[Dict[str, Any]]) -> str:
     """
     Generate sample code for cleaning recommendations.
@@ -23,7 +25,7 @@ def generate_sample_code(file: str, metadata: Dict[str, Any], recommendations: L
         "import numpy as np",
         "",
         f"# Load the CSV file",
-        f"df = pd.read_csv('{os.path.basename(file)}', sep='{metadata['separator']}')",
+        f"df = {pandas_read_code(os.path.basename(file), metadata)}",
         "",
         "# Apply cleaning steps",
     ]
@@ -3,6 +3,7 @@ import numpy as np
 from typing import Dict, Any, List, Optional
 
 from .base import BaseCleaner, register_cleaner
+from ..core.utils import is_numeric_type, is_string_type
 
 @register_cleaner
 class MissingValueCleaner(BaseCleaner):
@@ -46,10 +47,10 @@ class MissingValueCleaner(BaseCleaner):
             if issue["null_percentage"] > 50:
                 # More than half missing, consider dropping
                 recommendations.append(self._create_drop_column_recommendation(column, issue, metadata))
-            elif np.issubdtype(np.dtype(col_type), np.number) and issue["null_percentage"] < 30:
+            elif is_numeric_type(col_type) and issue["null_percentage"] < 30:
                 # For numeric columns with reasonable amount of missing values, fill with median
                 recommendations.append(self._create_median_imputation_recommendation(column, issue))
-            elif col_type == "object" and issue["null_percentage"] < 30:
+            elif is_string_type(col_type) and issue["null_percentage"] < 30:
                 # For string columns with reasonable amount of missing values, fill with mode or 'Unknown'
                 recommendations.append(self._create_mode_imputation_recommendation(column, issue))
             else:
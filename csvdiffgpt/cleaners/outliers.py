@@ -44,27 +44,47 @@ class OutlierCleaner(BaseCleaner):
             # Recommend different strategies based on outlier percentage
             if issue["outlier_percentage"] > 10:
                 # Many outliers, might be bimodal or meaningful - suggest winsorizing or transforming
-                recommendations.append(self._create_winsorize_recommendation(column, issue))
+                percentiles = None
+                if metadata.get("profile_mode") == "streaming":
+                    # Only streaming percentiles cover every row, bounds of a sample would clip the whole file
+                    percentiles = metadata["columns"].get(column, {}).get("percentiles")
+                recommendations.append(self._create_winsorize_recommendation(column, issue, percentiles))
             elif issue["outlier_percentage"] < 5:
                 # Few outliers, could be errors - suggest removing or capping
                 recommendations.append(self._create_cap_outliers_recommendation(column, issue, outlier_threshold))
         
         return recommendations
     
-    def _create_winsorize_recommendation(self, column: str, issue: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_winsorize_recommendation(
+        self,
+        column: str,
+        issue: Dict[str, Any],
+        percentiles: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Create a recommendation to winsorize outliers."""
-        return {
+        percentiles = percentiles or {}
+        lower, upper = percentiles.get("p5"), percentiles.get("p95")
+        if lower is not None and upper is not None:
+            # Use the full-file percentiles from the profile, so the data is not scanned again
+            code = f"# Winsorize outliers (cap at 5th and 95th percentiles)\nlower_bound = {lower}\nupper_bound = {upper}\ndf['{column}'] = df['{column}'].clip(lower=lower_bound, upper=upper_bound)"
+        else:
+            code = f"# Winsorize outliers (cap at 5th and 95th percentiles)\nlower_bound = df['{column}'].quantile(0.05)\nupper_bound = df['{column}'].quantile(0.95)\ndf['{column}'] = df['{column}'].clip(lower=lower_bound, upper=upper_bound)"
+        
+        recommendation = {
             "issue_type": "outliers",
             "column": column,
             "action": "winsorize",
             "reason": f"Column has {issue['outlier_percentage']}% outliers",
-            "code": f"# Winsorize outliers (cap at 5th and 95th percentiles)\nlower_bound = df['{column}'].quantile(0.05)\nupper_bound = df['{column}'].quantile(0.95)\ndf['{column}'] = df['{column}'].clip(lower=lower_bound, upper=upper_bound)",
+            "code": code,
             "severity": "medium",
             "impact": {
                 "values_modified": int(issue["outlier_count"]),
                 "method": "winsorizing"
             }
         }
+        if lower is not None and upper is not None:
+            recommendation["impact"]["bounds"] = [lower, upper]
+        return recommendation
     
     def _create_cap_outliers_recommendation(self, column: str, issue: Dict[str, Any], outlier_threshold: float) -> Dict[str, Any]:
         """Create a recommendation to cap outliers based on z-score."""
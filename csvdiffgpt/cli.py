@@ -12,6 +12,49 @@ from .tasks.clean import clean
 from .tasks.generate_tests import generate_tests
 from .tasks.restructure import restructure
 from .tasks.explain_code import explain_code
+from .core.sketches import DEFAULT_DISTINCT_ERROR
+
+def _add_analysis_options(parser: argparse.ArgumentParser, cache: bool = True, streaming: bool = False) -> None:
+    """
+    Add the options controlling how a CSV file is read and analyzed.
+
+    Args:
+        parser: Subparser of a command that analyzes CSV files
+        cache: Whether to add the analysis cache options
+        streaming: Whether to add the streaming, incremental and worker options
+    """
+    parser.add_argument("--engine", default="c", choices=["c", "python", "pyarrow"],
+                        help="CSV parser to use (pyarrow needs the arrow extra)")
+    parser.add_argument("--sampling", default="head", choices=["head", "random"],
+                        help="Read the first rows or random blocks across the file when it exceeds --max-rows")
+    parser.add_argument("--seed", dest="random_state", type=int,
+                        help="Seed for random sampling")
+    parser.add_argument("--optimize-dtypes", action="store_true", default=False,
+                        help="Hold loaded data in compact dtypes to analyze more rows in the same memory")
+    parser.add_argument("--columns", nargs="+",
+                        help="Names or regular expressions of the columns to analyze (only these are parsed)")
+    parser.add_argument("--exclude-columns", dest="exclude_columns", nargs="+",
+                        help="Names or regular expressions of columns to leave out")
+    parser.add_argument("--approx-distinct", dest="approx_distinct", action="store_true", default=False,
+                        help="Estimate distinct counts with HyperLogLog sketches in fixed memory")
+    parser.add_argument("--distinct-error", dest="distinct_error", type=float, default=DEFAULT_DISTINCT_ERROR,
+                        help="Relative standard error of approximate distinct counts")
+    parser.add_argument("--compact-metadata", dest="compact_metadata", action="store_true", default=False,
+                        help="Hold column metadata in one typed table to save memory on very wide files")
+    parser.add_argument("--wide-mode", dest="wide_mode", action="store_true", default=False,
+                        help="Compute column statistics for batches of columns at once on very wide files")
+    if cache:
+        parser.add_argument("--cache", dest="use_cache", action="store_true", default=False,
+                            help="Reuse analysis results cached on disk for unchanged files")
+        parser.add_argument("--cache-dir", dest="cache_dir",
+                            help="Directory for the analysis cache (default: ~/.cache/csvdiffgpt)")
+    if streaming:
+        parser.add_argument("--streaming", action="store_true", default=False,
+                            help="Compute column statistics over the entire file in chunks")
+        parser.add_argument("--incremental", action="store_true", default=False,
+                            help="Save streaming statistics next to the file and only profile rows appended since the last run")
+        parser.add_argument("--workers", dest="n_workers", type=int,
+                            help="Number of threads analyzing columns in parallel")
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     """
@@ -47,6 +90,7 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     summarize_parser.add_argument("--model", help="Specific model to use")
     summarize_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                                 help="Skip LLM and return raw metadata (no API key needed)")
+    _add_analysis_options(summarize_parser, streaming=True)
     
     # Compare command
     compare_parser = subparsers.add_parser("compare", help="Compare two CSV files")
@@ -69,6 +113,17 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     compare_parser.add_argument("--model", help="Specific model to use")
     compare_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                               help="Skip LLM and return raw comparison data (no API key needed)")
+    _add_analysis_options(compare_parser, cache=False)
+    compare_parser.add_argument("--key", dest="key_columns", nargs="+",
+                              help="Columns identifying a row in both files for a row-level diff ('auto' to detect one)")
+    compare_parser.add_argument("--out-of-core", dest="out_of_core", action="store_true", default=False,
+                              help="Diff rows by spilling partitions to disk even when the files fit in the analyzed rows (needs --key or --keyless)")
+    compare_parser.add_argument("--spill-dir", dest="spill_dir",
+                              help="Directory for temporary partition files of --out-of-core (system default if not set)")
+    compare_parser.add_argument("--keyless", dest="keyless", action="store_true", default=False,
+                              help="Count added and removed rows by row fingerprints regardless of order, for files without a key")
+    compare_parser.add_argument("--digest", dest="use_digest", action="store_true", default=False,
+                              help="Compare order-independent digests of the entire files first, skipping the analysis if they match")
     
     # Validate command
     validate_parser = subparsers.add_parser("validate", help="Validate a CSV file for data quality issues")
@@ -95,6 +150,7 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     validate_parser.add_argument("--model", help="Specific model to use")
     validate_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                                help="Skip LLM and return raw validation results (no API key needed)")
+    _add_analysis_options(validate_parser, streaming=True)
     
     # Clean command
     clean_parser = subparsers.add_parser("clean", help="Recommend cleaning steps for a CSV file")
@@ -121,6 +177,7 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     clean_parser.add_argument("--model", help="Specific model to use")
     clean_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                             help="Skip LLM and return raw cleaning recommendations (no API key needed)")
+    _add_analysis_options(clean_parser)
     
     # Generate tests command
     tests_parser = subparsers.add_parser("generate-tests", help="Generate tests for a CSV file")
@@ -152,6 +209,7 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     tests_parser.add_argument("--model", help="Specific LLM model to use")
     tests_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                            help="Skip LLM and return raw test specifications (no API key needed)")
+    _add_analysis_options(tests_parser)
     tests_parser.add_argument("--output", "-o", help="Output file to save the generated tests")
     
     # Restructure command
@@ -184,6 +242,7 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     restructure_parser.add_argument("--model", help="Specific LLM model to use")
     restructure_parser.add_argument("--no-llm", dest="use_llm", action="store_false", default=True,
                                  help="Skip LLM and return raw restructuring recommendations (no API key needed)")
+    _add_analysis_options(restructure_parser)
     restructure_parser.add_argument("--output", "-o", help="Output file to save the generated code")
     
     # Explain code command
@@ -312,6 +371,7 @@ def print_or_save_result(result, output_file: Optional[str] = None):
                 f.write(result)
             else:
                 import json
+                from .core.profile_store import json_default
                 # Check if it's code output (special handling)
                 if isinstance(result, dict) and "code" in result:
                     f.write(result["code"])
@@ -320,7 +380,7 @@ def print_or_save_result(result, output_file: Optional[str] = None):
                 elif isinstance(result, dict) and "test_code" in result:
                     f.write(result["test_code"])
                 else:
-                    f.write(json.dumps(result, indent=2, default=str))
+                    f.write(json.dumps(result, indent=2, default=json_default))
         print(f"Result saved to {output_file}")
     else:
         # Print to console
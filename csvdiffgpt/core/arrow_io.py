@@ -0,0 +1,150 @@
+"""CSV reading with the PyArrow engine."""
+from typing import Any, Optional, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Cell values read as missing by the default pandas parser
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null"
+]
+
+
+def require_pyarrow(purpose: str = "use the pyarrow engine") -> None:
+    """Raise an ImportError with install instructions if pyarrow is missing."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError(
+            f"The 'pyarrow' package is required to {purpose}. "
+            "Install it with: pip install csvdiffgpt[arrow]"
+        )
+
+
+def _to_pandas(table: "pa.Table") -> pd.DataFrame:
+    """
+    Convert an Arrow table to a DataFrame with Arrow-backed string columns.
+
+    Dates, times and all-null columns are converted to the types the default
+    pandas parser produces, so metadata does not depend on the engine.
+
+    Args:
+        table: Table read from a CSV file
+
+    Returns:
+        A DataFrame with NumPy numeric columns and Arrow-backed string columns
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, pc.cast(table.column(i), pa.string()))
+        elif pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+
+    string_dtype = pd.StringDtype("pyarrow")
+    type_mapping = {pa.string(): string_dtype, pa.large_string(): string_dtype}
+    return table.to_pandas(types_mapper=type_mapping.get)
+
+
+def read_csv_arrow(
+    source: Any,
+    sep: str,
+    usecols: Optional[List[str]] = None,
+    nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Read a CSV file with the multithreaded Arrow CSV reader.
+
+    If Arrow cannot convert a column with the type it inferred from the first
+    block (e.g. integers followed by floats far into the file), the file is read
+    with the default pandas parser instead and string columns are converted to
+    Arrow-backed strings.
+
+    Args:
+        source: Path to the CSV file or a binary file object
+        sep: Separator character
+        usecols: Columns to read (all columns if None)
+        nrows: Maximum number of rows to read (all rows if None)
+
+    Returns:
+        A DataFrame with Arrow-backed string columns
+    """
+    require_pyarrow()
+    read_options = pa_csv.ReadOptions(use_threads=True)
+    parse_options = pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True)
+    # Missing strings are read as nulls, like the default pandas parser does
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=usecols, null_values=PANDAS_NA_VALUES, strings_can_be_null=True
+    )
+
+    try:
+        if nrows is None:
+            table = pa_csv.read_csv(
+                source,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options
+            )
+        else:
+            # Stop reading as soon as enough rows have been parsed
+            reader = pa_csv.open_csv(
+                source,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options
+            )
+            batches = []
+            row_total = 0
+            while row_total < nrows:
+                try:
+                    batch = reader.read_next_batch()
+                except StopIteration:
+                    break
+                batches.append(batch)
+                row_total += batch.num_rows
+            table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, nrows)
+    except pa.ArrowInvalid:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = pd.read_csv(source, sep=sep, usecols=usecols, nrows=nrows)
+        string_columns = df.select_dtypes(include=["object"]).columns
+        return df.astype({col: pd.StringDtype("pyarrow") for col in string_columns})
+
+    return _to_pandas(table)
+
+
+def is_arrow_string(values: pd.Series) -> bool:
+    """
+    Check whether a Series holds Arrow-backed strings.
+
+    Args:
+        values: Series to check
+
+    Returns:
+        True if the Series uses a pyarrow string dtype
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return str(dtype.storage).startswith("pyarrow")
+    return isinstance(dtype, pd.ArrowDtype) and pa.types.is_string(dtype.pyarrow_dtype)
+
+
+def arrow_string_lengths(values: pd.Series) -> np.ndarray:
+    """
+    Measure string lengths with the Arrow UTF-8 length kernel.
+
+    Args:
+        values: Non-null values of an Arrow-backed string column
+
+    Returns:
+        Float array with the number of characters of each value
+    """
+    return pc.utf8_length(pa.array(values)).to_numpy(zero_copy_only=False).astype(np.float64)
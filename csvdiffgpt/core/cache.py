@@ -0,0 +1,173 @@
+"""Persistent on-disk cache for analysis results."""
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+
+# Default location of the cache directory (can be overridden with CSVDIFFGPT_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "csvdiffgpt")
+
+# Number of bytes hashed from each sampled block of a file
+SAMPLE_BLOCK_SIZE = 64 * 1024
+
+
+def file_fingerprint(file_path: str, block_size: int = SAMPLE_BLOCK_SIZE) -> Dict[str, Any]:
+    """
+    Build a cheap fingerprint of a file's current contents.
+
+    Instead of hashing the whole file, the head, middle and tail blocks are
+    hashed together with the file size and modification time.
+
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes hashed from each sampled block
+
+    Returns:
+        Dictionary with the absolute path, size, mtime and sampled content hash
+    """
+    stat = os.stat(file_path)
+    size = stat.st_size
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(file_path, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - block_size // 2), max(0, size - block_size)}):
+            f.seek(offset)
+            digest.update(f.read(block_size))
+
+    return {
+        "path": os.path.abspath(file_path),
+        "size": size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sample_hash": digest.hexdigest()
+    }
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache for preprocessor metadata and task results.
+
+    Entries are stored as pickle files in a local directory. The directory is
+    kept under a size limit by evicting the least recently used entries.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: float = 512):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to CSVDIFFGPT_CACHE_DIR
+                or ~/.cache/csvdiffgpt)
+            max_size_mb: Maximum total size of the cache directory in megabytes
+        """
+        self.cache_dir = cache_dir or os.environ.get("CSVDIFFGPT_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, file_path: str, namespace: str, params: Dict[str, Any]) -> str:
+        """
+        Build a cache key for an analysis of a file.
+
+        Args:
+            file_path: Path to the analyzed file
+            namespace: Kind of result being cached (e.g. 'metadata', 'validation')
+            params: Analysis parameters that affect the result
+
+        Returns:
+            A hex string identifying the cache entry
+        """
+        key_data = {
+            "namespace": namespace,
+            "file": file_fingerprint(file_path),
+            "params": params
+        }
+        encoded = json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached value, or None if there is no usable entry
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry, drop it
+            self._remove(entry_path)
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache and evict old entries if needed.
+
+        Args:
+            key: Cache key from make_key
+            value: Picklable value to store
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception:
+            self._remove(temp_path)
+            raise
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    def _entry_path(self, key: str) -> str:
+        """Get the file path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its size limit."""
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            entry_path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        # Oldest entries first
+        for _, entry_size, entry_path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            self._remove(entry_path)
+            total_size -= entry_size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Remove a file, ignoring errors."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
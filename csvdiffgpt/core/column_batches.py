@@ -0,0 +1,501 @@
+"""Column statistics computed over typed batches of columns for wide tables."""
+import hashlib
+import warnings
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sketches import HyperLogLog, hash_values, _bit_length
+from .column_profile import ColumnProfile, FIELD_GROUPS
+from .string_lengths import value_lengths
+
+# Approximate memory limit of one batch of columns
+COLUMN_BATCH_BYTES = 64 * 1024 * 1024
+
+# Number of example values picked per column
+EXAMPLE_COUNT = 5
+
+# Columns with fewer distinct values get a value distribution
+DISTRIBUTION_MAX_UNIQUE = 20
+
+
+def column_kind(dtype: Any) -> str:
+    """
+    Classify a column dtype for batching.
+
+    Args:
+        dtype: Dtype of the column
+
+    Returns:
+        'numeric' for plain NumPy numbers, 'string' for object, string and
+        categorical columns, 'datetime' or 'other'
+    """
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return "numeric"
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == "object" or str(dtype).startswith("string"):
+        return "string"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "other"
+
+
+def typed_batches(
+    df: pd.DataFrame,
+    columns: Optional[List[Any]] = None,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    Group columns into batches of the same kind.
+
+    Numeric and other non-string columns are grouped by dtype so a batch
+    converts to one 2-D NumPy block without copies to a common type, and
+    values of different types (e.g. True and 1) never share a batch. Batches are limited to about
+    batch_bytes of memory.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Columns to batch (all columns if None)
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Yields:
+        Tuples of (kind, list of columns)
+    """
+    groups: Dict[Any, List[Any]] = {}
+    kinds: Dict[Any, str] = {}
+    for col in (df.columns if columns is None else columns):
+        dtype = df[col].dtype
+        kind = column_kind(dtype)
+        key = kind if kind == "string" else dtype
+        groups.setdefault(key, []).append(col)
+        kinds[key] = kind
+
+    batch_size = max(1, batch_bytes // (max(len(df), 1) * 8))
+    for key, group in groups.items():
+        for start in range(0, len(group), batch_size):
+            yield kinds[key], group[start:start + batch_size]
+
+
+def _flatten(df: pd.DataFrame, batch: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten a batch of columns into one array of values, column after column.
+
+    Args:
+        df: DataFrame holding the columns
+        batch: Columns of one batch
+
+    Returns:
+        Tuple of (values, index of the column of each value)
+    """
+    values = df[batch].to_numpy(dtype=object).ravel(order="F")
+    codes = np.repeat(np.arange(len(batch)), len(df))
+    return values, codes
+
+
+def _segment_reduce(
+    ufunc: np.ufunc,
+    values: np.ndarray,
+    codes: np.ndarray,
+    counts: np.ndarray,
+    n_columns: int
+) -> np.ndarray:
+    """
+    Reduce values grouped by sorted column codes, with NaN for empty columns.
+
+    Args:
+        ufunc: Reduction, e.g. np.fmin
+        values: Values sorted by column code
+        codes: Column code of each value
+        counts: Number of values per column
+        n_columns: Number of columns
+
+    Returns:
+        Array with the reduced value of each column
+    """
+    result = np.full(n_columns, np.nan)
+    present = counts > 0
+    if present.any():
+        starts = np.searchsorted(codes, np.arange(n_columns))
+        result[present] = ufunc.reduceat(values, starts[present])
+    return result
+
+
+def string_length_stats(
+    df: pd.DataFrame,
+    columns: List[Any],
+    as_str: bool = False,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Compute null counts and string length statistics of many columns at once.
+
+    The values of a batch of columns are measured in one pass and reduced per
+    column with grouped NumPy operations.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: String-like columns to measure
+        as_str: Whether to measure every non-null value as a string; otherwise
+            non-string values have no length, as with Series.str.len
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Returns:
+        Dictionary mapping each column to its nulls, count of measured values
+        and min_length, max_length, avg_length and std_length (None without
+        measured values)
+    """
+    stats: Dict[Any, Dict[str, Any]] = {}
+    for _, batch in typed_batches(df, columns, batch_bytes):
+        values, codes = _flatten(df, batch)
+        null_mask = pd.isna(values)
+        nulls = np.bincount(codes[null_mask], minlength=len(batch))
+
+        lengths = value_lengths(pd.Series(values[~null_mask], dtype=object), as_str)
+        codes = codes[~null_mask]
+        measured = ~np.isnan(lengths)
+        lengths, codes = lengths[measured], codes[measured]
+
+        counts = np.bincount(codes, minlength=len(batch))
+        with np.errstate(all="ignore"):
+            means = np.bincount(codes, weights=lengths, minlength=len(batch)) / counts
+            squares = np.bincount(codes, weights=(lengths - means[codes]) ** 2, minlength=len(batch))
+            stds = np.sqrt(squares / (counts - 1))
+        mins = _segment_reduce(np.fmin, lengths, codes, counts, len(batch))
+        maxs = _segment_reduce(np.fmax, lengths, codes, counts, len(batch))
+
+        for i, col in enumerate(batch):
+            has_lengths = counts[i] > 0
+            stats[col] = {
+                "nulls": int(nulls[i]),
+                "count": int(counts[i]),
+                "min_length": int(mins[i]) if has_lengths else None,
+                "max_length": int(maxs[i]) if has_lengths else None,
+                "avg_length": float(means[i]) if has_lengths else None,
+                "std_length": float(stds[i]) if counts[i] > 1 else None
+            }
+    return stats
+
+
+def numeric_outlier_stats(
+    df: pd.DataFrame,
+    columns: List[Any],
+    threshold: float,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Count z-score outliers of many numeric columns at once.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Numeric columns to check
+        threshold: Z-score above which a value is an outlier
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Returns:
+        Dictionary mapping each column to its null fraction, mean, std
+        (ddof=1), min, max and number of outliers
+    """
+    stats: Dict[Any, Dict[str, Any]] = {}
+    batch_size = max(1, batch_bytes // (max(len(df), 1) * 8))
+    for start in range(0, len(columns), batch_size):
+        batch = columns[start:start + batch_size]
+        block = df[batch].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            null_fractions = np.isnan(block).mean(axis=0) if len(block) else np.full(len(batch), np.nan)
+            means = np.nanmean(block, axis=0)
+            stds = np.nanstd(block, axis=0, ddof=1)
+            mins = np.nanmin(block, axis=0)
+            maxs = np.nanmax(block, axis=0)
+            outliers = (np.abs((block - means) / stds) > threshold).sum(axis=0)
+
+        for i, col in enumerate(batch):
+            stats[col] = {
+                "null_fraction": float(null_fractions[i]),
+                "mean": float(means[i]),
+                "std": float(stds[i]),
+                "min": float(mins[i]),
+                "max": float(maxs[i]),
+                "outliers": int(outliers[i])
+            }
+    return stats
+
+
+def distinct_counts(
+    df: pd.DataFrame,
+    columns: List[Any],
+    distinct_error: Optional[float] = None,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Dict[Any, int]:
+    """
+    Count the distinct non-null values of many columns at once.
+
+    Exact counts sort numeric blocks column-wise in their own dtype and
+    factorize the values of other batches once. Approximate counts hash each batch once and fill the
+    HyperLogLog registers of all its columns together.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Columns to count
+        distinct_error: Relative error of approximate counts (exact if None)
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Returns:
+        Dictionary mapping each column to its distinct count
+    """
+    counts: Dict[Any, int] = {}
+    for kind, batch in typed_batches(df, columns, batch_bytes):
+        if distinct_error is not None:
+            batch_counts = _approx_distinct_batch(df, batch, kind, distinct_error)
+        elif kind == "numeric":
+            # Batches share one dtype, so integers are sorted exactly as integers
+            block = np.sort(df[batch].to_numpy(), axis=0)
+            valid = ~np.isnan(block) if block.dtype.kind == "f" else np.ones(block.shape, dtype=bool)
+            changes = (block[1:] != block[:-1]) & valid[1:]
+            batch_counts = (valid[:1].sum(axis=0) + changes.sum(axis=0)) if len(block) else np.zeros(len(batch))
+        else:
+            values, codes = _flatten(df, batch)
+            value_codes, uniques = pd.factorize(values)
+            valid = value_codes >= 0
+            pairs = np.unique(codes[valid] * max(len(uniques), 1) + value_codes[valid])
+            batch_counts = np.bincount(pairs // max(len(uniques), 1), minlength=len(batch))
+        counts.update((col, int(count)) for col, count in zip(batch, batch_counts))
+    return counts
+
+
+def _approx_distinct_batch(df: pd.DataFrame, batch: List[Any], kind: str, error_rate: float) -> np.ndarray:
+    """
+    Estimate distinct counts of a batch of columns with one HyperLogLog per column.
+
+    Args:
+        df: DataFrame holding the columns
+        batch: Columns of one batch
+        kind: Kind of the batch (from column_kind)
+        error_rate: Target relative standard error
+
+    Returns:
+        Array with the estimated distinct count of each column
+    """
+    if kind == "numeric":
+        values = pd.Series(df[batch].to_numpy().ravel(order="F"))
+        codes = np.repeat(np.arange(len(batch)), len(df))
+    else:
+        flat, codes = _flatten(df, batch)
+        values = pd.Series(flat, dtype=object)
+    valid = values.notna().to_numpy()
+    values, codes = values[valid], codes[valid]
+
+    # Each column gets its own row of registers, filled like HyperLogLog.update
+    sketch = HyperLogLog(error_rate)
+    registers = np.zeros((len(batch), len(sketch.registers)), dtype=np.uint8)
+    if len(values):
+        hashes = hash_values(values)
+        value_bits = 64 - sketch.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+        ranks = (value_bits - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(registers, (codes, index), ranks)
+
+    estimates = np.zeros(len(batch), dtype=np.int64)
+    for i in range(len(batch)):
+        sketch.registers = registers[i]
+        estimates[i] = sketch.count()
+    return estimates
+
+
+def pick_examples(
+    df: pd.DataFrame,
+    limits: Dict[Any, int],
+    random_state: Optional[int] = None
+) -> Dict[Any, List[Any]]:
+    """
+    Pick random example values of many columns from one shuffle of the rows.
+
+    Rows are visited in one random order shared by all columns, and each
+    column takes its first non-null values in that order, which is a random
+    sample without replacement of its non-null values.
+
+    Args:
+        df: DataFrame holding the columns
+        limits: Number of examples to pick per column
+        random_state: Seed of the shuffle
+
+    Returns:
+        Dictionary mapping each column to its example values
+    """
+    examples: Dict[Any, List[Any]] = {col: [] for col in limits}
+    pending = [col for col, limit in limits.items() if limit > 0]
+    order = np.random.default_rng(random_state).permutation(len(df))
+
+    # Read more rows only for columns that are still short of examples
+    start, step = 0, 64
+    while pending and start < len(order):
+        rows = order[start:start + step]
+        block = df[pending].iloc[rows].to_numpy(dtype=object)
+        null_mask = pd.isna(block)
+        for j, col in enumerate(pending):
+            needed = limits[col] - len(examples[col])
+            column_values = block[~null_mask[:, j], j]
+            examples[col].extend(column_values[:needed].tolist())
+        pending = [col for col in pending if len(examples[col]) < limits[col]]
+        start += step
+        step *= 4
+    return examples
+
+
+def value_distributions(
+    df: pd.DataFrame,
+    columns: List[Any],
+    top: int = 10,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Dict[Any, Dict[str, float]]:
+    """
+    Compute the share of the most common values of many columns at once.
+
+    Matches Series.value_counts(normalize=True).head(top): values are
+    ordered by count, ties by first appearance.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Low-cardinality columns
+        top: Number of values reported per column
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Returns:
+        Dictionary mapping each column to its value percentages, keyed by the
+        string form of the values
+    """
+    distributions: Dict[Any, Dict[str, float]] = {col: {} for col in columns}
+    for kind, batch in typed_batches(df, columns, batch_bytes):
+        if kind == "string":
+            values, codes = _flatten(df, batch)
+        else:
+            # Keep the dtype so values print as the column's own scalars
+            values = pd.concat([df[col] for col in batch], ignore_index=True)
+            codes = np.repeat(np.arange(len(batch)), len(df))
+        counts = pd.DataFrame({"column": codes, "value": values}).groupby(
+            ["column", "value"], sort=False, observed=True
+        ).size()
+        if counts.empty:
+            continue
+
+        column_codes = counts.index.get_level_values(0).to_numpy()
+        keys = counts.index.get_level_values(1)
+        sizes = counts.to_numpy()
+        first_seen = np.arange(len(counts))
+        order = np.lexsort((first_seen, -sizes, column_codes))
+        totals = np.bincount(column_codes, weights=sizes, minlength=len(batch))
+
+        ranks = pd.Series(column_codes[order]).groupby(column_codes[order]).cumcount().to_numpy()
+        for position in order[ranks < top].tolist():
+            code = column_codes[position]
+            share = round(float(sizes[position] / totals[code]) * 100, 2)
+            distributions[batch[code]][str(keys[position])] = share
+    return distributions
+
+
+def column_fingerprints(
+    df: pd.DataFrame,
+    columns: Optional[List[Any]] = None,
+    batch_bytes: int = COLUMN_BATCH_BYTES
+) -> Dict[Any, str]:
+    """
+    Fingerprint the string form of many columns at once.
+
+    Columns whose values print the same in every row (missing values as
+    'nan') get the same fingerprint. Each batch is converted to strings and
+    hashed in one call.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Columns to fingerprint (all columns if None)
+        batch_bytes: Approximate maximum size of a batch in bytes
+
+    Returns:
+        Dictionary mapping each column to a hex digest of its values
+    """
+    columns = list(df.columns) if columns is None else columns
+    fingerprints: Dict[Any, str] = {}
+    batch_size = max(1, batch_bytes // (max(len(df), 1) * 64))
+    for start in range(0, len(columns), batch_size):
+        batch = columns[start:start + batch_size]
+        values = df[batch].astype(str).to_numpy(dtype=object).ravel(order="F")
+        hashes = pd.util.hash_array(values).reshape(len(batch), len(df))
+        for col, col_hashes in zip(batch, hashes):
+            fingerprints[col] = hashlib.blake2b(col_hashes.tobytes(), digest_size=16).hexdigest()
+    return fingerprints
+
+
+def profile_columns(
+    df: pd.DataFrame,
+    numeric_stats: Dict[Any, Dict[str, Any]],
+    distinct_error: Optional[float] = None,
+    random_state: Optional[int] = None,
+    batch_bytes: int = COLUMN_BATCH_BYTES,
+    length_stats: Optional[Dict[Any, Dict[str, Any]]] = None
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Compute the metadata of every column with batched operations.
+
+    Produces the same fields as ColumnProfile, but each statistic is computed
+    for all columns of a batch at once, so the number of pandas calls grows
+    with the number of batches rather than the number of columns.
+
+    Args:
+        df: DataFrame to profile
+        numeric_stats: Batched statistics of numeric columns
+            (from _numeric_column_stats)
+        distinct_error: Relative error of approximate distinct counts
+            (counted exactly if None)
+        random_state: Seed for picking examples
+        batch_bytes: Approximate maximum size of a batch in bytes
+        length_stats: String length statistics already measured for the string
+            columns (from string_length_stats)
+
+    Returns:
+        Dictionary mapping each column to its metadata
+    """
+    columns = list(df.columns)
+    row_count = len(df)
+    null_counts = df.isna().sum().to_numpy()
+    unique_counts = distinct_counts(df, columns, distinct_error, batch_bytes)
+    string_columns = [col for col in columns if column_kind(df[col].dtype) == "string"]
+    if length_stats is None:
+        length_stats = string_length_stats(df, string_columns, batch_bytes=batch_bytes)
+    lengths = {col: length_stats[col] for col in string_columns}
+
+    non_null_counts = {col: row_count - int(nulls) for col, nulls in zip(columns, null_counts)}
+    examples = pick_examples(
+        df,
+        {col: min(EXAMPLE_COUNT, unique_counts[col], non_null_counts[col]) for col in columns},
+        random_state
+    )
+    low_cardinality = [col for col in columns if 0 < unique_counts[col] < DISTRIBUTION_MAX_UNIQUE]
+    distributions = value_distributions(df, low_cardinality, batch_bytes=batch_bytes)
+
+    profiles: Dict[Any, Dict[str, Any]] = {}
+    for col, nulls in zip(columns, null_counts):
+        col_meta: Dict[str, Any] = {
+            "type": str(df[col].dtype),
+            "nulls": int(nulls),
+            "null_percentage": round(float(nulls) / row_count * 100, 2) if row_count else float("nan"),
+            "unique_count": unique_counts[col]
+        }
+        if col in numeric_stats:
+            col_meta.update({key: value for key, value in numeric_stats[col].items() if FIELD_GROUPS.get(key) == "stats"})
+        elif col in lengths:
+            if lengths[col]["count"]:
+                col_meta.update({
+                    "min_length": lengths[col]["min_length"],
+                    "max_length": lengths[col]["max_length"],
+                    "avg_length": round(lengths[col]["avg_length"], 2)
+                })
+        else:
+            # Types without a batched path (e.g. nullable integers)
+            col_meta.update(ColumnProfile(df[col])._group("stats"))
+        col_meta["examples"] = examples[col]
+        if col in distributions:
+            col_meta["value_distribution"] = distributions[col]
+        profiles[col] = col_meta
+    return profiles
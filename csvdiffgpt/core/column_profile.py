@@ -0,0 +1,294 @@
+"""Column metadata that computes its statistics on first access."""
+import threading
+from typing import Dict, Any, List, Optional, Union, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .utils import is_numeric_type
+from .arrow_io import is_arrow_string
+from .profiler import PROFILE_PERCENTILES, percentile_fields
+from .sketches import approx_distinct
+from .string_lengths import string_length_summary
+
+# Statistic groups in the order their fields appear in column metadata
+GROUP_FIELDS: Dict[str, List[str]] = {
+    "basic": ["type", "nulls", "null_percentage"],
+    "unique": ["unique_count"],
+    "stats": [
+        "min", "max", "mean", "median", "std", "percentiles",
+        "min_length", "max_length", "avg_length"
+    ],
+    "examples": ["examples"],
+    "distribution": ["value_distribution"]
+}
+
+# Group computing each field
+FIELD_GROUPS = {field: group for group, fields in GROUP_FIELDS.items() for field in fields}
+
+
+class ColumnProfile(dict):
+    """
+    Metadata of one column, computed one group of statistics at a time.
+
+    Behaves like the metadata dictionary of the column. Reading a field
+    computes the group it belongs to (e.g. all string length statistics) and
+    keeps the result, so reading only types and null counts never computes
+    examples or value distributions. Iterating, comparing, copying or
+    serializing the profile computes every group. Assigned fields replace
+    computed ones.
+
+    Profiles may be read from several threads at once (e.g. by the stages of
+    a task graph): computing groups and reading fields hold a lock, so no
+    reader sees a partly computed or reordered profile.
+    """
+
+    def __init__(
+        self,
+        col_data: pd.Series,
+        numeric_stats: Optional[Union[Dict[str, Any], Callable[[], Optional[Dict[str, Any]]]]] = None,
+        distinct_error: Optional[float] = None,
+        length_stats: Optional[Union[Dict[str, Any], Callable[[], Dict[str, Any]]]] = None
+    ):
+        """
+        Initialize a profile, computing only the type and null counts.
+
+        Args:
+            col_data: Values of the column
+            numeric_stats: Precomputed statistics of a numeric column, or a function
+                returning them (None for columns without batched statistics)
+            distinct_error: Relative error of an approximate distinct count
+                (counted exactly if None)
+            length_stats: String length statistics of the column from
+                string_length_summary, or a function returning them (measured
+                here if None)
+        """
+        super().__init__()
+        self.col_data = col_data
+        self.numeric_stats = numeric_stats
+        self.distinct_error = distinct_error
+        self.length_stats = length_stats
+        # Statistic groups computed so far and fields assigned by the caller
+        self.computed: Dict[str, Dict[str, Any]] = {}
+        self.assigned: set = set()
+        self._non_null: Optional[pd.Series] = None
+        # Reentrant, as computing a group may read another one
+        self._lock = threading.RLock()
+        # The basic fields are cheap, and a non-empty dictionary makes the C JSON
+        # encoder go through items() instead of printing {}
+        self._group("basic")
+
+    # Computing statistic groups
+
+    @property
+    def non_null_values(self) -> pd.Series:
+        """Non-null values of the column."""
+        if self._non_null is None:
+            self._non_null = self.col_data.dropna()
+        return self._non_null
+
+    def _compute_basic(self) -> Dict[str, Any]:
+        """Compute the type and null counts."""
+        null_mask = self.col_data.isna()
+        return {
+            "type": str(self.col_data.dtype),
+            "nulls": int(null_mask.sum()),
+            "null_percentage": round(null_mask.mean() * 100, 2)
+        }
+
+    def _compute_unique(self) -> Dict[str, Any]:
+        """Compute the number of distinct values."""
+        if self.distinct_error is not None:
+            return {"unique_count": approx_distinct(self.non_null_values, self.distinct_error)}
+        return {"unique_count": int(self.col_data.nunique())}
+
+    def _compute_stats(self) -> Dict[str, Any]:
+        """Compute numeric statistics or string lengths, depending on the type."""
+        col_data = self.col_data
+        numeric_stats = self.numeric_stats() if callable(self.numeric_stats) else self.numeric_stats
+        stats: Dict[str, Any] = {}
+
+        if numeric_stats is not None:
+            # Numeric columns computed in batch
+            stats.update({key: value for key, value in numeric_stats.items() if FIELD_GROUPS.get(key) == "stats"})
+        elif is_numeric_type(col_data.dtype):
+            # Numeric columns
+            col_min = col_data.min()
+            col_max = col_data.max()
+            col_mean = col_data.mean()
+            col_median = col_data.median()
+            col_std = col_data.std()
+            stats.update({
+                "min": col_min if not pd.isna(col_min) else None,
+                "max": col_max if not pd.isna(col_max) else None,
+                "mean": round(float(col_mean), 2) if not pd.isna(col_mean) else None,
+                "median": round(float(col_median), 2) if not pd.isna(col_median) else None,
+                "std": round(float(col_std), 2) if not pd.isna(col_std) else None
+            })
+            if not pd.isna(col_median):
+                stats["percentiles"] = percentile_fields(
+                    col_data.quantile([p / 100 for p in PROFILE_PERCENTILES]).to_numpy(dtype=np.float64)
+                )
+        elif (isinstance(col_data.dtype, pd.CategoricalDtype) or is_arrow_string(col_data)
+              or col_data.dtype == 'object' or col_data.dtype == 'string'):
+            # String columns, measured once and shared with validation
+            length_stats = self.length_stats() if callable(self.length_stats) else self.length_stats
+            if length_stats is None:
+                length_stats = string_length_summary(col_data)
+            if length_stats["count"] > 0:
+                stats.update({
+                    "min_length": length_stats["min_length"],
+                    "max_length": length_stats["max_length"],
+                    "avg_length": round(length_stats["avg_length"], 2)
+                })
+        return stats
+
+    def _compute_examples(self) -> Dict[str, Any]:
+        """Pick up to 5 example values."""
+        non_null_values = self.non_null_values
+        try:
+            examples = non_null_values.sample(min(5, self._group("unique")["unique_count"])).tolist()
+        except:
+            # If sampling fails, get first few non-null values
+            examples = non_null_values.iloc[:5].tolist()
+        return {"examples": examples}
+
+    def _compute_distribution(self) -> Dict[str, Any]:
+        """Compute the share of the top values for categorical-like columns."""
+        unique_count = self._group("unique")["unique_count"]
+        if unique_count < 20 and unique_count > 0:
+            value_counts = self.col_data.value_counts(normalize=True).head(10).to_dict()
+            return {"value_distribution": {str(k): round(float(v) * 100, 2) for k, v in value_counts.items()}}
+        return {}
+
+    def _group(self, group: str) -> Dict[str, Any]:
+        """
+        Get the fields of a statistic group, computing them on first use.
+
+        Args:
+            group: Name of the group (a key of GROUP_FIELDS)
+
+        Returns:
+            Dictionary of the fields computed by the group
+        """
+        with self._lock:
+            if group not in self.computed:
+                fields = getattr(self, f"_compute_{group}")()
+                self.computed[group] = fields
+                for key, value in fields.items():
+                    if key not in self.assigned:
+                        dict.__setitem__(self, key, value)
+            return self.computed[group]
+
+    def _ensure(self, key: Any) -> None:
+        """Compute the group of a field unless the field was assigned."""
+        group = FIELD_GROUPS.get(key) if isinstance(key, str) else None
+        if group is not None and key not in self.assigned:
+            self._group(group)
+
+    def compute_all(self) -> "ColumnProfile":
+        """
+        Compute every statistic group.
+
+        Returns:
+            This profile, with fields in the usual metadata order
+        """
+        with self._lock:
+            if len(self.computed) < len(GROUP_FIELDS):
+                for group in GROUP_FIELDS:
+                    self._group(group)
+                # Keep the field order of eagerly computed metadata, assigned extra fields last
+                fields = dict(dict.items(self))
+                ordered = {key: fields.pop(key) for key in FIELD_GROUPS if key in fields}
+                ordered.update(fields)
+                dict.clear(self)
+                dict.update(self, ordered)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get all fields as a plain dictionary.
+
+        Returns:
+            Dictionary of column metadata
+        """
+        with self._lock:
+            return dict(dict.items(self.compute_all()))
+
+    # Dictionary interface
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            self._ensure(key)
+            return dict.__getitem__(self, key)
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            self._ensure(key)
+            return dict.__contains__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            self._ensure(key)
+            return dict.get(self, key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self.assigned.add(key)
+            dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            self._ensure(key)
+            self.assigned.add(key)
+            dict.__delitem__(self, key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        with self._lock:
+            self._ensure(key)
+            self.assigned.add(key)
+            return dict.pop(self, key, *default)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __iter__(self) -> Iterator[Any]:
+        return dict.__iter__(self.compute_all())
+
+    def __len__(self) -> int:
+        return dict.__len__(self.compute_all())
+
+    def keys(self) -> Any:
+        return dict.keys(self.compute_all())
+
+    def values(self) -> Any:
+        return dict.values(self.compute_all())
+
+    def items(self) -> Any:
+        return dict.items(self.compute_all())
+
+    def copy(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ColumnProfile):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def __reduce__(self) -> Any:
+        # Pickled (e.g. cached) profiles become plain dictionaries without the column data
+        return (dict, (self.to_dict(),))
@@ -0,0 +1,70 @@
+"""Transparent decompression of compressed CSV files."""
+import io
+import os
+import gzip
+import bz2
+import lzma
+from typing import Optional, BinaryIO
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+# Compression formats by file extension (the names pandas uses for them)
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd"
+}
+
+
+def require_zstandard() -> None:
+    """Raise an ImportError with install instructions if zstandard is missing."""
+    if not ZSTANDARD_AVAILABLE:
+        raise ImportError(
+            "The 'zstandard' package is required to read .zst files. "
+            "Install it with: pip install csvdiffgpt[zstd]"
+        )
+
+
+def get_compression(file_path: str) -> Optional[str]:
+    """
+    Get the compression format of a file from its extension.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        'gzip', 'bz2', 'xz' or 'zstd', or None for uncompressed files
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def open_binary(file_path: str) -> BinaryIO:
+    """
+    Open a file for reading its decompressed bytes as a stream.
+
+    Data is decompressed while it is read, nothing is written to disk.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        A binary file object (the file itself if it is not compressed)
+    """
+    compression = get_compression(file_path)
+    if compression == "gzip":
+        return gzip.open(file_path, 'rb')
+    if compression == "bz2":
+        return bz2.open(file_path, 'rb')
+    if compression == "xz":
+        return lzma.open(file_path, 'rb')
+    if compression == "zstd":
+        require_zstandard()
+        # The zstandard reader has no readline, buffer it for line-based reads
+        return io.BufferedReader(zstandard.open(file_path, 'rb'))
+    return open(file_path, 'rb')
+
@@ -0,0 +1,727 @@
+"""Row-level differences between two tables matched on key columns."""
+import itertools
+import math
+import os
+import pickle
+import re
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+# Column names that suggest a row identifier
+KEY_NAME_PATTERN = re.compile(r"(^|[_\s])(id|key|uuid|guid|code)$|^id[_\s]|[a-z]Id$", re.IGNORECASE)
+
+# Number of added, removed and changed rows listed in a diff
+DIFF_EXAMPLE_ROWS = 20
+
+# Target size in MB of the part of an input file held in one out-of-core partition
+DIFF_PARTITION_MB = 64
+
+# Multiplier combining the hashes of several columns
+PARTITION_HASH_MULTIPLIER = 1000003
+
+# Hash of missing values in row fingerprints
+NULL_HASH = 0x9E3779B97F4A7C15
+
+# Mixed into the hashes of non-integer floats
+FLOAT_HASH_TAG = 0xC2B2AE3D27D4EB4F
+
+
+def detect_key_columns(df1: pd.DataFrame, df2: pd.DataFrame) -> Optional[List[str]]:
+    """
+    Find a column identifying the rows of both tables.
+
+    Candidates are common columns without nulls whose values are unique in
+    both tables. Columns named like identifiers (e.g. 'id', 'customer_id')
+    are tried first, and floating point columns are never used.
+
+    Args:
+        df1: First table
+        df2: Second table
+
+    Returns:
+        List with the name of the key column, or None if no column qualifies
+    """
+    common = [col for col in df1.columns if col in df2.columns]
+    # Identifier-like names first, file order otherwise
+    candidates = sorted(common, key=lambda col: KEY_NAME_PATTERN.search(str(col)) is None)
+    for col in candidates:
+        if any(pd.api.types.is_float_dtype(df[col].dtype) for df in (df1, df2)):
+            continue
+        if all(df[col].notna().all() and df[col].is_unique for df in (df1, df2)):
+            return [col]
+    return None
+
+
+def resolve_key_columns(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    key_columns: Optional[Union[List[str], str]]
+) -> Optional[List[str]]:
+    """
+    Get the key columns to match rows on.
+
+    Args:
+        df1: First table
+        df2: Second table
+        key_columns: Column names, 'auto' to detect a key column, or None
+
+    Returns:
+        List of key columns, or None if rows are not matched on a key
+        (None was given or no key column was detected)
+    """
+    if key_columns is None:
+        return None
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    if list(key_columns) == ["auto"] and "auto" not in df1.columns:
+        return detect_key_columns(df1, df2)
+    return list(key_columns)
+
+
+def _column_codes(values1: pd.Series, values2: pd.Series) -> Tuple[np.ndarray, int]:
+    """
+    Assign one integer code to each distinct value of a key column of both tables.
+
+    Integer columns with a compact range use the offset from the minimum as
+    code, other columns are factorized. Missing values get a code of their own.
+
+    Args:
+        values1: Key values of the first table
+        values2: Key values of the second table
+
+    Returns:
+        Tuple of (codes of the values of both tables, number of codes)
+    """
+    arrays = [values.to_numpy() for values in (values1, values2)]
+    if all(array.dtype.kind in "iu" for array in arrays) and len(arrays[0]) and len(arrays[1]):
+        low = min(int(array.min()) for array in arrays)
+        high = max(int(array.max()) for array in arrays)
+        if high - low < 2 * (len(arrays[0]) + len(arrays[1])):
+            # Dense integer keys are their own hash
+            codes = np.concatenate([array.astype(np.int64) - low for array in arrays])
+            return codes, high - low + 1
+    codes, uniques = pd.factorize(pd.concat([values1, values2], ignore_index=True))
+    codes = np.where(codes < 0, len(uniques), codes).astype(np.int64)
+    return codes, len(uniques) + 1
+
+
+def _key_codes(df1: pd.DataFrame, df2: pd.DataFrame, key_columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign one integer code to each distinct key of the two tables.
+
+    The key columns of both tables are encoded together, so equal keys get
+    equal codes in both. Missing key values match each other.
+
+    Args:
+        df1: First table
+        df2: Second table
+        key_columns: Columns forming the key
+
+    Returns:
+        Tuple of (codes of the rows of df1, codes of the rows of df2)
+    """
+    combined, n_combined = _column_codes(df1[key_columns[0]], df2[key_columns[0]])
+    for col in key_columns[1:]:
+        codes, n_codes = _column_codes(df1[col], df2[col])
+        if n_combined * n_codes >= 2 ** 62:
+            # Renumber before the combined codes could overflow
+            combined, combined_uniques = pd.factorize(combined)
+            n_combined = len(combined_uniques)
+        combined = combined * n_codes + codes
+        n_combined *= n_codes
+    if len(key_columns) > 1:
+        combined, _ = pd.factorize(combined)
+    return combined[:len(df1)], combined[len(df1):]
+
+
+def align_rows(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    key_columns: List[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Match the rows of two tables on key columns with a hash join.
+
+    Args:
+        df1: First table
+        df2: Second table
+        key_columns: Columns identifying a row in both tables
+
+    Returns:
+        Tuple of (positions in df1 of matched rows, positions in df2 of the
+        same rows, positions in df1 of removed rows, positions in df2 of
+        added rows)
+
+    Raises:
+        ValueError: If a key column is missing or a key is repeated within a table
+    """
+    for name, df in (("file1", df1), ("file2", df2)):
+        missing = [col for col in key_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Key columns {missing} not found in {name}")
+
+    codes1, codes2 = _key_codes(df1, df2, key_columns)
+    n_codes = int(max(codes1.max(initial=-1), codes2.max(initial=-1))) + 1
+    for name, codes in (("file1", codes1), ("file2", codes2)):
+        if len(codes) and np.bincount(codes, minlength=n_codes).max() > 1:
+            raise ValueError(f"Key columns {key_columns} do not identify rows uniquely in {name}")
+
+    # Position of each key in the second table (-1 where it does not occur)
+    positions2 = np.full(n_codes, -1, dtype=np.int64)
+    positions2[codes2] = np.arange(len(codes2))
+    matched_in_2 = positions2[codes1]
+    matched = matched_in_2 >= 0
+
+    in_file1 = np.zeros(n_codes, dtype=bool)
+    in_file1[codes1] = True
+    return (
+        np.flatnonzero(matched),
+        matched_in_2[matched],
+        np.flatnonzero(~matched),
+        np.flatnonzero(~in_file1[codes2])
+    )
+
+
+def _column_values(values: pd.Series) -> np.ndarray:
+    """Get the values of a column as a NumPy array that supports element-wise comparison."""
+    if isinstance(values.dtype, np.dtype):
+        return values.to_numpy()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        # Nullable numbers
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values.to_numpy(dtype=object, na_value=None)
+
+
+def _python_value(value: Any) -> Any:
+    """Convert NumPy scalars to the equivalent Python values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def changed_cells(values1: pd.Series, values2: pd.Series) -> np.ndarray:
+    """
+    Compare two aligned columns value by value.
+
+    Args:
+        values1: Values from the first table
+        values2: Values from the second table, in the same row order
+
+    Returns:
+        Boolean array, True where the values differ (missing values are equal)
+    """
+    array1 = _column_values(values1)
+    array2 = _column_values(values2)
+    if array1.dtype == object or array2.dtype == object:
+        array1 = array1.astype(object)
+        array2 = array2.astype(object)
+    with np.errstate(invalid="ignore"):
+        differ = np.asarray(array1 != array2, dtype=bool)
+    # Missing values compare unequal to each other, so only differing cells are checked
+    candidates = np.flatnonzero(differ)
+    both_missing = pd.isna(array1[candidates]) & pd.isna(array2[candidates])
+    differ[candidates[both_missing]] = False
+    return differ
+
+
+def _key_records(df: pd.DataFrame, positions: np.ndarray, key_columns: List[str]) -> List[Dict[str, Any]]:
+    """Get the keys of some rows as dictionaries."""
+    rows = df.iloc[positions][key_columns]
+    return [
+        {col: _python_value(value) for col, value in zip(key_columns, values)}
+        for values in rows.itertuples(index=False, name=None)
+    ]
+
+
+def _row_diff(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    key_columns: List[str],
+    max_rows: int,
+    alignment: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    Compute a keyed diff and the index labels of the rows it lists.
+
+    Args:
+        df1: First table
+        df2: Second table
+        key_columns: Columns identifying a row in both tables
+        max_rows: Maximum number of added, removed and changed rows to list
+        alignment: Rows already matched with align_rows (matched here if None)
+
+    Returns:
+        Tuple of (diff in the format of keyed_diff, index labels of the listed
+        added rows in df2 and removed and changed rows in df1)
+    """
+    if alignment is None:
+        alignment = align_rows(df1, df2, key_columns)
+    matched1, matched2, removed, added = alignment
+    value_columns = [col for col in df1.columns if col in df2.columns and col not in key_columns]
+
+    column_changes: Dict[str, int] = {}
+    changed_masks: Dict[str, np.ndarray] = {}
+    row_changed = np.zeros(len(matched1), dtype=bool)
+    for col in value_columns:
+        mask = changed_cells(df1[col].iloc[matched1], df2[col].iloc[matched2])
+        count = int(mask.sum())
+        if count:
+            column_changes[col] = count
+            changed_masks[col] = mask
+            row_changed |= mask
+
+    changed_positions = np.flatnonzero(row_changed)
+    changed_rows: List[Dict[str, Any]] = []
+    shown = changed_positions[:max_rows]
+    keys = _key_records(df1, matched1[shown], key_columns)
+    for position, key in zip(shown, keys):
+        changes = {}
+        for col, mask in changed_masks.items():
+            if mask[position]:
+                changes[col] = {
+                    "file1": _python_value(df1[col].iloc[matched1[position]]),
+                    "file2": _python_value(df2[col].iloc[matched2[position]])
+                }
+        changed_rows.append({"key": key, "changes": changes})
+
+    diff = {
+        "key_columns": key_columns,
+        "rows_matched": len(matched1),
+        "rows_added": len(added),
+        "rows_removed": len(removed),
+        "rows_changed": len(changed_positions),
+        "rows_unchanged": len(matched1) - len(changed_positions),
+        "column_changes": column_changes,
+        "added_rows": _key_records(df2, added[:max_rows], key_columns),
+        "removed_rows": _key_records(df1, removed[:max_rows], key_columns),
+        "changed_rows": changed_rows
+    }
+    labels = {
+        "added_rows": df2.index[added[:max_rows]].tolist(),
+        "removed_rows": df1.index[removed[:max_rows]].tolist(),
+        "changed_rows": df1.index[matched1[shown]].tolist()
+    }
+    return diff, labels
+
+
+def keyed_diff(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    key_columns: Union[List[str], str],
+    max_rows: int = DIFF_EXAMPLE_ROWS,
+    alignment: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+) -> Dict[str, Any]:
+    """
+    Find the added, removed and changed rows of two tables with the same key.
+
+    Rows are matched with a vectorized hash join on the key columns, and the
+    common non-key columns of matched rows are compared cell by cell, so rows
+    inserted or reordered in one file do not make later rows look changed.
+
+    Args:
+        df1: First table
+        df2: Second table
+        key_columns: Column or columns identifying a row in both tables
+        max_rows: Maximum number of added, removed and changed rows to list
+        alignment: Rows already matched with align_rows (matched here if None)
+
+    Returns:
+        Dictionary with row counts, the number of changed cells per column and
+        up to max_rows added, removed and changed rows (with their cell changes)
+    """
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    return _row_diff(df1, df2, key_columns, max_rows, alignment)[0]
+
+
+def column_hashes(values: pd.Series) -> np.ndarray:
+    """
+    Hash the values of a column so equal values of different dtypes hash alike.
+
+    Integers are hashed exactly as 64-bit integers, and so are floats with an
+    integer value, so an integer column and the same values read as floats
+    (e.g. after a missing value) give the same hashes. Other floats are
+    hashed by their bits, other values by their string form, and missing
+    values all get the same hash.
+
+    Args:
+        values: Values of the column
+
+    Returns:
+        Hash of each value (uint64)
+    """
+    dtype = values.dtype
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        nulls = values.isna().to_numpy()
+        hashes = pd.util.hash_array(values.to_numpy(dtype=np.int64, na_value=0), categorize=False)
+    elif pd.api.types.is_float_dtype(dtype):
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        nulls = np.isnan(array)
+        # Tagged so a float never hashes like the integer with the same bits
+        hashes = pd.util.hash_array(array, categorize=False) ^ np.uint64(FLOAT_HASH_TAG)
+        with np.errstate(invalid="ignore"):
+            integral = (np.floor(array) == array) & (np.abs(array) < 2.0 ** 63)
+        if integral.any():
+            hashes[integral] = pd.util.hash_array(array[integral].astype(np.int64), categorize=False)
+    else:
+        array = values.to_numpy(dtype=object)
+        nulls = pd.isna(array)
+        array = np.where(nulls, "", array)
+        if pd.api.types.infer_dtype(array, skipna=False) != "string":
+            array = array.astype(str).astype(object)
+        hashes = pd.util.hash_array(array, categorize=False)
+    hashes[nulls] = np.uint64(NULL_HASH)
+    return hashes
+
+
+def row_hashes(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Compute a 64-bit fingerprint of each row.
+
+    Args:
+        df: Rows to hash
+        columns: Columns to include, in this order
+
+    Returns:
+        Hash of each row (uint64)
+    """
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for col in columns:
+        hashes = hashes * np.uint64(PARTITION_HASH_MULTIPLIER) + column_hashes(df[col])
+    return hashes
+
+
+def partition_ids(chunk: pd.DataFrame, key_columns: List[str], n_partitions: int) -> np.ndarray:
+    """
+    Assign rows to hash partitions by their key.
+
+    Args:
+        chunk: Rows to assign
+        key_columns: Columns identifying a row
+        n_partitions: Number of partitions
+
+    Returns:
+        Partition number of each row
+    """
+    return (row_hashes(chunk, key_columns) % np.uint64(n_partitions)).astype(np.int64)
+
+
+def _occurrence_ranks(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Number each row among the earlier rows with the same code (0 for the first one)."""
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=n_codes)
+    starts = np.cumsum(counts) - counts
+    ranks = np.empty(len(codes), dtype=np.int64)
+    ranks[order] = np.arange(len(codes)) - np.repeat(starts, counts)
+    return ranks
+
+
+def _fingerprint_diff(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    columns: List[str],
+    max_rows: int
+) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    Compute a row fingerprint diff and the index labels of the rows it lists.
+
+    Args:
+        df1: First table
+        df2: Second table
+        columns: Columns both tables are compared on
+        max_rows: Maximum number of added, removed and unchanged rows to list
+
+    Returns:
+        Tuple of (diff in the format of fingerprint_diff, index labels of the
+        listed added rows in df2 and removed and unchanged rows in df1)
+    """
+    hashes1 = row_hashes(df1, columns)
+    hashes2 = row_hashes(df2, columns)
+    codes, uniques = pd.factorize(np.concatenate([hashes1, hashes2]))
+    codes1, codes2 = codes[:len(hashes1)], codes[len(hashes1):]
+    counts1 = np.bincount(codes1, minlength=len(uniques))
+    counts2 = np.bincount(codes2, minlength=len(uniques))
+
+    # As many copies of a row as the other table has are unchanged, the later ones added or removed
+    in_file2 = _occurrence_ranks(codes1, len(uniques)) < counts2[codes1]
+    unchanged = np.flatnonzero(in_file2)
+    removed = np.flatnonzero(~in_file2)
+    added = np.flatnonzero(_occurrence_ranks(codes2, len(uniques)) >= counts1[codes2])
+
+    diff = {
+        "columns": columns,
+        "rows_unchanged": len(unchanged),
+        "rows_added": len(added),
+        "rows_removed": len(removed),
+        "added_rows": _key_records(df2, added[:max_rows], columns),
+        "removed_rows": _key_records(df1, removed[:max_rows], columns),
+        "unchanged_rows": _key_records(df1, unchanged[:max_rows], columns)
+    }
+    labels = {
+        "added_rows": df2.index[added[:max_rows]].tolist(),
+        "removed_rows": df1.index[removed[:max_rows]].tolist(),
+        "unchanged_rows": df1.index[unchanged[:max_rows]].tolist()
+    }
+    return diff, labels
+
+
+def fingerprint_diff(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    max_rows: int = DIFF_EXAMPLE_ROWS
+) -> Dict[str, Any]:
+    """
+    Find the added and removed rows of two tables without a key.
+
+    Each row is reduced to a 64-bit hash of its values, and the two tables
+    are compared as multisets of these hashes: row order does not matter, and
+    a row repeated more often in one table counts as added or removed.
+
+    Args:
+        df1: First table
+        df2: Second table
+        columns: Columns to compare rows on (the common columns if None)
+        max_rows: Maximum number of added, removed and unchanged rows to list
+
+    Returns:
+        Dictionary with the compared columns, the number of unchanged, added
+        and removed rows, and up to max_rows rows of each
+    """
+    if columns is None:
+        columns = [col for col in df1.columns if col in df2.columns]
+    return _fingerprint_diff(df1, df2, columns, max_rows)[0]
+
+
+def _spill_partitions(
+    chunks: Iterable[pd.DataFrame],
+    key_columns: List[str],
+    n_partitions: int,
+    prefix: str
+) -> Tuple[List[str], List[str]]:
+    """
+    Write the rows of a table to one spill file per hash partition.
+
+    Rows keep their row number in the table as index. Each chunk adds one
+    pickled DataFrame to every partition it has rows for.
+
+    Args:
+        chunks: DataFrames with consecutive rows of the table
+        key_columns: Columns identifying a row
+        n_partitions: Number of partitions
+        prefix: Path prefix of the spill files
+
+    Returns:
+        Tuple of (paths of the spill files, columns of the table)
+    """
+    paths = [f"{prefix}-{i}.pkl" for i in range(n_partitions)]
+    columns: Optional[List[str]] = None
+    row_total = 0
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            missing = [col for col in key_columns if col not in columns]
+            if missing:
+                raise ValueError(f"Key columns {missing} not found in {os.path.basename(prefix)}")
+        chunk.index = pd.RangeIndex(row_total, row_total + len(chunk))
+        row_total += len(chunk)
+
+        partitions = partition_ids(chunk, key_columns, n_partitions)
+        order = np.argsort(partitions, kind="stable")
+        bounds = np.searchsorted(partitions[order], np.arange(n_partitions + 1))
+        for i in np.flatnonzero(np.diff(bounds)):
+            with open(paths[i], "ab") as f:
+                pickle.dump(chunk.iloc[order[bounds[i]:bounds[i + 1]]], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return paths, columns or []
+
+
+def _load_partition(path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Read the rows of one partition back from its spill file.
+
+    Args:
+        path: Path of the spill file
+        columns: Columns of the table
+
+    Returns:
+        DataFrame with the rows of the partition (empty if it has none)
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    parts = []
+    with open(path, "rb") as f:
+        while True:
+            try:
+                parts.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(parts)
+
+
+def _merge_examples(
+    parts: List[Tuple[Dict[str, Any], Dict[str, List[Any]]]],
+    kinds: List[str],
+    max_rows: int
+) -> Dict[str, List[Any]]:
+    """
+    Combine the rows listed by the diffs of partitions in order of their row number.
+
+    Args:
+        parts: Diffs of the partitions with the index labels of their listed rows
+        kinds: Names of the lists of rows
+        max_rows: Maximum number of rows per list
+
+    Returns:
+        Dictionary mapping each name to the first max_rows rows over all partitions
+    """
+    merged = {}
+    for kind in kinds:
+        entries = [(label, row) for part, labels in parts for label, row in zip(labels[kind], part[kind])]
+        entries.sort(key=lambda entry: entry[0])
+        merged[kind] = [row for _, row in entries[:max_rows]]
+    return merged
+
+
+def _merge_row_diffs(
+    parts: List[Tuple[Dict[str, Any], Dict[str, List[Any]]]],
+    key_columns: List[str],
+    value_columns: List[str],
+    max_rows: int
+) -> Dict[str, Any]:
+    """
+    Combine the keyed diffs of partitions into the diff of the whole tables.
+
+    Listed rows are ordered by their row number, so the result lists the
+    same rows as a keyed diff of the whole tables.
+
+    Args:
+        parts: Diffs of the partitions with the labels from _row_diff
+        key_columns: Columns identifying a row
+        value_columns: Compared columns, in the order of the first table
+        max_rows: Maximum number of added, removed and changed rows to list
+
+    Returns:
+        Dictionary in the format of keyed_diff
+    """
+    diff: Dict[str, Any] = {"key_columns": key_columns}
+    for count in ("rows_matched", "rows_added", "rows_removed", "rows_changed", "rows_unchanged"):
+        diff[count] = sum(part[count] for part, _ in parts)
+    column_changes = {col: sum(part["column_changes"].get(col, 0) for part, _ in parts) for col in value_columns}
+    diff["column_changes"] = {col: count for col, count in column_changes.items() if count}
+    diff.update(_merge_examples(parts, ["added_rows", "removed_rows", "changed_rows"], max_rows))
+    return diff
+
+
+def partition_count(file_size_mb: float, partition_mb: float = DIFF_PARTITION_MB) -> int:
+    """
+    Get the number of hash partitions for an out-of-core diff of a file.
+
+    Args:
+        file_size_mb: Size of the larger input file in MB
+        partition_mb: Target size of the part of the file in one partition
+
+    Returns:
+        Number of partitions (at least 1)
+    """
+    return max(1, math.ceil(file_size_mb / partition_mb))
+
+
+def external_keyed_diff(
+    chunks1: Iterable[pd.DataFrame],
+    chunks2: Iterable[pd.DataFrame],
+    key_columns: Union[List[str], str],
+    n_partitions: int = 64,
+    spill_dir: Optional[str] = None,
+    max_rows: int = DIFF_EXAMPLE_ROWS
+) -> Dict[str, Any]:
+    """
+    Compute a keyed diff of two tables larger than memory.
+
+    Both tables are read chunk by chunk and hash-partitioned on their key
+    into spill files on local disk. Rows with the same key land in the same
+    partition, so each pair of partitions is then diffed in memory on its
+    own, holding one partition of each table at a time. The result is the
+    same as keyed_diff on the whole tables.
+
+    Args:
+        chunks1: DataFrames with consecutive rows of the first table
+        chunks2: DataFrames with consecutive rows of the second table
+        key_columns: Column or columns identifying a row in both tables
+        n_partitions: Number of partitions (more partitions use less memory)
+        spill_dir: Directory for the spill files (the system temporary
+            directory if None); they are deleted afterwards
+        max_rows: Maximum number of added, removed and changed rows to list
+
+    Returns:
+        Dictionary in the format of keyed_diff
+    """
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    with tempfile.TemporaryDirectory(prefix="csvdiffgpt-diff-", dir=spill_dir) as directory:
+        paths1, columns1 = _spill_partitions(chunks1, key_columns, n_partitions, os.path.join(directory, "file1"))
+        paths2, columns2 = _spill_partitions(chunks2, key_columns, n_partitions, os.path.join(directory, "file2"))
+        parts = []
+        for path1, path2 in zip(paths1, paths2):
+            part1 = _load_partition(path1, columns1)
+            part2 = _load_partition(path2, columns2)
+            parts.append(_row_diff(part1, part2, key_columns, max_rows))
+    value_columns = [col for col in columns1 if col in columns2 and col not in key_columns]
+    return _merge_row_diffs(parts, key_columns, value_columns, max_rows)
+
+
+def _peek_columns(chunks: Iterable[pd.DataFrame]) -> Tuple[List[str], Iterator[pd.DataFrame]]:
+    """Get the columns of the first chunk, and an iterator over all chunks."""
+    iterator = iter(chunks)
+    first = next(iterator, None)
+    if first is None:
+        return [], iterator
+    return list(first.columns), itertools.chain([first], iterator)
+
+
+def external_fingerprint_diff(
+    chunks1: Iterable[pd.DataFrame],
+    chunks2: Iterable[pd.DataFrame],
+    columns: Optional[List[str]] = None,
+    n_partitions: int = 64,
+    spill_dir: Optional[str] = None,
+    max_rows: int = DIFF_EXAMPLE_ROWS
+) -> Dict[str, Any]:
+    """
+    Compute a row fingerprint diff of two tables larger than memory.
+
+    Both tables are read chunk by chunk and hash-partitioned on all compared
+    columns into spill files on local disk, so identical rows land in the
+    same partition. Each pair of partitions is then diffed in memory on its
+    own. The result is the same as fingerprint_diff on the whole tables.
+
+    Args:
+        chunks1: DataFrames with consecutive rows of the first table
+        chunks2: DataFrames with consecutive rows of the second table
+        columns: Columns to compare rows on (the common columns if None)
+        n_partitions: Number of partitions (more partitions use less memory)
+        spill_dir: Directory for the spill files (the system temporary
+            directory if None); they are deleted afterwards
+        max_rows: Maximum number of added, removed and unchanged rows to list
+
+    Returns:
+        Dictionary in the format of fingerprint_diff
+    """
+    if columns is None:
+        columns1, chunks1 = _peek_columns(chunks1)
+        columns2, chunks2 = _peek_columns(chunks2)
+        columns = [col for col in columns1 if col in columns2]
+    with tempfile.TemporaryDirectory(prefix="csvdiffgpt-diff-", dir=spill_dir) as directory:
+        paths1, columns1 = _spill_partitions(chunks1, columns, n_partitions, os.path.join(directory, "file1"))
+        paths2, columns2 = _spill_partitions(chunks2, columns, n_partitions, os.path.join(directory, "file2"))
+        parts = []
+        for path1, path2 in zip(paths1, paths2):
+            part1 = _load_partition(path1, columns1 or columns)
+            part2 = _load_partition(path2, columns2 or columns)
+            parts.append(_fingerprint_diff(part1, part2, columns, max_rows))
+
+    diff: Dict[str, Any] = {"columns": columns}
+    for count in ("rows_unchanged", "rows_added", "rows_removed"):
+        diff[count] = sum(part[count] for part, _ in parts)
+    diff.update(_merge_examples(parts, ["added_rows", "removed_rows", "unchanged_rows"], max_rows))
+    return diff
@@ -0,0 +1,180 @@
+"""Order-independent digests of whole datasets, saved next to the file."""
+import os
+import json
+import tempfile
+from typing import Dict, Any, Optional, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_fingerprint
+from .diff import PARTITION_HASH_MULTIPLIER, column_hashes
+
+# Suffix of the digest file stored next to the digested file
+DIGEST_SUFFIX = ".csvdiffgpt-digest.json"
+
+# Version of the digest format, bumped when the hashing changes
+DIGEST_VERSION = 2
+
+# Row and column digests are sums of 64-bit hashes modulo 2**64
+HASH_MODULUS = 2 ** 64
+
+
+def dataset_digest(chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Compute an order-independent digest of a table in one streaming pass.
+
+    Every row is hashed over its columns in name order, and the row hashes
+    are combined by a sum and an xor, so neither the order of the rows nor
+    the order of the columns changes the digest. Each column also gets the
+    sum of its value hashes, which tells which columns differ.
+
+    Args:
+        chunks: DataFrames with consecutive rows of the table
+
+    Returns:
+        Dictionary with the row count, the columns in file order, the row
+        digests and the digest of each column (as hex strings)
+    """
+    rows = 0
+    columns: Optional[List[str]] = None
+    row_sum = 0
+    row_xor = 0
+    column_sums: Dict[str, int] = {}
+    for chunk in chunks:
+        if columns is None:
+            columns = [str(col) for col in chunk.columns]
+            column_sums = {col: 0 for col in columns}
+        rows += len(chunk)
+        hashes = np.zeros(len(chunk), dtype=np.uint64)
+        for col in sorted(chunk.columns, key=str):
+            values = column_hashes(chunk[col])
+            # Sums of uint64 arrays wrap around, which is the modular sum
+            column_sums[str(col)] = (column_sums[str(col)] + int(values.sum())) % HASH_MODULUS
+            hashes = hashes * np.uint64(PARTITION_HASH_MULTIPLIER) + values
+        row_sum = (row_sum + int(hashes.sum())) % HASH_MODULUS
+        row_xor ^= int(np.bitwise_xor.reduce(hashes)) if len(hashes) else 0
+
+    return {
+        "rows": rows,
+        "columns": columns or [],
+        "row_sum": f"{row_sum:016x}",
+        "row_xor": f"{row_xor:016x}",
+        "column_digests": {col: f"{value:016x}" for col, value in column_sums.items()}
+    }
+
+
+def compare_digests(digest1: Dict[str, Any], digest2: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare the digests of two tables.
+
+    Args:
+        digest1: Digest of the first table (from dataset_digest)
+        digest2: Digest of the second table
+
+    Returns:
+        Dictionary telling whether the tables hold the same rows, with their
+        row counts, the common columns whose values differ and the columns
+        only in one table
+    """
+    columns2 = set(digest2["columns"])
+    columns1 = set(digest1["columns"])
+    changed_columns = [
+        col for col in digest1["columns"]
+        if col in columns2 and digest1["column_digests"][col] != digest2["column_digests"][col]
+    ]
+    only_in_file1 = [col for col in digest1["columns"] if col not in columns2]
+    only_in_file2 = [col for col in digest2["columns"] if col not in columns1]
+    identical = (
+        digest1["rows"] == digest2["rows"]
+        and digest1["row_sum"] == digest2["row_sum"]
+        and digest1["row_xor"] == digest2["row_xor"]
+        and not changed_columns
+        and not only_in_file1
+        and not only_in_file2
+    )
+    return {
+        "identical": identical,
+        "rows": {"file1": digest1["rows"], "file2": digest2["rows"]},
+        "changed_columns": changed_columns,
+        "only_in_file1": only_in_file1,
+        "only_in_file2": only_in_file2
+    }
+
+
+def digest_path_for(file_path: str) -> str:
+    """
+    Get the path of the sidecar digest file of a file.
+
+    Args:
+        file_path: Path to the data file
+
+    Returns:
+        Path of the digest file
+    """
+    return file_path + DIGEST_SUFFIX
+
+
+def _file_state(file_path: str) -> Dict[str, Any]:
+    """Get the size, modification time and sampled content hash of a file."""
+    fingerprint = file_fingerprint(file_path)
+    fingerprint.pop("path")
+    return fingerprint
+
+
+def load_digest(file_path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load the saved digest of a file if the file is unchanged.
+
+    Args:
+        file_path: Path to the data file
+        params: Parameters that affect the digest
+
+    Returns:
+        The saved digest, or None if the file has to be digested again
+    """
+    try:
+        with open(digest_path_for(file_path), 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get("version") != DIGEST_VERSION or saved.get("params") != params:
+            return None
+        if saved.get("file") != _file_state(file_path):
+            return None
+        return saved["digest"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing or corrupt digest file
+        return None
+
+
+def save_digest(file_path: str, params: Dict[str, Any], digest: Dict[str, Any]) -> None:
+    """
+    Save the digest of a file next to it.
+
+    Failing to write the digest (e.g. in a read-only directory) is not an
+    error, the next run then digests the file again.
+
+    Args:
+        file_path: Path to the data file
+        params: Parameters that affect the digest
+        digest: Digest of the file (from dataset_digest)
+    """
+    saved = {
+        "version": DIGEST_VERSION,
+        "params": params,
+        "file": _file_state(file_path),
+        "digest": digest
+    }
+    digest_path = digest_path_for(file_path)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(digest_path)), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        os.replace(temp_path, digest_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
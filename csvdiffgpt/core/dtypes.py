@@ -0,0 +1,115 @@
+"""Compact dtypes for loaded CSV data."""
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import is_string_type
+
+# Number of rows read to infer dtypes before the full load
+DTYPE_PROBE_ROWS = 10000
+
+# String columns with at most this many distinct values become categoricals
+MAX_CATEGORIES = 1000
+
+# ... provided the distinct values are at most this fraction of the non-null values
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _is_category_candidate(values: pd.Series) -> bool:
+    """Check whether a string column has few enough distinct values for a categorical."""
+    non_null_count = int(values.notna().sum())
+    if non_null_count == 0:
+        return False
+    unique_count = values.nunique()
+    return unique_count <= MAX_CATEGORIES and unique_count <= non_null_count * MAX_CATEGORY_RATIO
+
+
+def infer_read_dtypes(sample: pd.DataFrame) -> Dict[str, str]:
+    """
+    Infer dtypes to pass to the CSV reader from the first block of a file.
+
+    Only low-cardinality string columns are given a dtype ('category'), which
+    keeps the parser from creating one Python string per row. Numeric columns
+    are downcast after loading, when their full value range is known.
+
+    Args:
+        sample: DataFrame with the first rows of the file
+
+    Returns:
+        Dictionary mapping column names to dtypes for the reader
+    """
+    return {
+        col: "category"
+        for col in sample.columns
+        if sample[col].dtype == object and _is_category_candidate(sample[col])
+    }
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    source_dtypes: Optional[Dict[str, str]] = None
+) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, Any]]:
+    """
+    Convert the columns of a DataFrame to compact dtypes without losing values.
+
+    Integers are downcast to the smallest integer type holding their range,
+    floats become float32 when every value is exactly representable, and
+    low-cardinality string columns become categoricals.
+
+    Args:
+        df: DataFrame to optimize
+        source_dtypes: Dtype names the columns would have had without optimization,
+            for columns already read with a compact dtype
+
+    Returns:
+        Tuple of (optimized DataFrame, dtype names without optimization for every
+        changed column, memory report)
+    """
+    source_dtypes = dict(source_dtypes or {})
+    converted: Dict[str, pd.Series] = {}
+    bytes_before = 0
+    bytes_after = 0
+
+    for col in df.columns:
+        values = df[col]
+        dtype = values.dtype
+        optimized = None
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Read as categorical, drop categories only present in skipped rows
+            optimized = values.cat.remove_unused_categories()
+            before = values.astype(object).memory_usage(deep=True, index=False)
+        elif isinstance(dtype, np.dtype) and dtype.kind in "iu":
+            optimized = pd.to_numeric(values, downcast="integer" if dtype.kind == "i" else "unsigned")
+            before = values.memory_usage(index=False)
+        elif isinstance(dtype, np.dtype) and dtype == np.float64:
+            candidate = values.astype(np.float32)
+            if np.array_equal(candidate.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+                optimized = candidate
+            before = values.memory_usage(index=False)
+        elif is_string_type(dtype) and _is_category_candidate(values):
+            optimized = values.astype("category")
+            before = values.memory_usage(deep=True, index=False)
+
+        if optimized is None or (optimized.dtype == dtype and not isinstance(dtype, pd.CategoricalDtype)):
+            continue
+
+        converted[col] = optimized
+        source_dtypes.setdefault(col, str(dtype))
+        bytes_before += int(before)
+        bytes_after += int(optimized.memory_usage(deep=True, index=False))
+
+    if converted:
+        df = df.copy(deep=False)
+        for col, values in converted.items():
+            df[col] = values
+
+    report = {
+        "optimized_columns": {col: str(values.dtype) for col, values in converted.items()},
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after
+    }
+    return df, {col: source_dtypes[col] for col in converted}, report
+
@@ -0,0 +1,121 @@
+"""Sidecar state for incremental profiling of append-only CSV files."""
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+
+from .profiler import StreamingProfiler
+from .profile_store import json_default
+
+# Suffix of the state file stored next to the profiled file
+STATE_SUFFIX = ".csvdiffgpt-state.json"
+
+# Number of bytes before the processed offset that must be unchanged
+CHECKPOINT_BYTES = 64 * 1024
+
+# Version of the state format, bumped when accumulator fields or value hashes change
+STATE_VERSION = 3
+
+
+def state_path_for(file_path: str) -> str:
+    """
+    Get the path of the sidecar state file of a CSV file.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        Path of the state file
+    """
+    return file_path + STATE_SUFFIX
+
+
+def tail_checkpoint(file_path: str, offset: int, size: int = CHECKPOINT_BYTES) -> str:
+    """
+    Hash the header line and the bytes just before an offset of a file.
+
+    Args:
+        file_path: Path to the file
+        offset: End of the checked byte range
+        size: Number of bytes hashed before the offset
+
+    Returns:
+        Hex digest of the header and the checkpoint bytes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        digest.update(f.readline())
+        start = max(0, offset - size)
+        f.seek(start)
+        digest.update(f.read(offset - start))
+    return digest.hexdigest()
+
+
+def load_state(file_path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load the saved profile of a file if only rows were appended since.
+
+    The state is used only if it was built with the same parameters, the file
+    is at least as large as the processed prefix, and the bytes just before the
+    processed offset (and the header) hash to the saved checkpoint.
+
+    Args:
+        file_path: Path to the CSV file
+        params: Parameters that affect the profile
+
+    Returns:
+        Dictionary with the 'offset' processed so far and the 'profiler' holding
+        its statistics, or None if the file has to be profiled from the start
+    """
+    try:
+        with open(state_path_for(file_path), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION or state.get("params") != params:
+            return None
+        offset = state["offset"]
+        if os.path.getsize(file_path) < offset:
+            # Truncated or rewritten file
+            return None
+        if tail_checkpoint(file_path, offset) != state["checkpoint"]:
+            return None
+        return {"offset": offset, "profiler": StreamingProfiler.from_state(state["profile"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing or corrupt state, profile from the start
+        return None
+
+
+def save_state(file_path: str, params: Dict[str, Any], offset: int, profiler: StreamingProfiler) -> None:
+    """
+    Save the profile of the first offset bytes of a file next to it.
+
+    Failing to write the state (e.g. in a read-only directory) is not an
+    error, the next run then profiles the whole file again.
+
+    Args:
+        file_path: Path to the CSV file
+        params: Parameters that affect the profile
+        offset: Number of bytes covered by the profile (the end of a row)
+        profiler: Statistics of the rows before the offset
+    """
+    state = {
+        "version": STATE_VERSION,
+        "params": params,
+        "offset": offset,
+        "checkpoint": tail_checkpoint(file_path, offset),
+        "profile": profiler.to_state()
+    }
+    state_path = state_path_for(file_path)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(state_path)), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, default=json_default)
+        os.replace(temp_path, state_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -1,9 +1,152 @@
 """CSV file preprocessing and analysis."""
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
-import json
-from ..core.utils import detect_separator, get_file_size_mb
+from typing import Dict, Any, List, Optional, Union, Iterator
+import io
+import os
+import warnings
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from ..core.utils import count_rows, is_numeric_type, select_columns
+from ..core.arrow_io import read_csv_arrow, require_pyarrow
+from ..core.profiler import PROFILE_PERCENTILES, StreamingProfiler, percentile_fields
+from ..core.dtypes import DTYPE_PROBE_ROWS, infer_read_dtypes, optimize_dtypes as optimize_frame_dtypes
+from ..core.cache import AnalysisCache
+from ..core.incremental import load_state, save_state
+from ..core.digest import dataset_digest, load_digest, save_digest
+from ..core.compression import open_binary
+from ..core.probe import FileProbe
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
+from ..core.column_profile import ColumnProfile
+from ..core.profile_store import ProfileStore, metadata_to_json
+from ..core.column_batches import column_kind, profile_columns, string_length_stats
+from ..core.string_lengths import string_length_summary
+from ..readers import sample_chunks
+
+# Approximate memory limit of one block of numeric columns in _numeric_column_stats
+NUMERIC_BATCH_BYTES = 64 * 1024 * 1024
+
+# Number of blocks read across a large file when sampling randomly
+RANDOM_SAMPLE_BLOCKS = 100
+
+def _numeric_column_stats(df: pd.DataFrame, batch_bytes: int = NUMERIC_BATCH_BYTES) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute null counts and summary statistics of all numeric columns in batches.
+    
+    Columns with the same dtype are stacked into 2-D blocks and reduced
+    column-wise with NaN-aware NumPy functions, avoiding per-column pandas
+    overhead on wide tables. Blocks are limited to about batch_bytes of memory.
+    
+    Args:
+        df: DataFrame to analyze
+        batch_bytes: Approximate maximum size of each 2-D block in bytes
+        
+    Returns:
+        Dictionary mapping numeric column names to their metadata fields
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    row_count = len(df)
+    if row_count == 0 or not df.columns.is_unique:
+        return stats
+    
+    # Group plain NumPy integer and float columns by dtype
+    columns_by_dtype: Dict[np.dtype, List[Any]] = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+            columns_by_dtype.setdefault(dtype, []).append(col)
+    
+    batch_size = max(1, batch_bytes // (row_count * 8))
+    for dtype, columns in columns_by_dtype.items():
+        for start in range(0, len(columns), batch_size):
+            batch = columns[start:start + batch_size]
+            block = df[batch].to_numpy(dtype=dtype)
+            values = block.astype(np.float64, copy=False)
+            
+            # All-NaN columns and single values produce warnings and NaN results
+            with warnings.catch_warnings(), np.errstate(all="ignore"):
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                if dtype.kind == "f":
+                    nulls = np.isnan(block).sum(axis=0)
+                    mins = np.nanmin(block, axis=0)
+                    maxs = np.nanmax(block, axis=0)
+                else:
+                    nulls = np.zeros(len(batch), dtype=np.int64)
+                    mins = block.min(axis=0)
+                    maxs = block.max(axis=0)
+                means = np.nanmean(values, axis=0)
+                # One partial sort per column gives the median and the other percentiles
+                percentiles = np.nanpercentile(values, [50] + PROFILE_PERCENTILES, axis=0)
+                medians = percentiles[0]
+                stds = np.nanstd(values, axis=0, ddof=1)
+            
+            for i, col in enumerate(batch):
+                stats[col] = {
+                    "nulls": int(nulls[i]),
+                    "null_percentage": round(float(nulls[i]) / row_count * 100, 2),
+                    "min": mins[i] if not pd.isna(mins[i]) else None,
+                    "max": maxs[i] if not pd.isna(maxs[i]) else None,
+                    "mean": round(float(means[i]), 2) if not pd.isna(means[i]) else None,
+                    "median": round(float(medians[i]), 2) if not pd.isna(medians[i]) else None,
+                    "std": round(float(stds[i]), 2) if not pd.isna(stds[i]) else None
+                }
+                if not pd.isna(medians[i]):
+                    stats[col]["percentiles"] = percentile_fields(percentiles[1:, i])
+    
+    return stats
+
+
+def _analyze_column(
+    col_data: pd.Series,
+    numeric_stats: Optional[Dict[str, Any]] = None,
+    distinct_error: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Compute the complete metadata of a single column.
+    
+    Defined at module level so it can be sent to a process pool.
+    
+    Args:
+        col_data: Values of the column
+        numeric_stats: Precomputed null counts and statistics of a numeric column
+            (from _numeric_column_stats)
+        distinct_error: Relative error of an approximate distinct count
+            (counted exactly if None)
+        
+    Returns:
+        Dictionary of column metadata
+    """
+    return ColumnProfile(col_data, numeric_stats, distinct_error).to_dict()
+
+
+class _BatchedNumericStats:
+    """
+    Statistics of all numeric columns of a DataFrame, computed together on first use.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize without computing anything.
+        
+        Args:
+            df: DataFrame to analyze
+        """
+        self.df = df
+        self.stats: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    def get(self, column: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the statistics of a column, computing those of all numeric columns if needed.
+        
+        Args:
+            column: Name of the column
+            
+        Returns:
+            Statistics of the column, or None if it is not a plain NumPy numeric column
+        """
+        if self.stats is None:
+            self.stats = _numeric_column_stats(self.df)
+        return self.stats.get(column)
+
 
 class CSVPreprocessor:
     """
@@ -15,7 +158,25 @@ class CSVPreprocessor:
         file_path: str, 
         sep: Optional[str] = None,
         max_rows_analyzed: int = 150000,
-        max_cols_analyzed: Optional[int] = None
+        max_cols_analyzed: Optional[int] = None,
+        streaming: bool = False,
+        chunk_size: int = 100000,
+        quote_aware_row_count: bool = False,
+        cache: Optional[AnalysisCache] = None,
+        n_workers: Optional[int] = None,
+        parallel_backend: str = "thread",
+        engine: str = "c",
+        sampling: str = "head",
+        random_state: Optional[int] = None,
+        optimize_dtypes: bool = False,
+        incremental: bool = False,
+        probe: Optional[FileProbe] = None,
+        columns: Optional[Union[List[str], str]] = None,
+        exclude_columns: Optional[Union[List[str], str]] = None,
+        approx_distinct: bool = False,
+        distinct_error: float = DEFAULT_DISTINCT_ERROR,
+        compact_metadata: bool = False,
+        wide_mode: bool = False
     ):
         """
         Initialize the preprocessor with file path and analysis parameters.
@@ -25,60 +186,486 @@ class CSVPreprocessor:
             sep: Separator character (auto-detected if None)
             max_rows_analyzed: Maximum number of rows to analyze
             max_cols_analyzed: Maximum number of columns to analyze
+            streaming: Whether to compute column statistics over the entire file
+                in chunks instead of only over the loaded sample
+            chunk_size: Number of rows per chunk in streaming mode
+            quote_aware_row_count: Whether the row counter should ignore newlines
+                embedded in quoted fields
+            cache: Optional on-disk cache for reusing metadata of unchanged files
+            n_workers: Number of workers analyzing columns in parallel
+                (columns are analyzed sequentially if None or 1)
+            parallel_backend: Pool used for parallel column analysis ('thread' or 'process')
+            engine: CSV parser to use ('c', 'python' or 'pyarrow'). The pyarrow engine
+                reads with the multithreaded Arrow CSV reader and keeps strings
+                as Arrow-backed columns.
+            sampling: How rows are chosen when the file has more than max_rows_analyzed
+                rows: 'head' reads the first rows, 'random' reads blocks of rows from
+                random positions spread over the whole file
+            random_state: Seed for random sampling
+            optimize_dtypes: Whether to store the loaded data with compact dtypes
+                (downcast numbers, categorical low-cardinality strings) to fit more
+                rows in memory. Reported column types are not affected.
+            incremental: Whether to save the streaming statistics in a sidecar file
+                next to the CSV file and, on the next run, only profile the rows
+                appended since (implies streaming)
+            probe: Result of probing the file (probed here if None), provides the
+                separator and size without opening the file again
+            columns: Names or regular expressions of the columns to analyze
+                (all columns if None). Only these columns are parsed.
+            exclude_columns: Names or regular expressions of columns to leave out
+            approx_distinct: Whether to estimate distinct counts with HyperLogLog
+                sketches instead of counting them exactly. Memory per column is
+                fixed, and in streaming mode the counts cover the whole file.
+            distinct_error: Relative standard error of approximate distinct counts
+            compact_metadata: Whether to hold column metadata in a ProfileStore (one
+                typed table row per column) instead of a dictionary per column,
+                which saves memory and serialization time for very wide files
+            wide_mode: Whether to compute every statistic for typed batches of
+                columns at once instead of column by column, for files with
+                thousands of columns. Examples are drawn from one shuffle of the
+                rows shared by all columns.
         """
+        if parallel_backend not in ("thread", "process"):
+            raise ValueError(f"Unknown parallel backend '{parallel_backend}'. Use 'thread' or 'process'.")
+        if engine not in ("c", "python", "pyarrow"):
+            raise ValueError(f"Unknown engine '{engine}'. Use 'c', 'python' or 'pyarrow'.")
+        if engine == "pyarrow":
+            require_pyarrow()
+        if sampling not in ("head", "random"):
+            raise ValueError(f"Unknown sampling mode '{sampling}'. Use 'head' or 'random'.")
+        if probe is None:
+            probe = FileProbe(file_path)
+        if not probe.exists:
+            raise FileNotFoundError(probe.error)
+        if incremental and probe.compression is not None:
+            raise ValueError("Incremental profiling requires an uncompressed file.")
+        if incremental and probe.reader is not None:
+            raise ValueError("Incremental profiling requires a CSV file.")
+
         self.file_path = file_path
-        self.sep = sep if sep else detect_separator(file_path)
+        self.probe = probe
+        self.sep = sep if sep else probe.sep
         self.max_rows_analyzed = max_rows_analyzed
         self.max_cols_analyzed = max_cols_analyzed
-        self.file_size_mb = get_file_size_mb(file_path)
+        self.columns = [columns] if isinstance(columns, str) else columns
+        self.exclude_columns = [exclude_columns] if isinstance(exclude_columns, str) else exclude_columns
+        self.approx_distinct = approx_distinct
+        self.distinct_error = distinct_error
+        self.compact_metadata = compact_metadata
+        self.wide_mode = wide_mode
+        self.streaming = streaming or incremental
+        self.incremental = incremental
+        self.chunk_size = chunk_size
+        self.quote_aware_row_count = quote_aware_row_count
+        self.cache = cache
+        self.n_workers = n_workers
+        self.parallel_backend = parallel_backend
+        self.engine = engine
+        self.sampling = sampling
+        self.random_state = random_state
+        self.optimize_dtypes = optimize_dtypes
+        # Column dtypes before optimization and the memory saved by it
+        self.source_dtypes: Dict[str, str] = {}
+        self.memory_report: Optional[Dict[str, Any]] = None
+        self.compression = probe.compression
+        # Reader for non-CSV formats (None for CSV files)
+        self.reader = probe.reader
+        self.file_size_mb = probe.size_mb
         self.df: Optional[pd.DataFrame] = None
+        # String length statistics of the loaded columns, shared by metadata and validation
+        self.length_stats: Dict[str, Dict[str, Any]] = {}
+        self.profiler: Optional[StreamingProfiler] = None
+        self.row_count: Optional[int] = None
         self.metadata: Dict[str, Any] = {}
     
+    def _read_csv(self, source: Any = None, **kwargs: Any) -> Any:
+        """
+        Read the CSV file with the configured separator and engine.
+        
+        Args:
+            source: Binary file object to read instead of the file path
+            **kwargs: Additional parameters for pd.read_csv
+            
+        Returns:
+            A DataFrame, or a chunk iterator if chunksize is given
+        """
+        if self.engine == "pyarrow" and source is None and self.compression is not None and "chunksize" not in kwargs:
+            # Not every compression format is detected by the Arrow reader
+            with open_binary(self.file_path) as f:
+                return read_csv_arrow(f, self.sep, **kwargs)
+        if source is None:
+            source = self.file_path
+        if self.engine == "pyarrow":
+            if "chunksize" not in kwargs:
+                return read_csv_arrow(source, self.sep, **kwargs)
+            # The Arrow reader has no row-based chunking, use the C parser for chunks
+            return pd.read_csv(source, sep=self.sep, **kwargs)
+        return pd.read_csv(source, sep=self.sep, engine=self.engine, **kwargs)
+    
+    def _get_columns_to_use(self) -> Optional[List[str]]:
+        """
+        Get the subset of columns to read when a column selection or limit applies.
+        
+        Returns:
+            List of column names, or None to read all columns
+        """
+        if not self.max_cols_analyzed and self.columns is None and not self.exclude_columns:
+            return None
+        columns = self.reader.read_columns() if self.reader is not None else list(self._read_csv(nrows=0).columns)
+        selected = select_columns(columns, self.columns, self.exclude_columns)
+        if self.max_cols_analyzed:
+            selected = selected[:self.max_cols_analyzed]
+        if len(selected) == len(columns):
+            return None
+        return selected
+    
     def load_data(self) -> None:
         """
         Load the CSV file into a pandas DataFrame with appropriate sampling.
         """
-        # For large files, use sampling
-        if self.file_size_mb > 100:  # If file is larger than 100MB
-            # First load just the header to get column names
-            df_header = pd.read_csv(self.file_path, sep=self.sep, nrows=0)
-            total_cols = len(df_header.columns)
+        if self.reader is not None:
+            # Typed formats are read with their own dtypes, so nothing is inferred up front
+            read_dtypes: Dict[str, str] = {}
+            cols_to_use = self._get_columns_to_use()
+            if self.sampling == "random":
+                self.df = self.reader.sample(
+                    self.max_rows_analyzed, columns=cols_to_use,
+                    random_state=self.random_state, chunk_size=self.chunk_size
+                )
+            else:
+                self.df = self.reader.read(columns=cols_to_use, nrows=self.max_rows_analyzed)
+                if len(self.df) < self.max_rows_analyzed:
+                    self.row_count = len(self.df)
+        # For large files, use sampling (the decompressed size of compressed files is unknown)
+        elif self.file_size_mb > 100 or self.compression is not None:  # If file is larger than 100MB
+            # Select a subset of columns if needed
+            cols_to_use = self._get_columns_to_use()
+            read_dtypes = self._infer_read_dtypes(usecols=cols_to_use) if self.optimize_dtypes else {}
+            read_kwargs = {"dtype": read_dtypes} if read_dtypes else {}
             
             # Now load with sampling
-            if self.max_cols_analyzed and self.max_cols_analyzed < total_cols:
-                # Select a subset of columns if needed
-                cols_to_use = list(df_header.columns[:self.max_cols_analyzed])
-                self.df = pd.read_csv(
-                    self.file_path, 
-                    sep=self.sep, 
-                    usecols=cols_to_use,
-                    nrows=self.max_rows_analyzed
-                )
+            if self.sampling == "random" and self.compression is not None:
+                # Compressed streams cannot seek, sample rows in one chunked pass
+                self.df = self._read_random_rows(usecols=cols_to_use, **read_kwargs)
+            elif self.sampling == "random":
+                self.df = self._read_random_blocks(usecols=cols_to_use, **read_kwargs)
             else:
-                self.df = pd.read_csv(
-                    self.file_path, 
-                    sep=self.sep, 
-                    nrows=self.max_rows_analyzed
-                )
+                self.df = self._read_csv(usecols=cols_to_use, nrows=self.max_rows_analyzed, **read_kwargs)
+                if len(self.df) < self.max_rows_analyzed:
+                    # The whole file was parsed, so it does not need to be read again to count rows
+                    self.row_count = len(self.df)
         else:
+            # Only parse the selected columns
+            cols_to_use = self._get_columns_to_use()
+            read_dtypes = self._infer_read_dtypes(usecols=cols_to_use) if self.optimize_dtypes else {}
+            read_kwargs = {"dtype": read_dtypes} if read_dtypes else {}
+            
             # For smaller files, load normally
-            self.df = pd.read_csv(self.file_path, sep=self.sep)
+            self.df = self._read_csv(usecols=cols_to_use, **read_kwargs)
             
-            # Apply column limit if specified
-            if self.max_cols_analyzed and len(self.df.columns) > self.max_cols_analyzed:
-                self.df = self.df.iloc[:, :self.max_cols_analyzed]
+            # The whole file was parsed, so the row count is already known
+            self.row_count = len(self.df)
             
             # Apply row limit if specified
             if len(self.df) > self.max_rows_analyzed:
-                self.df = self.df.iloc[:self.max_rows_analyzed]
+                if self.sampling == "random":
+                    self.df = self.df.sample(
+                        n=self.max_rows_analyzed, random_state=self.random_state
+                    ).sort_index().reset_index(drop=True)
+                else:
+                    self.df = self.df.iloc[:self.max_rows_analyzed]
+        
+        if self.optimize_dtypes:
+            # Columns read as categoricals would otherwise have been strings
+            self.df, self.source_dtypes, self.memory_report = optimize_frame_dtypes(
+                self.df, {col: "object" for col in read_dtypes}
+            )
+        self.length_stats = {}
+    
+    def _infer_read_dtypes(self, usecols: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Infer compact dtypes for the reader from the first block of the file.
+        
+        Args:
+            usecols: Columns to read (all columns if None)
+            
+        Returns:
+            Dictionary mapping column names to dtypes for the reader
+        """
+        if self.engine == "pyarrow":
+            # Arrow-backed strings are already compact
+            return {}
+        probe = self._read_csv(usecols=usecols, nrows=DTYPE_PROBE_ROWS)
+        return infer_read_dtypes(probe)
+    
+    def _read_random_blocks(self, usecols: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
+        """
+        Read a sample of rows from blocks at random positions across the file.
+        
+        The data section of the file is split into equal byte ranges and one block
+        of consecutive rows is read from a random offset in each range, so the
+        sample covers the whole file at about the I/O cost of reading the same
+        number of rows from the start. Each offset is moved to the next row
+        boundary. Rows containing quoted newlines may be split at a block start.
+        
+        Args:
+            usecols: Columns to read (all columns if None)
+            **kwargs: Additional parameters for the CSV reader
+            
+        Returns:
+            A DataFrame with at most max_rows_analyzed rows in file order
+        """
+        max_rows = self.max_rows_analyzed
+        rows_per_block = max(1, -(-max_rows // RANDOM_SAMPLE_BLOCKS))
+        rng = np.random.default_rng(self.random_state)
+        file_size = os.path.getsize(self.file_path)
+        lines: List[bytes] = []
+        
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            data_start = f.tell()
+            stratum_size = (file_size - data_start) / RANDOM_SAMPLE_BLOCKS
+            position = data_start
+            
+            for i in range(RANDOM_SAMPLE_BLOCKS):
+                if len(lines) >= max_rows:
+                    break
+                # Never go back into a block that was already read
+                offset = max(data_start + int(stratum_size * (i + rng.random())), position)
+                if offset >= file_size:
+                    break
+                
+                # Reading from the byte before the offset skips to the next row start
+                # (or stays put if the offset already is one)
+                f.seek(offset - 1)
+                f.readline()
+                
+                for _ in range(min(rows_per_block, max_rows - len(lines))):
+                    line = f.readline()
+                    if not line:
+                        break
+                    lines.append(line if line.endswith(b"\n") else line + b"\n")
+                position = f.tell()
+        
+        return self._read_csv(source=io.BytesIO(header + b"".join(lines)), usecols=usecols, **kwargs)
+    
+    def _read_random_rows(self, usecols: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
+        """
+        Read a uniform random sample of rows in a single pass over the file.
+        
+        Used for compressed files, which cannot be read at random offsets. The
+        pass also counts the rows of the file.
+        
+        Args:
+            usecols: Columns to read (all columns if None)
+            **kwargs: Additional parameters for the CSV reader
+            
+        Returns:
+            A DataFrame with at most max_rows_analyzed rows in file order
+        """
+        chunks = self._read_csv(usecols=usecols, chunksize=self.chunk_size, **kwargs)
+        sample, self.row_count = sample_chunks(chunks, self.max_rows_analyzed, self.random_state)
+        if sample is None:
+            return self._read_csv(usecols=usecols, nrows=0)
+        return sample
+    
+    def cache_params(self) -> Dict[str, Any]:
+        """
+        Get the analysis parameters that affect the metadata.
+        
+        Returns:
+            Dictionary of parameters used to build cache keys
+        """
+        return {
+            "sep": self.sep,
+            "max_rows_analyzed": self.max_rows_analyzed,
+            "max_cols_analyzed": self.max_cols_analyzed,
+            "columns": self.columns,
+            "exclude_columns": self.exclude_columns,
+            "streaming": self.streaming,
+            "quote_aware_row_count": self.quote_aware_row_count,
+            "engine": self.engine,
+            "sampling": self.sampling,
+            "random_state": self.random_state,
+            "optimize_dtypes": self.optimize_dtypes,
+            "approx_distinct": self.approx_distinct,
+            "distinct_error": self.distinct_error,
+            "compact_metadata": self.compact_metadata,
+            "wide_mode": self.wide_mode
+        }
+    
+    def quantile(self, column: str, q: float) -> Optional[float]:
+        """
+        Get a quantile of a numeric column without reading the file again.
+        
+        In streaming mode the quantile is estimated from the column's sketch
+        and covers the whole file, otherwise it is computed on the loaded rows.
+        
+        Args:
+            column: Name of the column
+            q: Quantile between 0 and 1
+            
+        Returns:
+            The quantile, or None if the column has no numeric values
+        """
+        if self.profiler is not None and column in self.profiler.accumulators:
+            return self.profiler.accumulators[column].quantiles.quantile(q)
+        if self.df is None:
+            self.load_data()
+        if self.df is None or not is_numeric_type(self.df[column].dtype):
+            return None
+        value = self.df[column].quantile(q)
+        return float(value) if not pd.isna(value) else None
+    
+    def string_length_stats(self, column: str) -> Dict[str, Any]:
+        """
+        Get the string length statistics of a column of the loaded rows.
+        
+        Lengths are measured once per column and reused by the column metadata
+        and the validation checks.
+        
+        Args:
+            column: Name of the column
+            
+        Returns:
+            Dictionary with nulls, the count of measured values and min_length,
+            max_length, avg_length and std_length (see string_length_summary)
+        """
+        if self.df is None:
+            self.load_data()
+        if column not in self.length_stats:
+            self.length_stats[column] = string_length_summary(self.df[column])
+        return self.length_stats[column]
+    
+    def _distinct_error(self) -> Optional[float]:
+        """Get the error rate of approximate distinct counts, or None for exact counts."""
+        return self.distinct_error if self.approx_distinct else None
+    
+    def iter_chunks(self, dtype: Optional[Dict[str, Any]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read the entire file in chunks of chunk_size rows.
+        
+        Only the selected columns are read, and only one chunk is held in
+        memory at a time.
+        
+        Args:
+            dtype: Dtypes of CSV columns, so they are read the same way in every
+                chunk instead of being inferred per chunk (typed formats keep their own)
+        
+        Returns:
+            Iterator over DataFrames with consecutive rows of the file
+        """
+        if self.reader is not None:
+            return self.reader.iter_chunks(self._get_columns_to_use(), self.chunk_size)
+        if dtype is not None:
+            return iter(self._read_csv(usecols=self._get_columns_to_use(), chunksize=self.chunk_size, dtype=dtype))
+        return iter(self._read_csv(usecols=self._get_columns_to_use(), chunksize=self.chunk_size))
+    
+    def digest(self) -> Dict[str, Any]:
+        """
+        Get the order-independent digest of the entire file.
+        
+        The digest is computed in one pass over the file and saved next to
+        it, so later calls on the unchanged file read it back instead.
+        
+        Returns:
+            Dictionary in the format of dataset_digest
+        """
+        params = {"sep": self.sep, "columns": self._get_columns_to_use()}
+        digest = load_digest(self.file_path, params)
+        if digest is None:
+            digest = dataset_digest(self.iter_chunks())
+            save_digest(self.file_path, params, digest)
+        return digest
+    
+    def stream_profile(self) -> StreamingProfiler:
+        """
+        Compute column statistics over the entire file in chunks.
+        
+        Only one chunk is held in memory at a time, so the statistics cover
+        every row of the file regardless of its size.
+        
+        Returns:
+            A profiler holding statistics for the whole file
+        """
+        if self.incremental:
+            profiler = self._incremental_profile()
+        else:
+            profiler = StreamingProfiler(distinct_error=self._distinct_error())
+            for chunk in self.iter_chunks():
+                profiler.update(chunk)
+        
+        self.profiler = profiler
+        return profiler
+    
+    def _incremental_profile(self) -> StreamingProfiler:
+        """
+        Profile the rows appended to the file since the last incremental run.
+        
+        The saved statistics are reused when the file still starts with the
+        bytes profiled last time, otherwise the whole file is profiled. The
+        state is saved again when the file ends with a complete row.
+        
+        Returns:
+            A profiler holding statistics for the whole file
+        """
+        usecols = self._get_columns_to_use()
+        columns = list(self._read_csv(nrows=0).columns)
+        params = {"sep": self.sep, "columns": columns, "usecols": usecols}
+        if self.approx_distinct:
+            # Saved statistics without sketches cannot give distinct counts
+            params["distinct_error"] = self.distinct_error
+        state = load_state(self.file_path, params)
+        
+        with open(self.file_path, 'rb') as f:
+            if state is None:
+                profiler = StreamingProfiler(distinct_error=self._distinct_error())
+                f.readline()  # Skip the header
+            else:
+                profiler = state["profiler"]
+                f.seek(state["offset"])
+            
+            try:
+                chunks = self._read_csv(
+                    source=f, header=None, names=columns, usecols=usecols, chunksize=self.chunk_size
+                )
+                for chunk in chunks:
+                    profiler.update(chunk)
+            except pd.errors.EmptyDataError:
+                # Nothing was appended
+                pass
+            
+            # A partially written last row is profiled again next time
+            end = f.seek(0, os.SEEK_END)
+            f.seek(max(end - 1, 0))
+            if f.read(1) == b"\n":
+                save_state(self.file_path, params, end, profiler)
+        
+        return profiler
     
     def analyze(self) -> Dict[str, Any]:
         """
         Analyze the CSV file and return a metadata dictionary.
         
+        Unless columns are analyzed in parallel or in wide mode, the metadata of
+        each column is a ColumnProfile that computes its statistics when they
+        are first read.
+        With compact_metadata, every column is computed and packed into a
+        ProfileStore as it is analyzed.
+        
         Returns:
             A dictionary containing metadata about the CSV file
         """
+        # Reuse a previous analysis of the same file version if available
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.file_path, "metadata", self.cache_params())
+            cached_metadata = self.cache.get(cache_key)
+            if cached_metadata is not None:
+                self.metadata = cached_metadata
+                self.row_count = cached_metadata["total_rows"]
+                return self.metadata
+        
         if self.df is None:
             self.load_data()
         
@@ -90,12 +677,19 @@ class CSVPreprocessor:
         shape = self.df.shape
         
         # Get row count of the actual file (not just the sample)
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                row_count = sum(1 for _ in f) - 1  # Subtract header row
-        except:
-            # Fall back to sample size if we can't count all rows
-            row_count = shape[0]
+        if self.streaming:
+            # The streaming pass already visits every row
+            self.row_count = self.stream_profile().row_count
+        elif self.row_count is None:
+            try:
+                if self.reader is not None:
+                    self.row_count = self.reader.count_rows()
+                else:
+                    self.row_count = count_rows(self.file_path, quote_aware=self.quote_aware_row_count)
+            except Exception:
+                # Fall back to sample size if we can't count all rows
+                self.row_count = shape[0]
+        row_count = self.row_count
         
         # Initialize metadata
         self.metadata = {
@@ -106,60 +700,86 @@ class CSVPreprocessor:
             "total_columns": shape[1],
             "analyzed_rows": min(shape[0], self.max_rows_analyzed),
             "analyzed_columns": shape[1],
-            "columns": {},
-            "sample_provided": shape[0] < row_count
+            "columns": ProfileStore(shape[1]) if self.compact_metadata else {},
+            "sample_provided": shape[0] < row_count,
+            "profile_mode": "streaming" if self.streaming else "sample"
         }
-        
-        # Column analysis
-        for col in self.df.columns:
-            col_data = self.df[col]
-            col_type = str(col_data.dtype)
-            
-            # Prepare column metadata
-            col_meta: Dict[str, Any] = {
-                "type": col_type,
-                "nulls": int(col_data.isna().sum()),
-                "null_percentage": round(col_data.isna().mean() * 100, 2),
-                "unique_count": int(col_data.nunique())
+        if self.compression is not None:
+            self.metadata["compression"] = self.compression
+        if self.reader is not None:
+            self.metadata["format"] = self.reader.format_name
+        if self.memory_report is not None:
+            self.metadata["memory_optimization"] = self.memory_report
+        if self.approx_distinct:
+            # Rows covered by the distinct counts, needed to turn them into ratios
+            self.metadata["unique_counts"] = {
+                "method": "hyperloglog",
+                "error_rate": self.distinct_error,
+                "rows": row_count if self.streaming else shape[0]
             }
+        
+        # Column analysis (in column order, even when run in parallel)
+        columns = list(self.df.columns)
+        column_data = [self.df[col] for col in columns]
+        if self.n_workers is not None and self.n_workers > 1 and len(columns) > 1:
+            # Workers compute all statistics up front
+            numeric_stats = _numeric_column_stats(self.df)
+            column_stats = [numeric_stats.get(col) for col in columns]
+            executor_class = ProcessPoolExecutor if self.parallel_backend == "process" else ThreadPoolExecutor
+            with executor_class(max_workers=self.n_workers) as executor:
+                column_results = list(executor.map(
+                    _analyze_column, column_data, column_stats, [self._distinct_error()] * len(columns)
+                ))
+        elif self.wide_mode:
+            # Each statistic is computed for whole batches of columns
+            string_columns = [col for col in columns if column_kind(self.df[col].dtype) == "string"]
+            self.length_stats.update(string_length_stats(self.df, string_columns))
+            profiles = profile_columns(
+                self.df, _numeric_column_stats(self.df), self._distinct_error(), self.random_state,
+                length_stats=self.length_stats
+            )
+            column_results = [profiles[col] for col in columns]
+        else:
+            # Statistics are computed when they are first read
+            batched_stats = _BatchedNumericStats(self.df)
+            column_results = [
+                ColumnProfile(
+                    col_data, partial(batched_stats.get, col), self._distinct_error(),
+                    partial(self.string_length_stats, col)
+                )
+                for col, col_data in zip(columns, column_data)
+            ]
+        
+        # Full-file statistics stored in the file itself (e.g. Parquet footers)
+        stored_stats = {}
+        if self.reader is not None and self.profiler is None:
+            stored_stats = self.reader.column_statistics(columns)
+        
+        for col, col_meta in zip(columns, column_results):
+            # Report the dtype the column has without memory optimization
+            if col in self.source_dtypes:
+                col_meta["type"] = self.source_dtypes[col]
             
-            # Add stats based on data type
-            if np.issubdtype(col_data.dtype, np.number):
-                # Numeric columns
-                col_meta.update({
-                    "min": col_data.min() if not pd.isna(col_data.min()) else None,
-                    "max": col_data.max() if not pd.isna(col_data.max()) else None,
-                    "mean": round(float(col_data.mean()), 2) if not pd.isna(col_data.mean()) else None,
-                    "median": round(float(col_data.median()), 2) if not pd.isna(col_data.median()) else None,
-                    "std": round(float(col_data.std()), 2) if not pd.isna(col_data.std()) else None
-                })
-            elif col_data.dtype == 'object' or col_data.dtype == 'string':
-                # String columns
-                non_null_values = col_data.dropna()
-                if len(non_null_values) > 0:
-                    col_meta.update({
-                        "min_length": min(non_null_values.str.len()),
-                        "max_length": max(non_null_values.str.len()),
-                        "avg_length": round(float(non_null_values.str.len().mean()), 2)
-                    })
-            
-            # Add sample values (max 5)
-            try:
-                non_null_sample = col_data.dropna().sample(min(5, col_data.nunique())).tolist()
-                col_meta["examples"] = non_null_sample
-            except:
-                # If sampling fails, get first few non-null values
-                non_null_sample = col_data.dropna().iloc[:5].tolist()
-                col_meta["examples"] = non_null_sample
-            
-            # Add top values for categorical-like columns
-            if col_meta["unique_count"] < 20 and col_meta["unique_count"] > 0:
-                value_counts = col_data.value_counts(normalize=True).head(10).to_dict()
-                col_meta["value_distribution"] = {str(k): round(float(v) * 100, 2) for k, v in value_counts.items()}
+            # Replace sample statistics with full-file statistics when streaming
+            full_stats = None
+            if self.profiler is not None and col in self.profiler.accumulators:
+                full_stats = self.profiler.accumulators[col].to_metadata()
+            elif col in stored_stats:
+                full_stats = dict(stored_stats[col])
+                full_stats["null_percentage"] = round(full_stats["nulls"] / row_count * 100, 2) if row_count else 0.0
+            if full_stats is not None:
+                sample_nulls = col_meta["nulls"]
+                col_meta.update(full_stats)
+                if shape[0] < row_count:
+                    # Ratios with sample statistics (e.g. unique counts) need the sample's nulls
+                    col_meta["sample_nulls"] = sample_nulls
             
             # Store column metadata
             self.metadata["columns"][col] = col_meta
         
+        if cache_key is not None and self.cache is not None:
+            self.cache.put(cache_key, self.metadata)
+        
         return self.metadata
     
     def to_dict(self) -> Dict[str, Any]:
@@ -180,4 +800,4 @@ class CSVPreprocessor:
         Returns:
             A JSON string of metadata
         """
-        return json.dumps(self.to_dict(), indent=2, default=str)
\ No newline at end of file
+        return metadata_to_json(self.to_dict())
\ No newline at end of file
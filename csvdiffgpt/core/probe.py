@@ -0,0 +1,178 @@
+"""Single-pass inspection of a CSV file before parsing."""
+import io
+import os
+import re
+import csv
+import codecs
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+from .compression import get_compression, open_binary
+from ..readers import BaseReader, get_reader
+
+# Number of bytes read from the start of the file
+HEAD_BLOCK_SIZE = 64 * 1024
+
+# Number of bytes read from the middle and the end of large uncompressed files
+EXTRA_BLOCK_SIZE = 16 * 1024
+
+# Separators considered when sniffing the dialect
+CANDIDATE_SEPARATORS = [',', ';', '\t', '|']
+
+# Quoted fields, removed before counting separators on a line
+_QUOTED_FIELD = re.compile(r'"[^"]*"')
+
+
+def vote_separator(lines: List[str], candidates: Optional[List[str]] = None) -> str:
+    """
+    Pick the separator that splits the most lines into the same number of fields.
+
+    Separators inside double-quoted fields are not counted. Ties are broken
+    by the total number of occurrences.
+
+    Args:
+        lines: Lines of the file to vote on
+        candidates: Separators to consider (CANDIDATE_SEPARATORS if None)
+
+    Returns:
+        The most consistent separator (',' if no candidate occurs)
+    """
+    candidates = candidates or CANDIDATE_SEPARATORS
+    unquoted_lines = [_QUOTED_FIELD.sub("", line) if '"' in line else line for line in lines]
+
+    best_sep = ','
+    best_score = (0, 0)
+    for sep in candidates:
+        counts = [line.count(sep) for line in unquoted_lines]
+        nonzero = [count for count in counts if count > 0]
+        if not nonzero:
+            continue
+        # Lines agreeing with the most common field count
+        mode_count = Counter(nonzero).most_common(1)[0][0]
+        score = (counts.count(mode_count), sum(nonzero))
+        if score > best_score:
+            best_sep, best_score = sep, score
+    return best_sep
+
+
+class FileProbe:
+    """
+    Inspects a CSV file once before it is parsed.
+
+    The head of the file (plus a block from the middle and the end of large
+    uncompressed files) is read with a single open, and readability, encoding,
+    separator, header and size are derived from those bytes. A probe can be
+    passed to CSVPreprocessor so the file is not opened again for sniffing.
+
+    Files in a format with a registered reader (e.g. Parquet) are not sniffed,
+    their header comes from the reader.
+    """
+
+    def __init__(self, file_path: str, sample_size: int = HEAD_BLOCK_SIZE):
+        """
+        Probe a file.
+
+        Probing never raises for unreadable files, check is_valid and error instead.
+
+        Args:
+            file_path: Path to the CSV file
+            sample_size: Number of bytes read from the start of the file
+        """
+        self.file_path = file_path
+        self.compression = get_compression(file_path)
+        self.exists = os.path.exists(file_path)
+        self.size = os.path.getsize(file_path) if self.exists else 0
+        self.encoding = "utf-8"
+        self.sep = ','
+        self.header: List[str] = []
+        self.format = "csv"
+        self.reader: Optional[BaseReader] = None
+        self.error: Optional[str] = None
+
+        if not self.exists:
+            self.error = f"File not found: {file_path}"
+            return
+
+        try:
+            self.reader = get_reader(file_path)
+            if self.reader is not None:
+                self.format = self.reader.format_name
+                self.header = self.reader.read_columns()
+                return
+        except Exception as e:
+            self.error = f"Error reading file: {str(e)}"
+            return
+
+        try:
+            head, extra_blocks = self._read_blocks(sample_size)
+            text = self._decode(head)
+            # Blocks from the middle may start inside a multi-byte character
+            extra_texts = [block.decode("utf-8", errors="replace") for block in extra_blocks]
+        except Exception as e:
+            self.error = f"Error reading file: {str(e)}"
+            return
+
+        # Only complete lines take part in the vote
+        lines = text.splitlines()
+        if len(head) == sample_size and len(lines) > 1:
+            lines = lines[:-1]
+        for extra in extra_texts:
+            # Blocks start and may end in the middle of a line
+            lines.extend(extra.splitlines()[1:-1])
+        self.sep = vote_separator(lines)
+
+        try:
+            reader = csv.reader(io.StringIO(text), delimiter=self.sep)
+            self.header = next(reader, [])
+            # Read a few rows to check structure
+            for _ in range(4):
+                next(reader, None)
+        except Exception as e:
+            self.error = f"Invalid CSV format: {str(e)}"
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the file exists, is readable and looks like a CSV file."""
+        return self.error is None
+
+    @property
+    def size_mb(self) -> float:
+        """Size of the file on disk in megabytes."""
+        return self.size / (1024 * 1024)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the probe results as a dictionary.
+
+        Returns:
+            Dictionary of the probed file properties
+        """
+        return {
+            "file_path": self.file_path,
+            "size": self.size,
+            "compression": self.compression,
+            "format": self.format,
+            "encoding": self.encoding,
+            "separator": self.sep,
+            "header": self.header,
+            "error": self.error
+        }
+
+    def _read_blocks(self, sample_size: int) -> Tuple[bytes, List[bytes]]:
+        """Read the head block and, for large uncompressed files, blocks from the middle and the end."""
+        extra_blocks = []
+        with open_binary(self.file_path) as f:
+            head = f.read(sample_size)
+            if self.compression is None and self.size > sample_size + 2 * EXTRA_BLOCK_SIZE:
+                for offset in (self.size // 2, self.size - EXTRA_BLOCK_SIZE):
+                    f.seek(offset)
+                    extra_blocks.append(f.read(EXTRA_BLOCK_SIZE))
+        return head, extra_blocks
+
+    def _decode(self, block: bytes) -> str:
+        """Decode the head block and detect a byte order mark, tolerating a character cut at the block end."""
+        if block.startswith(codecs.BOM_UTF8):
+            self.encoding = "utf-8-sig"
+            block = block[len(codecs.BOM_UTF8):]
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        return decoder.decode(block, final=False)
@@ -0,0 +1,563 @@
+"""Array-backed column metadata for files with very many columns."""
+import json
+from json.encoder import encode_basestring_ascii
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, List, Iterator, Iterable
+
+import numpy as np
+
+from .profiler import PROFILE_PERCENTILES
+
+# Metadata fields in the order they appear for each column
+FIELD_ORDER = [
+    "type", "nulls", "null_percentage", "unique_count",
+    "min", "max", "mean", "median", "std", "percentiles",
+    "min_length", "max_length", "avg_length",
+    "examples", "value_distribution", "sample_nulls"
+]
+
+# Bit marking each field as present in a row
+FIELD_BITS = {field: 1 << i for i, field in enumerate(FIELD_ORDER)}
+
+# Fields held as integers and as floats in the table
+INT_FIELDS = ["nulls", "unique_count", "min_length", "max_length", "sample_nulls"]
+FLOAT_FIELDS = ["null_percentage", "min", "max", "mean", "median", "std", "avg_length"]
+
+# Percentile fields held as floats in the table
+PERCENTILE_NAMES = [f"p{p}" for p in PROFILE_PERCENTILES]
+PERCENTILE_COLUMNS = [f"percentiles_{name}" for name in PERCENTILE_NAMES]
+
+# Fields held as JSON text in a buffer shared by all columns
+TEXT_FIELDS = ["examples", "value_distribution"]
+
+# One row per column
+PROFILE_DTYPE = np.dtype(
+    [("type", np.uint16), ("present", np.uint16), ("integers", np.uint16)]
+    + [(field, np.int64) for field in INT_FIELDS]
+    + [(field, np.float64) for field in FLOAT_FIELDS]
+    + [(name, np.float64) for name in PERCENTILE_COLUMNS]
+    + [(f"{field}_{part}", np.int64) for field in TEXT_FIELDS for part in ("start", "end")]
+)
+
+# Largest integer a float64 holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+_INT64_MIN = int(np.iinfo(np.int64).min)
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+def _is_int(value: Any) -> bool:
+    """Check whether a value is an integer (booleans excluded)."""
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_float(value: Any) -> bool:
+    """Check whether a value is a float."""
+    return isinstance(value, (float, np.floating))
+
+
+def _encode_text(value: Any) -> Any:
+    """
+    Encode a list or dictionary of plain values as JSON.
+
+    Args:
+        value: Field value
+
+    Returns:
+        UTF-8 encoded JSON, or None if the value cannot be encoded exactly
+    """
+    if type(value) not in (list, dict):
+        return None
+    try:
+        return json.dumps(value, default=_plain_scalar).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+
+
+def _plain_scalar(value: Any) -> Any:
+    """
+    Convert a NumPy number or boolean to the Python value for JSON.
+
+    Args:
+        value: Value the JSON encoder does not handle
+
+    Returns:
+        The equal Python int, float or bool
+
+    Raises:
+        TypeError: If the value is not a NumPy number or boolean
+    """
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ColumnView(MutableMapping):
+    """
+    Dictionary view of one column in a ProfileStore.
+
+    Reading a field converts it from the table. Assigned fields are written
+    back to the store.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "ProfileStore", row: int):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.store.get_field(self.row, key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        fields = self.to_dict()
+        fields[key] = value
+        self.store.set_row(self.row, fields)
+
+    def __delitem__(self, key: Any) -> None:
+        fields = self.to_dict()
+        del fields[key]
+        self.store.set_row(self.row, fields)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.field_names(self.row))
+
+    def __len__(self) -> int:
+        return len(self.store.field_names(self.row))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get all fields as a plain dictionary.
+
+        Returns:
+            Dictionary of column metadata
+        """
+        return self.store.row_fields(self.row)
+
+    def copy(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class ProfileStore(MutableMapping):
+    """
+    Metadata of many columns held in one NumPy structured array.
+
+    Counts and statistics of each column are stored as one typed row of the
+    table, examples and value distributions as JSON text in a single buffer,
+    instead of a dictionary of Python objects per column. Only values that
+    fit neither (e.g. timestamps) are kept as Python objects. The store
+    behaves like the dictionary mapping column names to column metadata,
+    with a ColumnView for each column.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity: Number of columns to allocate rows for up front
+        """
+        self.table = np.zeros(capacity, dtype=PROFILE_DTYPE)
+        self.text = bytearray()
+        # Bytes of the text buffer no longer referenced by any row
+        self.dead_text = 0
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        # Fields that fit neither the table nor the text buffer, by row
+        self.overflow: Dict[int, Dict[str, Any]] = {}
+        # Distinct column types, referenced by code from the table
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_columns(cls, columns: Mapping) -> "ProfileStore":
+        """
+        Build a store from column metadata dictionaries.
+
+        Args:
+            columns: Dictionary mapping column names to column metadata
+
+        Returns:
+            A store holding the same metadata
+        """
+        store = cls(len(columns))
+        for name, fields in columns.items():
+            store[name] = fields
+        return store
+
+    # Packing and unpacking rows
+
+    def set_row(self, row: int, fields: Mapping) -> None:
+        """
+        Store the metadata of a column in a row of the table.
+
+        Examples and value distributions are written over their previous
+        text of the row when they fit, and the text buffer is compacted once most
+        of it is no longer referenced.
+
+        Args:
+            row: Row of the column
+            fields: Column metadata
+        """
+        previous = self.table[row].copy()
+        reused = set()
+        record = np.zeros(1, dtype=PROFILE_DTYPE)[0]
+        overflow: Dict[str, Any] = {}
+        present = 0
+        integers = 0
+
+        for key, value in fields.items():
+            bit = FIELD_BITS.get(key)
+            encoded = _encode_text(value) if key in TEXT_FIELDS else None
+            if key == "type" and isinstance(value, str):
+                record["type"] = self._type_code(value)
+            elif key in INT_FIELDS and _is_int(value) and _INT64_MIN <= value <= _INT64_MAX:
+                record[key] = value
+            elif key in FLOAT_FIELDS and value is None:
+                record[key] = np.nan
+            elif key in FLOAT_FIELDS and _is_float(value):
+                record[key] = value
+            elif key in FLOAT_FIELDS and _is_int(value) and abs(value) <= _MAX_EXACT_INT:
+                record[key] = value
+                integers |= bit
+            elif key == "percentiles" and self._fits_percentiles(value):
+                for name, column in zip(PERCENTILE_NAMES, PERCENTILE_COLUMNS):
+                    record[column] = np.nan if value[name] is None else value[name]
+            elif encoded is not None:
+                start = int(previous[f"{key}_start"])
+                size = int(previous[f"{key}_end"]) - start
+                if int(previous["present"]) & bit and len(encoded) <= size:
+                    self.text[start:start + len(encoded)] = encoded
+                    self.dead_text += size - len(encoded)
+                    reused.add(key)
+                else:
+                    start = len(self.text)
+                    self.text += encoded
+                record[f"{key}_start"] = start
+                record[f"{key}_end"] = start + len(encoded)
+            else:
+                overflow[key] = value
+                continue
+            present |= bit
+
+        record["present"] = present
+        record["integers"] = integers
+        self.dead_text += self._text_size(previous, exclude=reused)
+        self.table[row] = record
+        if overflow:
+            self.overflow[row] = overflow
+        else:
+            self.overflow.pop(row, None)
+        if self.dead_text > len(self.text) // 2:
+            self.compact_text()
+
+    @staticmethod
+    def _text_size(record: Any, exclude: Iterable[str] = ()) -> int:
+        """Get the number of text buffer bytes referenced by a row."""
+        present = int(record["present"])
+        return sum(
+            int(record[f"{field}_end"]) - int(record[f"{field}_start"])
+            for field in TEXT_FIELDS
+            if present & FIELD_BITS[field] and field not in exclude
+        )
+
+    def compact_text(self) -> None:
+        """Rebuild the text buffer with only the text referenced by the rows."""
+        table = self.table[:len(self.names)]
+        text = bytearray()
+        for field in TEXT_FIELDS:
+            starts = table[f"{field}_start"]
+            ends = table[f"{field}_end"]
+            for row in np.flatnonzero(table["present"] & FIELD_BITS[field]).tolist():
+                start = len(text)
+                text += self.text[starts[row]:ends[row]]
+                starts[row] = start
+                ends[row] = len(text)
+        self.text = text
+        self.dead_text = 0
+
+    @staticmethod
+    def _fits_percentiles(value: Any) -> bool:
+        """Check whether percentiles can be held as floats in the table."""
+        return (
+            isinstance(value, dict)
+            and list(value) == PERCENTILE_NAMES
+            and all(v is None or _is_float(v) for v in value.values())
+        )
+
+    def _type_code(self, type_name: str) -> int:
+        """Get the code of a column type, adding new types to the list."""
+        code = self._type_codes.get(type_name)
+        if code is None:
+            code = len(self.type_names)
+            self.type_names.append(type_name)
+            self._type_codes[type_name] = code
+        return code
+
+    def field_names(self, row: int) -> List[str]:
+        """
+        Get the fields of a column in metadata order.
+
+        Args:
+            row: Row of the column
+
+        Returns:
+            List of field names
+        """
+        present = int(self.table["present"][row])
+        overflow = self.overflow.get(row, {})
+        names = [field for field in FIELD_ORDER if present & FIELD_BITS[field] or field in overflow]
+        names.extend(key for key in overflow if key not in FIELD_BITS)
+        return names
+
+    def get_field(self, row: int, key: Any) -> Any:
+        """
+        Get one field of a column as a Python value.
+
+        Args:
+            row: Row of the column
+            key: Name of the field
+
+        Returns:
+            Value of the field
+
+        Raises:
+            KeyError: If the column has no such field
+        """
+        overflow = self.overflow.get(row)
+        if overflow is not None and key in overflow:
+            return overflow[key]
+        bit = FIELD_BITS.get(key) if isinstance(key, str) else None
+        if bit is None or not int(self.table["present"][row]) & bit:
+            raise KeyError(key)
+
+        record = self.table[row]
+        if key == "type":
+            return self.type_names[record["type"]]
+        if key in INT_FIELDS:
+            return int(record[key])
+        if key in FLOAT_FIELDS:
+            value = float(record[key])
+            if np.isnan(value):
+                return None
+            return int(value) if int(record["integers"]) & bit else value
+        if key == "percentiles":
+            return {
+                name: None if np.isnan(record[column]) else float(record[column])
+                for name, column in zip(PERCENTILE_NAMES, PERCENTILE_COLUMNS)
+            }
+        return json.loads(self.text[record[f"{key}_start"]:record[f"{key}_end"]])
+
+    def row_fields(self, row: int) -> Dict[str, Any]:
+        """
+        Get all fields of a column as a plain dictionary.
+
+        Args:
+            row: Row of the column
+
+        Returns:
+            Dictionary of column metadata
+        """
+        return {key: self.get_field(row, key) for key in self.field_names(row)}
+
+    # Dictionary interface
+
+    def __getitem__(self, name: Any) -> ColumnView:
+        return ColumnView(self, self.index[name])
+
+    def __setitem__(self, name: Any, fields: Mapping) -> None:
+        if isinstance(fields, ColumnView):
+            fields = fields.to_dict()
+        row = self.index.get(name)
+        if row is None:
+            row = len(self.names)
+            if row == len(self.table):
+                # Grow geometrically when more columns are added than allocated
+                self.table = np.resize(self.table, max(8, 2 * len(self.table)))
+            # Rows added by resizing repeat earlier rows
+            self.table[row] = np.zeros(1, dtype=PROFILE_DTYPE)[0]
+            self.names.append(name)
+            self.index[name] = row
+        self.set_row(row, fields)
+
+    def __delitem__(self, name: Any) -> None:
+        row = self.index[name]
+        self.dead_text += self._text_size(self.table[row])
+        self.table = np.delete(self.table, row)
+        del self.names[row]
+        self.index = {col: i for i, col in enumerate(self.names)}
+        self.overflow = {
+            (i if i < row else i - 1): fields for i, fields in self.overflow.items() if i != row
+        }
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"ProfileStore({len(self.names)} columns, {self.nbytes} bytes)"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Unused preallocated rows are not pickled
+        state = dict(self.__dict__)
+        state["table"] = self.table[:len(self.names)].copy()
+        return state
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the table and the text buffer in bytes."""
+        return int(self.table[:len(self.names)].nbytes) + len(self.text)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of every column as plain dictionaries.
+
+        Returns:
+            Dictionary mapping column names to column metadata
+        """
+        return {name: self.row_fields(row) for row, name in enumerate(self.names)}
+
+    # Serialization
+
+    def _field_json(self, field: str) -> List[str]:
+        """
+        Encode a table field of every column as JSON at once.
+
+        Args:
+            field: Name of a field held in the table
+
+        Returns:
+            List with the JSON text of the value of each column
+        """
+        table = self.table[:len(self.names)]
+        if field == "type":
+            type_names = [json.dumps(name) for name in self.type_names]
+            return [type_names[code] for code in table["type"].tolist()]
+        if field == "percentiles":
+            columns = [_json_items(_float_values(table[column])) for column in PERCENTILE_COLUMNS]
+            template = "{{" + ", ".join(json.dumps(name) + ": {}" for name in PERCENTILE_NAMES) + "}}"
+            return list(map(template.format, *columns))
+        if field in INT_FIELDS:
+            return _json_items(table[field].tolist())
+
+        values = _float_values(table[field])
+        integers = (table["integers"] & FIELD_BITS[field]) != 0
+        if integers.any():
+            # Statistics given as integers are reported as integers
+            for row in np.flatnonzero(integers).tolist():
+                values[row] = int(values[row])
+        return _json_items(values)
+
+    def to_json(self, indent: int = 2, level: int = 0) -> str:
+        """
+        Serialize the store as a JSON object with one line per column.
+
+        Each field is encoded for all columns in one call of the C JSON
+        encoder and examples and value distributions are copied from the text
+        buffer, which is much faster than encoding a dictionary per column.
+
+        Args:
+            indent: Indentation of the column lines
+            level: Nesting level of the object in the enclosing document
+
+        Returns:
+            JSON text of the object mapping column names to column metadata
+        """
+        if not self.names:
+            return "{}"
+        table = self.table[:len(self.names)]
+        present = table["present"]
+        padding = " " * (indent * (level + 1))
+        lines: List[str] = [""] * len(self.names)
+
+        # Encode each field for every column that has it
+        any_present = int(np.bitwise_or.reduce(present))
+        encoded = {}
+        for field in FIELD_ORDER:
+            if not any_present & FIELD_BITS[field]:
+                continue
+            if field in TEXT_FIELDS:
+                text = bytes(self.text)
+                starts = table[f"{field}_start"].tolist()
+                ends = table[f"{field}_end"].tolist()
+                encoded[field] = [text[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+            else:
+                encoded[field] = self._field_json(field)
+        names = [encode_basestring_ascii(name) for name in self.names]
+
+        # Columns with the same fields share one line template
+        for row in self.overflow:
+            lines[row] = f"{padding}{names[row]}: {json.dumps(self.row_fields(row), default=json_default)}"
+        for mask in np.unique(present).tolist():
+            rows = np.flatnonzero(present == mask)
+            rows = [row for row in rows.tolist() if row not in self.overflow]
+            if not rows:
+                continue
+            layout = [field for field in FIELD_ORDER if mask & FIELD_BITS[field]]
+            template = padding + "{}: {{" + ", ".join(json.dumps(field) + ": {}" for field in layout) + "}}"
+            values = [[names[row] for row in rows]] + [[encoded[field][row] for row in rows] for field in layout]
+            for row, line in zip(rows, map(template.format, *values)):
+                lines[row] = line
+        return "{\n" + ",\n".join(lines) + "\n" + " " * (indent * level) + "}"
+
+
+def _float_values(column: np.ndarray) -> List[Any]:
+    """Convert a float column to Python values, with None for NaN."""
+    values = column.tolist()
+    missing = np.isnan(column)
+    if missing.any():
+        for row in np.flatnonzero(missing).tolist():
+            values[row] = None
+    return values
+
+
+def _json_items(values: List[Any]) -> List[str]:
+    """Encode a list of numbers and None values, returning the JSON text of each item."""
+    return json.dumps(values)[1:-1].split(", ")
+
+
+def metadata_to_json(metadata: Dict[str, Any], indent: int = 2) -> str:
+    """
+    Serialize file metadata as JSON, using the fast encoding of a ProfileStore.
+
+    Args:
+        metadata: Metadata dictionary whose columns may be a ProfileStore
+        indent: Indentation of the JSON text
+
+    Returns:
+        A JSON string of the metadata
+    """
+    columns = metadata.get("columns")
+    if not isinstance(columns, ProfileStore):
+        return json.dumps(metadata, indent=indent, default=json_default)
+
+    # Encode everything else normally and splice the columns in
+    placeholder = "\x00columns\x00"
+    text = json.dumps({**metadata, "columns": placeholder}, indent=indent, default=json_default)
+    return text.replace(json.dumps(placeholder), columns.to_json(indent, level=1), 1)
+
+
+def json_default(value: Any) -> Any:
+    """
+    Convert values the JSON encoder does not handle.
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        A plain dictionary for mappings such as ProfileStore views, the Python
+        value of NumPy numbers and booleans, the string form of anything else
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    return str(value)
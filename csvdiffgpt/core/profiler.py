@@ -0,0 +1,366 @@
+"""Streaming column statistics for CSV profiling."""
+import math
+from typing import Dict, Any, Optional, Iterable, Tuple, Set
+
+import numpy as np
+import pandas as pd
+
+from .utils import is_numeric_type
+from .sketches import HyperLogLog, KLLSketch
+from .string_lengths import value_lengths
+
+# Percentiles reported in column metadata besides the median
+PROFILE_PERCENTILES = [5, 25, 75, 95]
+
+
+def percentile_fields(values: Any) -> Dict[str, Optional[float]]:
+    """
+    Format the values of PROFILE_PERCENTILES for column metadata.
+
+    Args:
+        values: Values of the percentiles, in the order of PROFILE_PERCENTILES
+
+    Returns:
+        Dictionary mapping names like 'p25' to rounded values
+    """
+    return {
+        f"p{p}": round(float(value), 2) if value is not None and not pd.isna(value) else None
+        for p, value in zip(PROFILE_PERCENTILES, values)
+    }
+
+
+def combine_moments(
+    n_a: int, mean_a: float, m2_a: float,
+    n_b: int, mean_b: float, m2_b: float
+) -> Tuple[int, float, float]:
+    """
+    Combine two sets of running moments (Chan et al. parallel Welford update).
+
+    Args:
+        n_a: Number of values in the first set
+        mean_a: Mean of the first set
+        m2_a: Sum of squared deviations of the first set
+        n_b: Number of values in the second set
+        mean_b: Mean of the second set
+        m2_b: Sum of squared deviations of the second set
+
+    Returns:
+        Tuple of (count, mean, m2) for the combined set
+    """
+    if n_a == 0:
+        return n_b, mean_b, m2_b
+    if n_b == 0:
+        return n_a, mean_a, m2_a
+
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return n, mean, m2
+
+
+class ColumnAccumulator:
+    """
+    Running statistics for a single column.
+
+    Accumulators are updated one chunk at a time and can be merged with
+    accumulators built over other parts of the same file, so statistics for
+    the entire file can be computed in bounded memory.
+    """
+
+    def __init__(self, name: str, distinct_error: Optional[float] = None):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            name: Name of the column
+            distinct_error: Relative error of the approximate distinct count
+                (distinct values are not counted if None)
+        """
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        # Kinds of non-null chunks seen so far ('numeric', 'string', 'other')
+        self.kinds: Set[str] = set()
+
+        # Numeric moments
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Any = None
+        self.max: Any = None
+        # Sketch of the value distribution for the median and percentiles
+        self.quantiles = KLLSketch()
+
+        # String length moments
+        self.len_n = 0
+        self.len_mean = 0.0
+        self.len_m2 = 0.0
+        self.len_min: Optional[int] = None
+        self.len_max: Optional[int] = None
+
+        # Sketch of the distinct values
+        self.distinct = HyperLogLog(distinct_error) if distinct_error is not None else None
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Update the statistics with a chunk of column values.
+
+        Args:
+            values: Column values from one chunk of the file
+        """
+        null_mask = values.isna()
+        chunk_nulls = int(null_mask.sum())
+        self.count += len(values)
+        self.nulls += chunk_nulls
+
+        if chunk_nulls == len(values):
+            return
+        non_null = values[~null_mask] if chunk_nulls else values
+        if self.distinct is not None:
+            self.distinct.update(non_null)
+
+        if is_numeric_type(values.dtype):
+            self.kinds.add("numeric")
+            arr = non_null.to_numpy(dtype=np.float64)
+            chunk_mean = float(arr.mean())
+            chunk_m2 = float(((arr - chunk_mean) ** 2).sum())
+            self.n, self.mean, self.m2 = combine_moments(
+                self.n, self.mean, self.m2, len(arr), chunk_mean, chunk_m2
+            )
+            self._update_range(non_null.min(), non_null.max())
+            self.quantiles.update(arr)
+        elif values.dtype == 'object' or values.dtype == 'string':
+            self.kinds.add("string")
+            lengths = value_lengths(non_null, as_str=True)
+            chunk_mean = float(lengths.mean())
+            chunk_m2 = float(((lengths - chunk_mean) ** 2).sum())
+            self.len_n, self.len_mean, self.len_m2 = combine_moments(
+                self.len_n, self.len_mean, self.len_m2, len(lengths), chunk_mean, chunk_m2
+            )
+            self._update_length_range(int(lengths.min()), int(lengths.max()))
+        else:
+            self.kinds.add("other")
+
+    def merge(self, other: "ColumnAccumulator") -> "ColumnAccumulator":
+        """
+        Merge another accumulator for the same column into this one.
+
+        Args:
+            other: Accumulator built over a different part of the file
+
+        Returns:
+            This accumulator, updated in place
+        """
+        self.count += other.count
+        self.nulls += other.nulls
+        self.kinds |= other.kinds
+
+        self.n, self.mean, self.m2 = combine_moments(
+            self.n, self.mean, self.m2, other.n, other.mean, other.m2
+        )
+        if other.n:
+            self._update_range(other.min, other.max)
+            self.quantiles.merge(other.quantiles)
+
+        self.len_n, self.len_mean, self.len_m2 = combine_moments(
+            self.len_n, self.len_mean, self.len_m2, other.len_n, other.len_mean, other.len_m2
+        )
+        if other.len_n:
+            self._update_length_range(other.len_min, other.len_max)
+
+        if self.distinct is not None and other.distinct is not None:
+            self.distinct.merge(other.distinct)
+
+        return self
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """
+        Convert the accumulated statistics to column metadata fields.
+
+        Numeric and string-length statistics are only reported when every
+        non-null chunk of the column had the same kind of values.
+
+        Returns:
+            Dictionary of column metadata fields
+        """
+        col_meta: Dict[str, Any] = {
+            "nulls": self.nulls,
+            "null_percentage": round(self.nulls / self.count * 100, 2) if self.count else 0.0
+        }
+        if self.distinct is not None:
+            col_meta["unique_count"] = self.distinct.count()
+
+        if self.kinds == {"numeric"}:
+            std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+            quantiles = self.quantiles.quantiles([0.5] + [p / 100 for p in PROFILE_PERCENTILES])
+            col_meta.update({
+                "min": self.min,
+                "max": self.max,
+                "mean": round(self.mean, 2),
+                "median": round(quantiles[0], 2),
+                "std": round(std, 2) if std is not None else None,
+                "percentiles": percentile_fields(quantiles[1:])
+            })
+        elif self.kinds == {"string"}:
+            col_meta.update({
+                "min_length": self.len_min,
+                "max_length": self.len_max,
+                "avg_length": round(self.len_mean, 2)
+            })
+
+        return col_meta
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Get the accumulated statistics as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary from which from_state rebuilds the accumulator
+        """
+        state = {key: value for key, value in vars(self).items() if key not in ("kinds", "distinct", "quantiles")}
+        state["kinds"] = sorted(self.kinds)
+        state["quantiles"] = self.quantiles.to_state()
+        state["distinct"] = self.distinct.to_state() if self.distinct is not None else None
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ColumnAccumulator":
+        """
+        Rebuild an accumulator from the output of to_state.
+
+        Args:
+            state: Dictionary returned by to_state
+
+        Returns:
+            An accumulator holding the saved statistics
+        """
+        accumulator = cls(state["name"])
+        for key, value in state.items():
+            setattr(accumulator, key, value)
+        accumulator.kinds = set(state["kinds"])
+        accumulator.quantiles = KLLSketch.from_state(state["quantiles"])
+        if state.get("distinct") is not None:
+            accumulator.distinct = HyperLogLog.from_state(state["distinct"])
+        return accumulator
+
+    def _update_range(self, chunk_min: Any, chunk_max: Any) -> None:
+        """Update the running minimum and maximum values."""
+        chunk_min = chunk_min.item() if hasattr(chunk_min, "item") else chunk_min
+        chunk_max = chunk_max.item() if hasattr(chunk_max, "item") else chunk_max
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+
+    def _update_length_range(self, chunk_min: Optional[int], chunk_max: Optional[int]) -> None:
+        """Update the running minimum and maximum string lengths."""
+        if chunk_min is None or chunk_max is None:
+            return
+        self.len_min = chunk_min if self.len_min is None else min(self.len_min, chunk_min)
+        self.len_max = chunk_max if self.len_max is None else max(self.len_max, chunk_max)
+
+
+class StreamingProfiler:
+    """
+    Profiles a file chunk by chunk using one accumulator per column.
+    """
+
+    def __init__(self, distinct_error: Optional[float] = None):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            distinct_error: Relative error of approximate distinct counts
+                (distinct values are not counted if None)
+        """
+        self.row_count = 0
+        self.distinct_error = distinct_error
+        self.accumulators: Dict[str, ColumnAccumulator] = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Update the profile with a chunk of rows.
+
+        Args:
+            chunk: DataFrame holding the next rows of the file
+        """
+        self.row_count += len(chunk)
+        for col in chunk.columns:
+            if col not in self.accumulators:
+                self.accumulators[col] = ColumnAccumulator(col, self.distinct_error)
+            self.accumulators[col].update(chunk[col])
+
+    def merge(self, other: "StreamingProfiler") -> "StreamingProfiler":
+        """
+        Merge a profile built over another part of the file into this one.
+
+        Args:
+            other: Profiler covering different rows of the same file
+
+        Returns:
+            This profiler, updated in place
+        """
+        self.row_count += other.row_count
+        for col, accumulator in other.accumulators.items():
+            if col in self.accumulators:
+                self.accumulators[col].merge(accumulator)
+            else:
+                self.accumulators[col] = accumulator
+        return self
+
+    def column_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the accumulated metadata for every column.
+
+        Returns:
+            Dictionary mapping column names to metadata fields
+        """
+        return {col: acc.to_metadata() for col, acc in self.accumulators.items()}
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Get the profile as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary from which from_state rebuilds the profiler
+        """
+        return {
+            "row_count": self.row_count,
+            "distinct_error": self.distinct_error,
+            "columns": [acc.to_state() for acc in self.accumulators.values()]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingProfiler":
+        """
+        Rebuild a profiler from the output of to_state.
+
+        Args:
+            state: Dictionary returned by to_state
+
+        Returns:
+            A profiler holding the saved statistics
+        """
+        profiler = cls(state.get("distinct_error"))
+        profiler.row_count = state["row_count"]
+        for column_state in state["columns"]:
+            accumulator = ColumnAccumulator.from_state(column_state)
+            profiler.accumulators[accumulator.name] = accumulator
+        return profiler
+
+
+def profile_chunks(chunks: Iterable[pd.DataFrame], distinct_error: Optional[float] = None) -> StreamingProfiler:
+    """
+    Build a streaming profile from an iterable of DataFrame chunks.
+
+    Args:
+        chunks: Iterable of DataFrames (e.g. from pd.read_csv with chunksize)
+        distinct_error: Relative error of approximate distinct counts
+            (distinct values are not counted if None)
+
+    Returns:
+        A profiler holding statistics for all chunks
+    """
+    profiler = StreamingProfiler(distinct_error)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler
@@ -0,0 +1,355 @@
+"""Probabilistic sketches for profiling columns in bounded memory."""
+import math
+import base64
+from typing import Dict, Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Default relative standard error of distinct counts
+DEFAULT_DISTINCT_ERROR = 0.01
+
+# Allowed range of the HyperLogLog precision (number of index bits)
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+# Default size parameter of quantile sketches (about 1% rank error)
+DEFAULT_QUANTILE_K = 200
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Get the number of significant bits of unsigned 64-bit integers.
+
+    Args:
+        values: Array of uint64 values
+
+    Returns:
+        Array of bit lengths (0 for zero values)
+    """
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = values >= np.uint64(1 << shift)
+        values[wide] >>= np.uint64(shift)
+        lengths[wide] += shift
+    return lengths + (values > 0)
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    Hash column values to 64-bit integers.
+
+    Integers are hashed exactly as 64-bit integers, and so are floats with an
+    integer value, so the same number hashes equally in chunks where a column
+    was parsed as integers and chunks where it was parsed as floats.
+
+    Args:
+        values: Column values without nulls
+
+    Returns:
+        Array of uint64 hashes
+    """
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return pd.util.hash_array(values.to_numpy(dtype=np.int64), categorize=False)
+    if pd.api.types.is_float_dtype(values.dtype):
+        array = values.to_numpy(dtype=np.float64)
+        hashes = pd.util.hash_array(array, categorize=False)
+        with np.errstate(invalid="ignore"):
+            integral = (np.floor(array) == array) & (np.abs(array) < 2.0 ** 63)
+        if integral.any():
+            hashes[integral] = pd.util.hash_array(array[integral].astype(np.int64), categorize=False)
+        return hashes
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values.
+
+    Memory is fixed by the error rate (16 KB for the default 1% error)
+    regardless of how many values are added. Sketches built over different
+    chunks of a column can be merged into a sketch of the whole column.
+    """
+
+    def __init__(self, error_rate: float = DEFAULT_DISTINCT_ERROR):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            error_rate: Target relative standard error of the estimate
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Error rate must be between 0 and 1, got {error_rate}.")
+        precision = math.ceil(math.log2((1.04 / error_rate) ** 2))
+        self.precision = min(max(precision, MIN_PRECISION), MAX_PRECISION)
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    @property
+    def error_rate(self) -> float:
+        """Relative standard error of the estimate for this precision."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Add column values to the sketch.
+
+        Args:
+            values: Column values (nulls are ignored)
+        """
+        values = values.dropna()
+        if len(values) == 0:
+            return
+        hashes = hash_values(values)
+
+        # The first bits select a register, the rest give the rank of the first set bit
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+        ranks = (value_bits - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, ranks)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge a sketch of other values into this one.
+
+        Args:
+            other: Sketch with the same precision
+
+        Returns:
+            This sketch, updated in place
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+
+        # Use linear counting while many registers are still empty
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Get the sketch as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary from which from_state rebuilds the sketch
+        """
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        """
+        Rebuild a sketch from the output of to_state.
+
+        Args:
+            state: Dictionary returned by to_state
+
+        Returns:
+            A sketch holding the saved registers
+        """
+        sketch = cls()
+        sketch.precision = state["precision"]
+        sketch.registers = np.frombuffer(base64.b64decode(state["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+def approx_distinct(values: pd.Series, error_rate: float = DEFAULT_DISTINCT_ERROR) -> int:
+    """
+    Estimate the number of distinct non-null values of a column.
+
+    Args:
+        values: Column values
+        error_rate: Target relative standard error of the estimate
+
+    Returns:
+        Estimated distinct count
+    """
+    sketch = HyperLogLog(error_rate)
+    sketch.update(values)
+    return sketch.count()
+
+
+class KLLSketch:
+    """
+    KLL sketch estimating quantiles of numeric values.
+
+    Values are kept in levels of compactors. When a level is full it is
+    sorted and every other value is promoted to the next level, where each
+    value stands for twice as many inputs. Memory grows only with the
+    logarithm of the number of values, and sketches built over different
+    chunks of a column can be merged.
+    """
+
+    def __init__(self, k: int = DEFAULT_QUANTILE_K, seed: int = 0):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k: Capacity of the top level; larger values give smaller rank errors
+            seed: Seed choosing which half of each compacted level is kept
+        """
+        self.k = k
+        self.count = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: Any) -> None:
+        """
+        Add numeric values to the sketch.
+
+        Args:
+            values: Array-like of numbers (NaN values are ignored)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        chunk_min = float(values.min())
+        chunk_max = float(values.max())
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Merge a sketch of other values into this one.
+
+        Args:
+            other: Sketch built over different values
+
+        Returns:
+            This sketch, updated in place
+        """
+        if other.count == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> List[Any]:
+        """
+        Estimate several quantiles.
+
+        Args:
+            qs: Quantiles between 0 and 1
+
+        Returns:
+            Estimated values (None for each quantile if the sketch is empty)
+        """
+        if self.count == 0:
+            return [None] * len(qs)
+
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.compactors)
+        ])
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+            elif q >= 1:
+                results.append(self.max)
+            else:
+                index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+                results.append(float(items[min(index, len(items) - 1)]))
+        return results
+
+    def quantile(self, q: float) -> Any:
+        """
+        Estimate a single quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        return self.quantiles([q])[0]
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Get the sketch as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary from which from_state rebuilds the sketch
+        """
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "compactors": [items.tolist() for items in self.compactors]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "KLLSketch":
+        """
+        Rebuild a sketch from the output of to_state.
+
+        Args:
+            state: Dictionary returned by to_state
+
+        Returns:
+            A sketch holding the saved values
+        """
+        sketch = cls(state["k"])
+        sketch.count = state["count"]
+        sketch.min = state["min"]
+        sketch.max = state["max"]
+        sketch.compactors = [np.asarray(items, dtype=np.float64) for items in state["compactors"]]
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        """Get the number of values a level holds before it is compacted."""
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        """Compact every level holding more values than its capacity."""
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # An odd value out stays on this level
+                keep = items[len(items) - len(items) % 2:]
+                offset = int(self._rng.integers(2))
+                promoted = items[offset:len(items) - len(keep):2]
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
@@ -0,0 +1,80 @@
+"""String length statistics shared by profiling and validation."""
+from typing import Dict, Any
+
+import numpy as np
+import pandas as pd
+
+from .arrow_io import is_arrow_string, arrow_string_lengths
+
+
+def value_lengths(values: pd.Series, as_str: bool = False) -> np.ndarray:
+    """
+    Measure the length in characters of non-null values.
+
+    Arrow-backed strings use the Arrow UTF-8 length kernel, categoricals
+    measure each category once, and plain Python strings are measured
+    without going through the pandas string accessor.
+
+    Args:
+        values: Non-null values to measure
+        as_str: Whether to measure non-string values by their string form;
+            otherwise they have no length (NaN), as with Series.str.len
+
+    Returns:
+        Float array with the length of each value
+    """
+    if len(values) == 0:
+        return np.empty(0)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        category_lengths = values.cat.categories.astype(str).str.len().to_numpy(dtype=np.float64)
+        return category_lengths[values.cat.codes.to_numpy()]
+    if is_arrow_string(values):
+        return arrow_string_lengths(values)
+
+    raw = values.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(raw, skipna=False) == "string":
+        return np.fromiter(map(len, raw), dtype=np.float64, count=len(raw))
+    if as_str:
+        values = values.astype(str)
+    return values.astype(object).str.len().to_numpy(dtype=np.float64)
+
+
+def length_summary(lengths: np.ndarray, nulls: int = 0) -> Dict[str, Any]:
+    """
+    Summarize an array of string lengths.
+
+    Args:
+        lengths: Lengths of the non-null values (NaN for values without a length)
+        nulls: Number of null values of the column
+
+    Returns:
+        Dictionary with nulls, the count of measured values and min_length,
+        max_length, avg_length and std_length (None without measured values)
+    """
+    lengths = lengths[~np.isnan(lengths)]
+    count = len(lengths)
+    return {
+        "nulls": int(nulls),
+        "count": count,
+        "min_length": int(lengths.min()) if count else None,
+        "max_length": int(lengths.max()) if count else None,
+        "avg_length": float(lengths.mean()) if count else None,
+        "std_length": float(lengths.std(ddof=1)) if count > 1 else None
+    }
+
+
+def string_length_summary(values: pd.Series, as_str: bool = False) -> Dict[str, Any]:
+    """
+    Compute the string length statistics of a column in one pass.
+
+    Args:
+        values: Values of the column
+        as_str: Whether to measure non-string values by their string form
+
+    Returns:
+        Dictionary in the format of length_summary
+    """
+    null_mask = values.isna()
+    nulls = int(null_mask.sum())
+    non_null = values[~null_mask] if nulls else values
+    return length_summary(value_lengths(non_null, as_str), nulls)
@@ -1,13 +1,29 @@
 """Utility functions for CSV file handling."""
 import os
-import csv
+import re
+import mmap
+import functools
+import numpy as np
 import pandas as pd
-from typing import Optional, Tuple, List, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List, Dict, Any, Callable, Union
+
+from .compression import get_compression, open_binary
+from .probe import FileProbe
+
+# Files larger than this are counted with several threads by default
+PARALLEL_COUNT_THRESHOLD = 64 * 1024 * 1024
+
+# Number of file versions whose row counts are kept in memory
+ROW_COUNT_CACHE_SIZE = 128
 
 def detect_separator(file_path: str, sample_size: int = 1024) -> str:
     """
     Detect the separator used in a CSV file.
     
+    Compressed files are sniffed on their decompressed contents. Use a
+    FileProbe directly to also get the header and encoding from the same read.
+    
     Args:
         file_path: Path to the CSV file
         sample_size: Number of bytes to sample for detection
@@ -15,65 +31,276 @@ def detect_separator(file_path: str, sample_size: int = 1024) -> str:
     Returns:
         The detected separator (default: ',')
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        sample = f.read(sample_size)
+    probe = FileProbe(file_path, sample_size=sample_size)
+    if not probe.exists:
+        raise FileNotFoundError(probe.error)
+    return probe.sep
+
+def validate_file(file_path: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validate if a file exists and is a valid CSV.
     
-    # Count potential separators
-    separators: Dict[str, int] = {',': 0, ';': 0, '\t': 0, '|': 0}
-    for sep in separators:
-        separators[sep] = sample.count(sep)
+    Args:
+        file_path: Path to the CSV file
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    probe = FileProbe(file_path)
+    return probe.is_valid, probe.error
+
+def get_file_size_mb(file_path: str) -> float:
+    """
+    Get the size of a file in megabytes.
     
-    # Return the most common separator
-    # Fix the type issue with max() by using a lambda
-    max_sep = max(separators, key=lambda k: separators[k])
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        File size in MB
+    """
+    return os.path.getsize(file_path) / (1024 * 1024)
+
+def _count_newlines(buffer: Any, start: int, end: int) -> int:
+    """Count newline bytes in a byte range of a buffer."""
+    block = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+    return int(np.count_nonzero(block == 10))
+
+def _count_unquoted_newlines(buffer: Any, start: int, end: int) -> Tuple[int, int, int]:
+    """
+    Count newlines in a byte range, split by quote parity.
     
-    # If no common separator found, default to comma
-    if separators[max_sep] == 0:
-        return ','
+    Returns:
+        Tuple of (newlines at even quote parity, newlines at odd quote parity,
+        parity of the number of quotes in the range)
+    """
+    block = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+    # A uint8 running sum wraps around but keeps the parity we need
+    parity = np.cumsum(block == 34, dtype=np.uint8) & 1
+    newline_parity = parity[block == 10]
+    odd = int(np.count_nonzero(newline_parity))
+    return len(newline_parity) - odd, odd, int(parity[-1])
+
+def _count_stream_blocks(
+    file_path: str,
+    count_block: Callable[[Any, int, int], Any],
+    block_size: int
+) -> Tuple[List[Any], bool]:
+    """
+    Count newlines block by block in the decompressed stream of a file.
     
-    return max_sep
+    Returns:
+        Tuple of (per-block results of count_block, whether the data ends with a newline)
+    """
+    results = []
+    last_byte = b""
+    with open_binary(file_path) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            results.append(count_block(block, 0, len(block)))
+            last_byte = block[-1:]
+    return results, last_byte == b"\n"
 
-def validate_file(file_path: str) -> Tuple[bool, Optional[str]]:
+def count_rows(
+    file_path: str,
+    quote_aware: bool = False,
+    workers: Optional[int] = None,
+    block_size: int = 16 * 1024 * 1024
+) -> int:
     """
-    Validate if a file exists and is a valid CSV.
+    Count the data rows in a CSV file (excluding the header) without decoding it.
+    
+    The file is memory-mapped and newline bytes are counted block by block,
+    optionally across several threads. Compressed files are counted in a
+    single decompressing pass instead. Results are cached per file version.
     
     Args:
         file_path: Path to the CSV file
+        quote_aware: Whether to ignore newlines inside double-quoted fields
+        workers: Number of threads to count with (chosen from the file size if None)
+        block_size: Number of bytes counted per block
         
     Returns:
-        Tuple of (is_valid, error_message)
+        Number of data rows in the file
+    """
+    stat = os.stat(file_path)
+    return _count_file_rows(
+        os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, quote_aware, workers, block_size
+    )
+
+@functools.lru_cache(maxsize=ROW_COUNT_CACHE_SIZE)
+def _count_file_rows(
+    file_path: str,
+    size: int,
+    mtime_ns: int,
+    quote_aware: bool,
+    workers: Optional[int],
+    block_size: int
+) -> int:
+    """
+    Count the data rows of one version of a file.
+    
+    The size and modification time are part of the cache key, so a changed
+    file is counted again.
+    """
+    if size == 0:
+        return 0
+    
+    count_block = _count_unquoted_newlines if quote_aware else _count_newlines
+    
+    if get_compression(file_path) is not None:
+        # Compressed files cannot be memory-mapped, count while decompressing
+        results, ends_with_newline = _count_stream_blocks(file_path, count_block, block_size)
+    else:
+        if workers is None:
+            workers = min(os.cpu_count() or 1, 8) if size > PARALLEL_COUNT_THRESHOLD else 1
+        
+        ranges = [(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+        
+        with open(file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if workers > 1 and len(ranges) > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(lambda r: count_block(mm, r[0], r[1]), ranges))
+                else:
+                    results = [count_block(mm, start, end) for start, end in ranges]
+                ends_with_newline = mm[size - 1] == 10
+            finally:
+                mm.close()
+    
+    if quote_aware:
+        # Combine the blocks in order, tracking whether we are inside quotes
+        lines = 0
+        in_quotes = 0
+        for even, odd, quote_parity in results:
+            lines += odd if in_quotes else even
+            in_quotes ^= quote_parity
+    else:
+        lines = sum(results)
+    
+    # A final line without a trailing newline still counts
+    if not ends_with_newline:
+        lines += 1
+    
+    return max(lines - 1, 0)  # Subtract header row
+
+def is_numeric_type(dtype: Any) -> bool:
     """
-    # Check if file exists
-    if not os.path.exists(file_path):
-        return False, f"File not found: {file_path}"
+    Check whether a dtype or dtype name is a NumPy numeric type.
+    
+    Works with the type strings stored in column metadata as well as with
+    dtypes that NumPy cannot interpret (e.g. Arrow-backed strings).
     
-    # Check if file is readable
+    Args:
+        dtype: A dtype object or its string name
+        
+    Returns:
+        True if the type is an integer, float or complex NumPy type
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            sample = f.read(1024)
-    except Exception as e:
-        return False, f"Error reading file: {str(e)}"
+        return bool(np.issubdtype(np.dtype(dtype), np.number))
+    except TypeError:
+        return False
+
+def is_string_type(dtype: Any) -> bool:
+    """
+    Check whether a dtype or dtype name holds strings.
     
-    # Try to detect separator and validate CSV structure
+    Both NumPy object columns and pandas string columns (including
+    Arrow-backed strings) are considered string types.
+    
+    Args:
+        dtype: A dtype object or its string name
+        
+    Returns:
+        True if the type holds strings
+    """
+    type_name = str(dtype)
+    return type_name in ("object", "str") or type_name.startswith("string")
+
+def _column_matches(pattern: str, column: str) -> bool:
+    """Check whether a column name equals a pattern or fully matches it as a regular expression."""
+    if pattern == column:
+        return True
     try:
-        sep = detect_separator(file_path)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            csv_reader = csv.reader(f, delimiter=sep)
-            # Read a few rows to check structure
-            for _ in range(5):
-                next(csv_reader, None)
-        return True, None
-    except Exception as e:
-        return False, f"Invalid CSV format: {str(e)}"
+        return re.fullmatch(pattern, column) is not None
+    except re.error:
+        # Not a valid regular expression, only exact names match
+        return False
 
-def get_file_size_mb(file_path: str) -> float:
+def select_columns(
+    all_columns: List[str],
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None
+) -> List[str]:
     """
-    Get the size of a file in megabytes.
+    Select columns by name or regular expression.
+    
+    A pattern selects a column if it equals the column name or fully matches
+    it as a regular expression. Selected columns keep their order in the file.
     
     Args:
-        file_path: Path to the file
+        all_columns: Column names in file order
+        columns: Names or patterns of the columns to keep (all columns if None)
+        exclude_columns: Names or patterns of the columns to leave out
         
     Returns:
-        File size in MB
+        List of selected column names
+    """
+    if isinstance(columns, str):
+        columns = [columns]
+    if isinstance(exclude_columns, str):
+        exclude_columns = [exclude_columns]
+    
+    selected = list(all_columns)
+    if columns is not None:
+        missing = [pattern for pattern in columns
+                   if not any(_column_matches(pattern, str(col)) for col in all_columns)]
+        if missing:
+            raise ValueError(f"Columns not found: {missing}. Available columns: {list(all_columns)}")
+        selected = [col for col in selected if any(_column_matches(pattern, str(col)) for pattern in columns)]
+    if exclude_columns:
+        selected = [col for col in selected
+                    if not any(_column_matches(pattern, str(col)) for pattern in exclude_columns)]
+    
+    if not selected:
+        raise ValueError("No columns left to analyze after applying the column selection.")
+    return selected
+
+def unique_count_rows(metadata: Dict[str, Any], default: int) -> int:
+    """
+    Get the number of rows the unique counts in metadata were computed over.
+    
+    Approximate distinct counts record it in metadata['unique_counts'], as
+    they may cover the whole file instead of the analyzed rows.
+    
+    Args:
+        metadata: Metadata dictionary from CSVPreprocessor
+        default: Row count to use for exact distinct counts
+        
+    Returns:
+        Number of rows
+    """
+    return metadata.get("unique_counts", {}).get("rows", default)
+
+def unique_count_nulls(metadata: Dict[str, Any], col_meta: Dict[str, Any]) -> int:
+    """
+    Get the number of nulls of a column among the rows its unique count covers.
+    
+    Streaming profiles and file footers report nulls over the whole file,
+    while exact unique counts only cover the analyzed rows, whose null count
+    is kept in col_meta['sample_nulls'].
+    
+    Args:
+        metadata: Metadata dictionary from CSVPreprocessor
+        col_meta: Metadata of the column
+        
+    Returns:
+        Number of nulls
     """
-    return os.path.getsize(file_path) / (1024 * 1024)
\ No newline at end of file
+    if unique_count_rows(metadata, metadata["analyzed_rows"]) == metadata["total_rows"]:
+        return col_meta["nulls"]
+    return col_meta.get("sample_nulls", col_meta["nulls"])
@@ -4,6 +4,7 @@ import os
 import re
 
 from .base import BaseDataModelAdapter, register_model_adapter
+from ..readers import pandas_read_code
 
 @register_model_adapter
 class PythonAdapter(BaseDataModelAdapter):
@@ -51,7 +52,7 @@ class PythonAdapter(BaseDataModelAdapter):
             "",
             "def restructure_csv():",
             f"    # Load the original CSV file",
-            f"    df = pd.read_csv('{file_name}', sep='{metadata.get('separator', ',')}')",
+            f"    df = {pandas_read_code(file_name, metadata)}",
             f"    print(f'Loaded {{len(df)}} rows and {{len(df.columns)}} columns from {file_name}')",
             "",
             "    # Create output directory if it doesn't exist",
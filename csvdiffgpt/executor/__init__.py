@@ -0,0 +1,11 @@
+"""Package for running task stages as a dependency graph."""
+
+from .graph import TaskGraph, TaskNode
+from .pipeline import build_analysis_graph, build_compare_graph
+
+__all__ = [
+    "TaskGraph",
+    "TaskNode",
+    "build_analysis_graph",
+    "build_compare_graph"
+]
@@ -0,0 +1,142 @@
+"""Dependency graph of memoized task stages."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, List, Callable, Iterable, Set
+
+
+class TaskNode:
+    """
+    A single stage of a task graph.
+
+    The node's function is called with the results of its dependencies as
+    keyword arguments named after the dependency nodes.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], dependencies: Iterable[str] = ()):
+        """
+        Initialize a node.
+
+        Args:
+            name: Unique name of the node
+            func: Function computing the node's result
+            dependencies: Names of the nodes whose results the function needs
+        """
+        self.name = name
+        self.func = func
+        self.dependencies = list(dependencies)
+
+
+class TaskGraph:
+    """
+    Runs task stages in dependency order, computing each result at most once.
+
+    Results are memoized on the graph, so several stages (or several calls to
+    run) that need the same artifact share a single computation. Nodes whose
+    dependencies are satisfied run concurrently on a thread pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_workers: Maximum number of stages run at the same time
+                (ThreadPoolExecutor default if None)
+        """
+        self.max_workers = max_workers
+        self.nodes: Dict[str, TaskNode] = {}
+        self.results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable[..., Any], dependencies: Iterable[str] = ()) -> None:
+        """
+        Add a node to the graph.
+
+        Args:
+            name: Unique name of the node
+            func: Function computing the node's result
+            dependencies: Names of the nodes whose results the function needs
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' is already defined")
+        self.nodes[name] = TaskNode(name, func, dependencies)
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Compute the target nodes and everything they depend on.
+
+        Args:
+            targets: Names of the nodes to compute (all nodes if None)
+
+        Returns:
+            Dictionary mapping each target name to its result
+        """
+        targets = list(self.nodes) if targets is None else list(targets)
+
+        with self._lock:
+            pending = self._resolve(targets)
+            if pending:
+                self._execute(pending)
+
+        return {name: self.results[name] for name in targets}
+
+    def get(self, name: str) -> Any:
+        """
+        Get the result of a single node, computing it if needed.
+
+        Args:
+            name: Name of the node
+
+        Returns:
+            The node's result
+        """
+        return self.run([name])[name]
+
+    def _resolve(self, targets: List[str]) -> Set[str]:
+        """Find the not yet computed nodes needed for the targets, rejecting cycles."""
+        needed: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name not in self.nodes:
+                raise ValueError(f"Unknown node '{name}'")
+            if name in needed or name in self.results:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at node '{name}'")
+            visiting.add(name)
+            for dependency in self.nodes[name].dependencies:
+                visit(dependency)
+            visiting.discard(name)
+            needed.add(name)
+
+        for target in targets:
+            visit(target)
+        return needed
+
+    def _execute(self, pending: Set[str]) -> None:
+        """Run the pending nodes, submitting each one as soon as its dependencies finish."""
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                ready = [
+                    name for name in pending
+                    if all(dep in self.results for dep in self.nodes[name].dependencies)
+                ]
+                for name in ready:
+                    pending.discard(name)
+                    node = self.nodes[name]
+                    kwargs = {dep: self.results[dep] for dep in node.dependencies}
+                    running[executor.submit(node.func, **kwargs)] = name
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    # Re-raises the stage's exception; queued stages are cancelled
+                    try:
+                        self.results[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
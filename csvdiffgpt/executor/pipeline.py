@@ -0,0 +1,206 @@
+"""Task graph shared by the analysis tasks."""
+from typing import Dict, Any, Optional, List, Callable
+
+import pandas as pd
+
+from .graph import TaskGraph
+from ..core.probe import FileProbe
+from ..core.preprocessor import CSVPreprocessor
+from ..core.column_profile import ColumnProfile
+from ..tasks.validate import run_validation
+from ..cleaners import get_all_cleaners
+from ..test_generators import get_all_generators
+from ..restructure_analyzers import get_all_analyzers
+
+# Nodes every stage depends on
+STAGE_INPUTS = ["data", "metadata", "validation"]
+
+
+def build_analysis_graph(
+    file: str,
+    null_threshold: float = 5.0,
+    cardinality_threshold: float = 95.0,
+    outlier_threshold: float = 3.0,
+    max_workers: Optional[int] = None,
+    **preprocessor_options: Any
+) -> TaskGraph:
+    """
+    Build the graph of analysis stages for a CSV file.
+
+    The graph has the following nodes:
+        preprocessor: The CSVPreprocessor for the file
+        validation: Validation results
+        metadata: Preprocessor metadata
+        data: The analyzed DataFrame
+        cleaning: Recommendations from all registered cleaners
+        tests: Tests from all registered test generators
+        restructure: Recommendations from all registered restructure analyzers
+
+    Each cleaner, generator and analyzer is its own node, so they run
+    concurrently once the shared inputs are available. Only the nodes needed
+    for the requested results are computed.
+
+    The stages share the data, metadata and validation objects without
+    copying them, so a stage must never modify its inputs. Lazily computed
+    column profiles are completed by the metadata node, before any stage
+    reads them.
+
+    Args:
+        file: Path to the CSV file
+        null_threshold: Percentage threshold for flagging columns with missing values
+        cardinality_threshold: Percentage threshold for high cardinality warning
+        outlier_threshold: Z-score threshold for identifying outliers
+        max_workers: Maximum number of stages run at the same time
+        **preprocessor_options: Additional arguments for CSVPreprocessor
+
+    Returns:
+        A TaskGraph for the file
+    """
+    thresholds = {
+        "null_threshold": null_threshold,
+        "cardinality_threshold": cardinality_threshold,
+        "outlier_threshold": outlier_threshold
+    }
+    graph = TaskGraph(max_workers=max_workers)
+
+    graph.add("preprocessor", lambda: CSVPreprocessor(file_path=file, **preprocessor_options))
+    # Validation runs first: a cached result lets it skip loading the data
+    graph.add(
+        "validation",
+        lambda preprocessor: run_validation(preprocessor, **thresholds),
+        ["preprocessor"]
+    )
+    graph.add(
+        "metadata",
+        lambda preprocessor, validation: _shared_metadata(preprocessor),
+        ["preprocessor", "validation"]
+    )
+    graph.add("data", _load_data, ["preprocessor", "metadata"])
+
+    def run_cleaner(cleaner: Any, data: pd.DataFrame, metadata: Dict[str, Any],
+                    validation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        issues = cleaner.detect_issues(data, metadata, validation, **thresholds)
+        if not issues:
+            return []
+        return cleaner.generate_recommendations(data, metadata, issues, **thresholds)
+
+    def run_generator(generator: Any, data: pd.DataFrame, metadata: Dict[str, Any],
+                      validation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return generator.generate_tests(data, metadata, validation, **thresholds)
+
+    def run_analyzer(analyzer: Any, data: pd.DataFrame, metadata: Dict[str, Any],
+                     validation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            return analyzer.analyze(data, metadata, validation, **thresholds)
+        except Exception as e:
+            print(f"Error in {analyzer.get_name()}: {str(e)}")
+            return []
+
+    _add_stage_group(graph, "cleaning", get_all_cleaners(), run_cleaner)
+    _add_stage_group(graph, "tests", get_all_generators(), run_generator)
+    _add_stage_group(graph, "restructure", get_all_analyzers(), run_analyzer)
+
+    return graph
+
+
+def build_compare_graph(
+    file1: str,
+    file2: str,
+    sep1: Optional[str] = None,
+    sep2: Optional[str] = None,
+    **preprocessor_options: Any
+) -> TaskGraph:
+    """
+    Build the graph preprocessing both files of a comparison.
+
+    The graph has the following nodes, for i in 1 and 2:
+        probe<i>: The FileProbe validating file i and detecting its separator
+        preprocessor<i>: The CSVPreprocessor for file i
+        metadata<i>: Preprocessor metadata of file i (loads and analyzes the data)
+        digest<i>: Order-independent digest of the entire file i
+
+    The nodes of the two files do not depend on each other, so both files
+    are probed, parsed and analyzed at the same time.
+
+    Args:
+        file1: Path to the first CSV file
+        file2: Path to the second CSV file
+        sep1: CSV separator for file1 (auto-detected if None)
+        sep2: CSV separator for file2 (auto-detected if None)
+        **preprocessor_options: Additional arguments for both CSVPreprocessors
+
+    Returns:
+        A TaskGraph for the comparison
+    """
+    graph = TaskGraph(max_workers=2)
+
+    graph.add("probe1", lambda: FileProbe(file1))
+    graph.add("probe2", lambda: FileProbe(file2))
+    graph.add(
+        "preprocessor1",
+        lambda probe1: CSVPreprocessor(file_path=file1, sep=sep1, probe=probe1, **preprocessor_options),
+        ["probe1"]
+    )
+    graph.add(
+        "preprocessor2",
+        lambda probe2: CSVPreprocessor(file_path=file2, sep=sep2, probe=probe2, **preprocessor_options),
+        ["probe2"]
+    )
+    graph.add("metadata1", lambda preprocessor1: preprocessor1.analyze(), ["preprocessor1"])
+    graph.add("metadata2", lambda preprocessor2: preprocessor2.analyze(), ["preprocessor2"])
+    graph.add("digest1", lambda preprocessor1: preprocessor1.digest(), ["preprocessor1"])
+    graph.add("digest2", lambda preprocessor2: preprocessor2.digest(), ["preprocessor2"])
+
+    return graph
+
+
+def _shared_metadata(preprocessor: CSVPreprocessor) -> Dict[str, Any]:
+    """Get the metadata with every lazily computed column profile completed."""
+    metadata = preprocessor.to_dict()
+    for col_meta in metadata.get("columns", {}).values():
+        if isinstance(col_meta, ColumnProfile):
+            col_meta.compute_all()
+    return metadata
+
+
+def _load_data(preprocessor: CSVPreprocessor, metadata: Dict[str, Any]) -> pd.DataFrame:
+    """Get the analyzed DataFrame, loading it if the metadata came from the cache."""
+    if preprocessor.df is None:
+        preprocessor.load_data()
+    if preprocessor.df is None:
+        raise ValueError("Failed to load DataFrame")
+    return preprocessor.df
+
+
+def _add_stage_group(
+    graph: TaskGraph,
+    group: str,
+    stages: List[Any],
+    run_stage: Callable[..., List[Dict[str, Any]]]
+) -> None:
+    """
+    Add one node per stage plus a node combining their results in registry order.
+
+    Args:
+        graph: Graph to add the nodes to
+        group: Name of the combining node
+        stages: Registered cleaners, generators or analyzers
+        run_stage: Function running a single stage on the shared inputs
+    """
+    stage_names = []
+    for stage in stages:
+        stage_name = f"{group}:{stage.get_name()}"
+        graph.add(
+            stage_name,
+            lambda data, metadata, validation, stage=stage: run_stage(stage, data, metadata, validation),
+            STAGE_INPUTS
+        )
+        stage_names.append(stage_name)
+
+    def combine(**results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        combined = []
+        for stage_name in stage_names:
+            combined.extend(results[stage_name])
+        return combined
+
+    graph.add(group, combine, stage_names)
@@ -4,6 +4,8 @@ from typing import Dict, Any, Optional, List, Union
 import os
 import json
 
+from ..core.profile_store import metadata_to_json
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -82,7 +84,7 @@ class LLMProvider(ABC):
         # For CSV metadata, ensure it's properly formatted as a string
         if 'metadata' in data and not isinstance(data['metadata'], str):
             if isinstance(data['metadata'], dict):
-                data['metadata'] = json.dumps(data['metadata'], indent=2, default=str)
+                data['metadata'] = metadata_to_json(data['metadata'])
         
         # Replace placeholders in the template
         for key, value in data.items():
@@ -0,0 +1,25 @@
+"""Package for readers of non-CSV input formats."""
+
+from .base import (
+    BaseReader,
+    register_reader,
+    get_reader,
+    get_available_formats,
+    pandas_read_code,
+    sample_chunks
+)
+from .parquet_reader import ParquetReader
+from .feather_reader import FeatherReader
+from .ndjson_reader import NdjsonReader
+
+__all__ = [
+    "BaseReader",
+    "register_reader",
+    "get_reader",
+    "get_available_formats",
+    "pandas_read_code",
+    "sample_chunks",
+    "ParquetReader",
+    "FeatherReader",
+    "NdjsonReader"
+]
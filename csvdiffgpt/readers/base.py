@@ -0,0 +1,213 @@
+"""Base class for readers of non-CSV input formats."""
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.compression import COMPRESSION_EXTENSIONS
+
+class BaseReader(ABC):
+    """
+    Base class for all input readers.
+
+    CSV files are read by CSVPreprocessor itself. Readers let the preprocessor
+    load other formats with the same sampling, streaming and column selection.
+    """
+
+    # Name of the format reported in metadata
+    format_name = ""
+
+    # File extensions handled by the reader
+    extensions: List[str] = []
+
+    # Whether the format can also be read from .gz/.bz2/.xz/.zst files
+    supports_compression = False
+
+    # pandas function (and keyword arguments) that reads the format, for generated code
+    pandas_function = ""
+    pandas_kwargs = ""
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the reader.
+
+        Args:
+            file_path: Path to the input file
+        """
+        self.file_path = file_path
+
+    @abstractmethod
+    def read_columns(self) -> List[str]:
+        """
+        Get the column names of the file.
+
+        Returns:
+            List of column names
+        """
+        pass
+
+    @abstractmethod
+    def count_rows(self) -> int:
+        """
+        Count the rows of the file.
+
+        Returns:
+            Number of rows
+        """
+        pass
+
+    @abstractmethod
+    def read(self, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the first rows of the file.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            nrows: Maximum number of rows to read (all rows if None)
+
+        Returns:
+            A DataFrame with the first rows
+        """
+        pass
+
+    @abstractmethod
+    def iter_chunks(self, columns: Optional[List[str]] = None, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Read the whole file in chunks of rows.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            chunk_size: Number of rows per chunk
+
+        Returns:
+            An iterator of DataFrames
+        """
+        pass
+
+    def sample(
+        self,
+        max_rows: int,
+        columns: Optional[List[str]] = None,
+        random_state: Optional[int] = None,
+        chunk_size: int = 100000
+    ) -> pd.DataFrame:
+        """
+        Read a uniform random sample of rows.
+
+        Args:
+            max_rows: Maximum number of rows in the sample
+            columns: Columns to read (all columns if None)
+            random_state: Seed for the sample
+            chunk_size: Number of rows read at a time
+
+        Returns:
+            A DataFrame with at most max_rows rows in file order
+        """
+        sample, _ = sample_chunks(self.iter_chunks(columns, chunk_size), max_rows, random_state)
+        return sample if sample is not None else self.read(columns, nrows=0)
+
+    def column_statistics(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics stored in the file for the whole file, without scanning it.
+
+        Args:
+            columns: Columns to get statistics for (all columns if None)
+
+        Returns:
+            Dictionary mapping column names to 'nulls' and, for numeric columns,
+            'min' and 'max' (empty if the format stores no statistics)
+        """
+        return {}
+
+    def get_name(self) -> str:
+        """Get the name of this reader."""
+        return self.__class__.__name__
+
+# Registry of all readers
+READER_REGISTRY = {}
+
+def register_reader(reader_class):
+    """Register a reader class."""
+    READER_REGISTRY[reader_class.__name__] = reader_class
+    return reader_class
+
+def get_reader(file_path: str) -> Optional[BaseReader]:
+    """
+    Get a reader for a file based on its extension.
+
+    Args:
+        file_path: Path to the input file
+
+    Returns:
+        Reader instance, or None if the file should be read as CSV
+    """
+    base, extension = os.path.splitext(file_path.lower())
+    compressed = extension in COMPRESSION_EXTENSIONS
+    if compressed:
+        extension = os.path.splitext(base)[1]
+
+    for reader_class in READER_REGISTRY.values():
+        if extension in reader_class.extensions and (reader_class.supports_compression or not compressed):
+            return reader_class(file_path)
+    return None
+
+def get_available_formats() -> List[str]:
+    """Get names of all formats readable besides CSV."""
+    return [reader_class.format_name for reader_class in READER_REGISTRY.values()]
+
+def pandas_read_code(file_name: str, metadata: Dict[str, Any]) -> str:
+    """
+    Get the pandas call that loads a file, for generated code.
+
+    Args:
+        file_name: Name of the file in the generated code
+        metadata: Metadata dictionary of the file
+
+    Returns:
+        Python expression reading the file into a DataFrame
+    """
+    for reader_class in READER_REGISTRY.values():
+        if reader_class.format_name == metadata.get("format"):
+            return f"pd.{reader_class.pandas_function}('{file_name}'{reader_class.pandas_kwargs})"
+    return f"pd.read_csv('{file_name}', sep='{metadata.get('separator', ',')}')"
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    max_rows: int,
+    random_state: Optional[int] = None
+) -> Tuple[Optional[pd.DataFrame], int]:
+    """
+    Draw a uniform random sample of rows from chunks in a single pass.
+
+    Every row gets a random key and the rows with the smallest keys seen so
+    far are kept, so only one chunk plus the sample is held in memory.
+
+    Args:
+        chunks: Iterable of DataFrames with consecutive rows
+        max_rows: Maximum number of rows in the sample
+        random_state: Seed for the sample
+
+    Returns:
+        Tuple of (sample in file order or None if there were no chunks, total row count)
+    """
+    rng = np.random.default_rng(random_state)
+    sample: Optional[pd.DataFrame] = None
+    sample_keys = np.empty(0)
+    row_total = 0
+
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(row_total, row_total + len(chunk))
+        row_total += len(chunk)
+
+        sample = chunk if sample is None else pd.concat([sample, chunk])
+        sample_keys = np.concatenate([sample_keys, rng.random(len(chunk))])
+        if len(sample) > max_rows:
+            keep = np.argpartition(sample_keys, max_rows)[:max_rows]
+            sample = sample.iloc[keep]
+            sample_keys = sample_keys[keep]
+
+    if sample is None:
+        return None, row_total
+    return sample.sort_index().reset_index(drop=True), row_total
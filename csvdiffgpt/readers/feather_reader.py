@@ -0,0 +1,148 @@
+"""Reader for Feather (Arrow IPC) files."""
+from contextlib import contextmanager
+from typing import List, Optional, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .base import BaseReader, register_reader
+from ..core.arrow_io import PYARROW_AVAILABLE, require_pyarrow
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+
+@register_reader
+class FeatherReader(BaseReader):
+    """
+    Reader for Feather version 2 / Arrow IPC files.
+
+    The file is memory-mapped for each read and closed afterwards, so record
+    batches are only loaded from disk when their rows are used and no file
+    handle is held between reads.
+    """
+
+    format_name = "feather"
+    extensions = [".feather", ".arrow", ".ipc"]
+    pandas_function = "read_feather"
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the reader.
+
+        Args:
+            file_path: Path to the Feather file
+        """
+        super().__init__(file_path)
+        require_pyarrow("read Feather files")
+
+    @contextmanager
+    def _open(self) -> Iterator["pa.ipc.RecordBatchFileReader"]:
+        """Memory-map the file and open it as an IPC file, closing the map afterwards."""
+        with pa.memory_map(self.file_path, 'r') as source:
+            yield pa.ipc.open_file(source)
+
+    def read_columns(self) -> List[str]:
+        """
+        Get the column names from the file schema.
+
+        Returns:
+            List of column names
+        """
+        with self._open() as ipc_reader:
+            return list(ipc_reader.schema.names)
+
+    def count_rows(self) -> int:
+        """
+        Count the rows of all record batches.
+
+        Returns:
+            Number of rows
+        """
+        with self._open() as ipc_reader:
+            return sum(ipc_reader.get_batch(i).num_rows for i in range(ipc_reader.num_record_batches))
+
+    def read(self, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the first rows of the file, loading only the record batches needed.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            nrows: Maximum number of rows to read (all rows if None)
+
+        Returns:
+            A DataFrame with the first rows
+        """
+        with self._open() as ipc_reader:
+            batches = []
+            row_total = 0
+            for i in range(ipc_reader.num_record_batches):
+                if nrows is not None and row_total >= nrows:
+                    break
+                batch = ipc_reader.get_batch(i)
+                batches.append(batch)
+                row_total += batch.num_rows
+
+            table = self._select(pa.Table.from_batches(batches, schema=ipc_reader.schema), columns)
+            if nrows is not None:
+                table = table.slice(0, nrows)
+            return table.to_pandas()
+
+    def iter_chunks(self, columns: Optional[List[str]] = None, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Read the whole file in chunks of rows.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            chunk_size: Number of rows per chunk
+
+        Returns:
+            An iterator of DataFrames
+        """
+        with self._open() as ipc_reader:
+            for i in range(ipc_reader.num_record_batches):
+                table = self._select(pa.Table.from_batches([ipc_reader.get_batch(i)]), columns)
+                for start in range(0, table.num_rows, chunk_size):
+                    yield table.slice(start, chunk_size).to_pandas()
+
+    def sample(
+        self,
+        max_rows: int,
+        columns: Optional[List[str]] = None,
+        random_state: Optional[int] = None,
+        chunk_size: int = 100000
+    ) -> pd.DataFrame:
+        """
+        Read a random sample of rows from randomly chosen record batches.
+
+        Record batches are picked in random order until they hold enough rows,
+        and only those batches are loaded (and decompressed).
+
+        Args:
+            max_rows: Maximum number of rows in the sample
+            columns: Columns to read (all columns if None)
+            random_state: Seed for the sample
+            chunk_size: Unused, record batches are the unit of reading
+
+        Returns:
+            A DataFrame with at most max_rows rows in file order
+        """
+        rng = np.random.default_rng(random_state)
+        with self._open() as ipc_reader:
+            batches = {}
+            row_total = 0
+            for i in rng.permutation(ipc_reader.num_record_batches):
+                if row_total >= max_rows:
+                    break
+                batches[int(i)] = ipc_reader.get_batch(int(i))
+                row_total += batches[int(i)].num_rows
+
+            table = pa.Table.from_batches([batches[i] for i in sorted(batches)], schema=ipc_reader.schema)
+            table = self._select(table, columns)
+            if table.num_rows > max_rows:
+                table = table.take(np.sort(rng.choice(table.num_rows, size=max_rows, replace=False)))
+            return table.to_pandas()
+
+    @staticmethod
+    def _select(table: "pa.Table", columns: Optional[List[str]]) -> "pa.Table":
+        """Keep only the given columns of a table."""
+        return table if columns is None else table.select(columns)
@@ -0,0 +1,89 @@
+"""Reader for newline-delimited JSON files."""
+from typing import List, Optional, Iterator
+
+import pandas as pd
+
+from .base import BaseReader, register_reader
+from ..core.compression import open_binary
+
+# Number of bytes read at a time when counting rows
+COUNT_BLOCK_SIZE = 16 * 1024 * 1024
+
+@register_reader
+class NdjsonReader(BaseReader):
+    """
+    Reader for newline-delimited JSON (one object per line).
+
+    JSON has to be parsed completely, so unused columns are dropped after
+    parsing each chunk rather than skipped by the parser.
+    """
+
+    format_name = "ndjson"
+    extensions = [".ndjson", ".jsonl"]
+    supports_compression = True
+    pandas_function = "read_json"
+    pandas_kwargs = ", lines=True"
+
+    def read_columns(self) -> List[str]:
+        """
+        Get the column names from the first record.
+
+        Returns:
+            List of column names
+        """
+        return list(self.read(nrows=1).columns)
+
+    def count_rows(self) -> int:
+        """
+        Count the lines of the file without parsing them.
+
+        Returns:
+            Number of rows
+        """
+        lines = 0
+        last_byte = b"\n"
+        with open_binary(self.file_path) as f:
+            while True:
+                block = f.read(COUNT_BLOCK_SIZE)
+                if not block:
+                    break
+                lines += block.count(b"\n")
+                last_byte = block[-1:]
+        # A final record without a trailing newline still counts
+        return lines if last_byte == b"\n" else lines + 1
+
+    def read(self, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the first rows of the file.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            nrows: Maximum number of rows to read (all rows if None)
+
+        Returns:
+            A DataFrame with the first rows
+        """
+        if nrows == 0:
+            return pd.DataFrame(columns=columns if columns is not None else self.read_columns())
+        df = pd.read_json(self.file_path, lines=True, nrows=nrows, convert_dates=False)
+        return self._select(df, columns)
+
+    def iter_chunks(self, columns: Optional[List[str]] = None, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Read the whole file in chunks of rows.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            chunk_size: Number of rows per chunk
+
+        Returns:
+            An iterator of DataFrames
+        """
+        with pd.read_json(self.file_path, lines=True, chunksize=chunk_size, convert_dates=False) as reader:
+            for chunk in reader:
+                yield self._select(chunk, columns)
+
+    @staticmethod
+    def _select(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        """Keep only the given columns of a DataFrame."""
+        return df if columns is None else df[[col for col in columns if col in df.columns]]
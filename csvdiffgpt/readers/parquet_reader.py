@@ -0,0 +1,184 @@
+"""Reader for Parquet files."""
+from typing import Dict, Any, List, Optional, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .base import BaseReader, register_reader
+from ..core.arrow_io import PYARROW_AVAILABLE, require_pyarrow
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+@register_reader
+class ParquetReader(BaseReader):
+    """
+    Reader for Parquet files.
+
+    Only the requested columns are decoded, samples are drawn from whole row
+    groups, and null counts and numeric ranges come from the file footer.
+    """
+
+    format_name = "parquet"
+    extensions = [".parquet", ".pq"]
+    pandas_function = "read_parquet"
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the reader.
+
+        Args:
+            file_path: Path to the Parquet file
+        """
+        super().__init__(file_path)
+        require_pyarrow("read Parquet files")
+        self.parquet_file = pq.ParquetFile(file_path)
+
+    def read_columns(self) -> List[str]:
+        """
+        Get the column names from the file schema.
+
+        Returns:
+            List of column names
+        """
+        return list(self.parquet_file.schema_arrow.names)
+
+    def count_rows(self) -> int:
+        """
+        Get the row count stored in the file footer.
+
+        Returns:
+            Number of rows
+        """
+        return self.parquet_file.metadata.num_rows
+
+    def read(self, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the first rows of the file, decoding only the row groups needed.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            nrows: Maximum number of rows to read (all rows if None)
+
+        Returns:
+            A DataFrame with the first rows
+        """
+        metadata = self.parquet_file.metadata
+        row_groups = []
+        row_total = 0
+        for i in range(metadata.num_row_groups):
+            if nrows is not None and row_total >= nrows:
+                break
+            row_groups.append(i)
+            row_total += metadata.row_group(i).num_rows
+
+        table = self._read_row_groups(row_groups, columns)
+        if nrows is not None:
+            table = table.slice(0, nrows)
+        return table.to_pandas()
+
+    def iter_chunks(self, columns: Optional[List[str]] = None, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Read the whole file in batches of rows.
+
+        Args:
+            columns: Columns to read (all columns if None)
+            chunk_size: Number of rows per chunk
+
+        Returns:
+            An iterator of DataFrames
+        """
+        for batch in self.parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+    def sample(
+        self,
+        max_rows: int,
+        columns: Optional[List[str]] = None,
+        random_state: Optional[int] = None,
+        chunk_size: int = 100000
+    ) -> pd.DataFrame:
+        """
+        Read a random sample of rows from randomly chosen row groups.
+
+        Row groups are picked in random order until they hold enough rows, and
+        only those row groups are decoded.
+
+        Args:
+            max_rows: Maximum number of rows in the sample
+            columns: Columns to read (all columns if None)
+            random_state: Seed for the sample
+            chunk_size: Unused, row groups are the unit of reading
+
+        Returns:
+            A DataFrame with at most max_rows rows in file order
+        """
+        metadata = self.parquet_file.metadata
+        rng = np.random.default_rng(random_state)
+        row_groups = []
+        row_total = 0
+        for i in rng.permutation(metadata.num_row_groups):
+            if row_total >= max_rows:
+                break
+            row_groups.append(int(i))
+            row_total += metadata.row_group(int(i)).num_rows
+
+        table = self._read_row_groups(sorted(row_groups), columns)
+        if table.num_rows > max_rows:
+            table = table.take(np.sort(rng.choice(table.num_rows, size=max_rows, replace=False)))
+        return table.to_pandas()
+
+    def column_statistics(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Combine the row group statistics in the file footer.
+
+        Columns are skipped if a row group has no null count. Minimum and maximum
+        are only reported for numeric columns with ranges in every row group.
+
+        Args:
+            columns: Columns to get statistics for (all columns if None)
+
+        Returns:
+            Dictionary mapping column names to 'nulls' and optionally 'min' and 'max'
+        """
+        metadata = self.parquet_file.metadata
+        arrow_schema = self.parquet_file.schema_arrow
+        # Leaf column positions of top-level columns
+        column_index = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+
+        statistics: Dict[str, Dict[str, Any]] = {}
+        for name in columns if columns is not None else arrow_schema.names:
+            if name not in column_index:
+                continue
+            field_type = arrow_schema.field(name).type
+            numeric = pa.types.is_integer(field_type) or pa.types.is_floating(field_type)
+
+            nulls = 0
+            mins = []
+            maxs = []
+            for rg in range(metadata.num_row_groups):
+                column_stats = metadata.row_group(rg).column(column_index[name]).statistics
+                if column_stats is None or not column_stats.has_null_count:
+                    nulls = None
+                    break
+                nulls += column_stats.null_count
+                if column_stats.has_min_max:
+                    mins.append(column_stats.min)
+                    maxs.append(column_stats.max)
+            if nulls is None:
+                continue
+
+            statistics[name] = {"nulls": nulls}
+            if numeric and mins and len(mins) == metadata.num_row_groups:
+                statistics[name].update({"min": min(mins), "max": max(maxs)})
+        return statistics
+
+    def _read_row_groups(self, row_groups: List[int], columns: Optional[List[str]]) -> "pa.Table":
+        """Read the given row groups, keeping an empty table with the schema if there are none."""
+        if not row_groups:
+            schema = self.parquet_file.schema_arrow
+            if columns is not None:
+                schema = pa.schema([schema.field(name) for name in columns])
+            return schema.empty_table()
+        return self.parquet_file.read_row_groups(row_groups, columns=columns)
@@ -5,6 +5,7 @@ import numpy as np
 import re
 
 from .base import BaseRestructureAnalyzer, register_analyzer
+from ..core.utils import is_string_type, unique_count_rows
 
 @register_analyzer
 class NormalizationAnalyzer(BaseRestructureAnalyzer):
@@ -271,7 +272,7 @@ class NormalizationAnalyzer(BaseRestructureAnalyzer):
             List of dictionaries with information about dimension candidates
         """
         candidates: List[Dict[str, Any]] = []
-        total_rows = len(df)
+        total_rows = unique_count_rows(metadata, len(df))
         
         # Skip if too small
         if total_rows < 10:
@@ -284,7 +285,7 @@ class NormalizationAnalyzer(BaseRestructureAnalyzer):
                 continue
                 
             # Only consider object/string columns with reasonable cardinality
-            if "object" in details.get("type", "") and "unique_count" in details:
+            if is_string_type(details.get("type", "")) and "unique_count" in details:
                 unique_count = details["unique_count"]
                 
                 # Skip columns that are almost all unique (like IDs) or have too few values
@@ -336,7 +337,7 @@ class NormalizationAnalyzer(BaseRestructureAnalyzer):
                             col_meta = metadata["columns"][col]
                             unique_count = col_meta.get("unique_count", 0)
                             null_count = col_meta.get("nulls", 0)
-                            total_rows = metadata.get("total_rows", len(df))
+                            total_rows = unique_count_rows(metadata, metadata.get("total_rows", len(df)))
                             
                             # If it's highly unique and not null, it's likely a primary key
                             if unique_count > 0 and null_count == 0 and unique_count / total_rows > 0.9:
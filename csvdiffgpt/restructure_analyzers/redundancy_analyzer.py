@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 
 from .base import BaseRestructureAnalyzer, register_analyzer
+from ..core.utils import unique_count_rows
+from ..core.column_batches import column_fingerprints
 
 @register_analyzer
 class RedundancyAnalyzer(BaseRestructureAnalyzer):
@@ -120,14 +122,11 @@ class RedundancyAnalyzer(BaseRestructureAnalyzer):
         Returns:
             List of column groups where columns within each group are duplicates
         """
-        # Hash each column to find duplicates efficiently
-        duplicates: Dict[int, List[str]] = {}
+        # Hash all columns in batches to find duplicates efficiently
+        duplicates: Dict[str, List[str]] = {}
         
-        # Process each column
-        for col in df.columns:
-            # Convert to string hash to handle different types
-            col_hash = hash(tuple(df[col].astype(str).fillna('NA').values))
-            
+        # Columns are compared by their string form to handle different types
+        for col, col_hash in column_fingerprints(df).items():
             if col_hash in duplicates:
                 duplicates[col_hash].append(col)
             else:
@@ -191,7 +190,7 @@ class RedundancyAnalyzer(BaseRestructureAnalyzer):
                 continue
                 
             unique_count = details.get("unique_count", 0)
-            total_rows = metadata.get("total_rows", len(df))
+            total_rows = unique_count_rows(metadata, metadata.get("total_rows", len(df)))
             
             if total_rows > 0 and unique_count > 0:
                 unique_pct = (unique_count / total_rows) * 100
@@ -5,6 +5,7 @@ import numpy as np
 import re
 
 from .base import BaseRestructureAnalyzer, register_analyzer
+from ..core.utils import unique_count_rows
 
 @register_analyzer
 class RelationshipAnalyzer(BaseRestructureAnalyzer):
@@ -125,7 +126,7 @@ class RelationshipAnalyzer(BaseRestructureAnalyzer):
             List of tuples (column_name, uniqueness_percentage)
         """
         candidates: List[Tuple[str, float]] = []
-        total_rows = metadata.get("total_rows", len(df))
+        total_rows = unique_count_rows(metadata, metadata.get("total_rows", len(df)))
         
         # Skip if dataframe is empty
         if total_rows == 0:
@@ -180,7 +181,7 @@ class RelationshipAnalyzer(BaseRestructureAnalyzer):
             if column.lower().endswith('_id') and column.lower() != 'id':
                 null_percentage = details.get("null_percentage", 0)
                 unique_count = details.get("unique_count", 0)
-                total_rows = metadata.get("total_rows", len(df))
+                total_rows = unique_count_rows(metadata, metadata.get("total_rows", len(df)))
                 
                 # Only if there aren't too many nulls
                 if null_percentage <= 10:
@@ -271,7 +272,7 @@ class RelationshipAnalyzer(BaseRestructureAnalyzer):
                 continue
                 
             unique_count = details.get("unique_count", 0)
-            total_rows = metadata.get("total_rows", len(df))
+            total_rows = unique_count_rows(metadata, metadata.get("total_rows", len(df)))
             
             if total_rows > 0:
                 uniqueness = (unique_count / total_rows) * 100
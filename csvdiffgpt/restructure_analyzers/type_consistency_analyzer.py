@@ -5,6 +5,7 @@ import numpy as np
 import re
 
 from .base import BaseRestructureAnalyzer, register_analyzer
+from ..core.utils import is_string_type
 
 @register_analyzer
 class TypeConsistencyAnalyzer(BaseRestructureAnalyzer):
@@ -245,7 +246,7 @@ class TypeConsistencyAnalyzer(BaseRestructureAnalyzer):
         
         for col, details in metadata.get("columns", {}).items():
             # Look for columns that might be IDs (name contains 'id')
-            if "id" in col.lower() and details.get("type", "") == "object":
+            if "id" in col.lower() and is_string_type(details.get("type", "")):
                 # Check if column contains only numeric strings
                 if col in df.columns:
                     sample = df[col].dropna().astype(str).head(100)
@@ -281,7 +282,7 @@ class TypeConsistencyAnalyzer(BaseRestructureAnalyzer):
         
         for col, details in metadata.get("columns", {}).items():
             # Only check string columns with low cardinality
-            if details.get("type", "") == "object" and details.get("unique_count", 100) <= 5:
+            if is_string_type(details.get("type", "")) and details.get("unique_count", 100) <= 5:
                 # Get unique values
                 if col in df.columns:
                     unique_values = df[col].dropna().unique()
@@ -4,13 +4,13 @@ import os
 import pandas as pd
 import numpy as np
 
-from ..core.utils import validate_file
-from ..core.preprocessor import CSVPreprocessor
-from ..tasks.validate import validate_raw
+from ..core.probe import FileProbe
+from ..core.cache import AnalysisCache
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
+from ..executor.pipeline import build_analysis_graph
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
-from ..cleaners import get_all_cleaners
 from ..cleaners.helpers import generate_sample_code, calculate_potential_impact
 
 # Dictionary of available LLM providers
@@ -46,7 +46,19 @@ def clean_raw(
     null_threshold: float = 5.0,
     cardinality_threshold: float = 95.0,
     outlier_threshold: float = 3.0,
-    generate_code: bool = True
+    generate_code: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False
 ) -> Dict[str, Any]:
     """
     Analyze a CSV file and recommend cleaning steps without using LLM.
@@ -60,38 +72,54 @@ def clean_raw(
         cardinality_threshold: Percentage threshold for high cardinality warning
         outlier_threshold: Z-score threshold for identifying outliers
         generate_code: Whether to generate example code for cleaning steps
+        use_cache: Whether to reuse metadata and validation results cached on disk
+            for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         
     Returns:
         A dictionary containing cleaning recommendations and sample code
     """
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        raise ValueError(f"Error: {error}")
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        raise ValueError(f"Error: {probe.error}")
     
-    # Get validation results to identify issues
-    validation_results = validate_raw(
-        file=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Validation, metadata and every cleaner share a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
+        outlier_threshold=outlier_threshold,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
-    df = preprocessor.df
-    
-    if df is None:
-        raise ValueError("Failed to load DataFrame")
+    results = graph.run(["validation", "metadata", "cleaning"])
+    validation_results = results["validation"]
+    metadata = results["metadata"]
     
     # Initialize cleaning recommendations
     cleaning_results = {
@@ -105,37 +133,8 @@ def clean_raw(
         }
     }
     
-    # Get all registered cleaners and apply them
-    cleaners = get_all_cleaners()
-    all_recommendations = []
-    
-    # Process each cleaner
-    for cleaner in cleaners:
-        # Detect issues specific to this cleaner
-        issues = cleaner.detect_issues(
-            df, 
-            metadata, 
-            validation_results,
-            null_threshold=null_threshold,
-            cardinality_threshold=cardinality_threshold,
-            outlier_threshold=outlier_threshold
-        )
-        
-        # Skip if no issues found
-        if not issues:
-            continue
-            
-        # Generate recommendations for these issues
-        recommendations = cleaner.generate_recommendations(
-            df, 
-            metadata, 
-            issues,
-            null_threshold=null_threshold,
-            cardinality_threshold=cardinality_threshold,
-            outlier_threshold=outlier_threshold
-        )
-        
-        all_recommendations.extend(recommendations)
+    # Recommendations from all registered cleaners
+    all_recommendations = list(results["cleaning"])
     
     # Sort recommendations by severity
     severity_order = {"high": 0, "medium": 1, "low": 2}
@@ -170,6 +169,18 @@ def clean(
     outlier_threshold: float = 3.0,
     model: Optional[str] = None,
     use_llm: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
     **kwargs: Any
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -188,6 +199,19 @@ def clean(
         outlier_threshold: Z-score threshold for identifying outliers
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        use_cache: Whether to reuse results cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -203,44 +227,51 @@ def clean(
             max_cols_analyzed=max_cols_analyzed,
             null_threshold=null_threshold,
             cardinality_threshold=cardinality_threshold,
-            outlier_threshold=outlier_threshold
+            outlier_threshold=outlier_threshold,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode
         )
     
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        return f"Error: {error}"
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        return f"Error: {probe.error}"
     
-    # Get the structured cleaning recommendations
-    cleaning_results = clean_raw(
-        file=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Get validation results and metadata from a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Get validation results
-    validation_results = validate_raw(
-        file=file,
+        outlier_threshold=outlier_threshold,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
         max_cols_analyzed=max_cols_analyzed,
-        null_threshold=null_threshold,
-        cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
+    results = graph.run(["validation", "metadata"])
+    validation_results = results["validation"]
+    metadata = results["metadata"]
     
     # Get the LLM provider
     llm = get_provider(provider, api_key)
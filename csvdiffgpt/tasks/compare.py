@@ -5,8 +5,16 @@ import pandas as pd
 import json
 import numpy as np
 
-from ..core.utils import validate_file
+from ..core.utils import is_numeric_type
+from ..core.probe import FileProbe
 from ..core.preprocessor import CSVPreprocessor
+from ..executor.pipeline import build_compare_graph
+from ..core.digest import compare_digests
+from ..core.diff import (
+    resolve_key_columns, align_rows, keyed_diff, external_keyed_diff, fingerprint_diff,
+    external_fingerprint_diff, partition_count
+)
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
@@ -35,17 +43,64 @@ def get_provider(provider_name: str, api_key: Optional[str] = None) -> LLMProvid
     # Initialize the provider
     return LLM_PROVIDERS[provider_name](api_key=api_key)
 
-def find_diff_stats(df1: pd.DataFrame, df2: pd.DataFrame) -> Dict[str, Any]:
+def _widen(values: pd.Series) -> pd.Series:
+    """Convert compact numeric dtypes to 64-bit before arithmetic."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.itemsize < 8:
+        if dtype.kind in "iu":
+            return values.astype(np.int64)
+        if dtype.kind == "f":
+            return values.astype(np.float64)
+    return values
+
+def _with_key_columns(
+    columns: Optional[Union[List[str], str]],
+    key_columns: Optional[Union[List[str], str]]
+) -> Optional[Union[List[str], str]]:
+    """Add explicitly named key columns to a column selection, so they are always loaded."""
+    if columns is None or key_columns is None or key_columns in ("auto", ["auto"]):
+        return columns
+    if isinstance(columns, str):
+        columns = [columns]
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    return list(columns) + [col for col in key_columns if col not in columns]
+
+def find_diff_stats(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    source_dtypes1: Optional[Dict[str, str]] = None,
+    source_dtypes2: Optional[Dict[str, str]] = None,
+    key_columns: Optional[Union[List[str], str]] = None,
+    keyless: bool = False,
+    diff_rows: bool = True
+) -> Dict[str, Any]:
     """
     Calculate additional diff statistics between two dataframes.
     
+    With key columns, rows are matched on their key instead of their
+    position, numeric differences are computed between matched rows, and a
+    row-level diff is added under "row_diff". With keyless, rows are
+    compared as multisets of row fingerprints under "row_fingerprints".
+    
     Args:
         df1: First dataframe
         df2: Second dataframe
+        source_dtypes1: Dtype names of columns of df1 loaded with compact dtypes
+        source_dtypes2: Dtype names of columns of df2 loaded with compact dtypes
+        key_columns: Columns identifying a row in both dataframes, or 'auto' to
+            detect one (rows are matched by position if None or if none is found)
+        keyless: Whether to count added and removed rows by their fingerprints
+            regardless of row order (cannot be combined with key_columns)
+        diff_rows: Whether to diff the rows of the dataframes; if False, only the
+            key columns and compared columns are resolved, for a diff of the
+            entire files by _out_of_core_row_diff
         
     Returns:
         Dictionary with diff statistics
     """
+    if keyless and key_columns is not None:
+        raise ValueError("keyless cannot be combined with key_columns")
     diff_stats: Dict[str, Any] = {}
     
     # Get column differences
@@ -59,8 +114,8 @@ def find_diff_stats(df1: pd.DataFrame, df2: pd.DataFrame) -> Dict[str, Any]:
     # For common columns, check data type changes
     diff_stats["type_changes"] = {}
     for col in diff_stats["common_columns"]:
-        type1 = str(df1[col].dtype)
-        type2 = str(df2[col].dtype)
+        type1 = (source_dtypes1 or {}).get(col, str(df1[col].dtype))
+        type2 = (source_dtypes2 or {}).get(col, str(df2[col].dtype))
         if type1 != type2:
             diff_stats["type_changes"][col] = {"file1": type1, "file2": type2}
     
@@ -72,18 +127,45 @@ def find_diff_stats(df1: pd.DataFrame, df2: pd.DataFrame) -> Dict[str, Any]:
         "percent_change": round((len(df2) - len(df1)) / max(1, len(df1)) * 100, 2)
     }
     
+    # Match rows on their key, or by position
+    resolved_key = resolve_key_columns(df1, df2, key_columns)
+    alignment = None
+    if resolved_key is not None:
+        alignment = align_rows(df1, df2, resolved_key)
+        if diff_rows:
+            diff_stats["row_diff"] = keyed_diff(df1, df2, resolved_key, alignment=alignment)
+        else:
+            diff_stats["row_diff"] = {"key_columns": resolved_key}
+    elif key_columns is not None:
+        diff_stats["row_diff"] = {
+            "key_columns": None,
+            "message": "No column identifies the rows of both files, rows were compared by position"
+        }
+    if keyless and diff_rows:
+        diff_stats["row_fingerprints"] = fingerprint_diff(df1, df2)
+    elif keyless:
+        diff_stats["row_fingerprints"] = {"columns": [col for col in df1.columns if col in df2.columns]}
+    
     # Calculate value changes for common columns
     diff_stats["value_changes"] = {}
     for col in diff_stats["common_columns"]:
         # Only compare if both DataFrames have the column and they can be compared
         if col in df1.columns and col in df2.columns:
             # For numeric columns, calculate statistics on differences
-            if np.issubdtype(df1[col].dtype, np.number) and np.issubdtype(df2[col].dtype, np.number):
+            if is_numeric_type(df1[col].dtype) and is_numeric_type(df2[col].dtype):
                 # Compare only rows that exist in both dataframes
-                min_rows = min(len(df1), len(df2))
+                if alignment is not None:
+                    rows1, rows2 = alignment[0], alignment[1]
+                    min_rows = len(rows1)
+                else:
+                    min_rows = min(len(df1), len(df2))
+                    rows1 = rows2 = slice(None, min_rows)
                 if min_rows > 0:
                     # Calculate absolute and percentage differences
-                    abs_diff = (df2[col].iloc[:min_rows] - df1[col].iloc[:min_rows]).abs()
+                    # (widened first, so compact integer dtypes cannot overflow)
+                    values1 = _widen(df1[col].iloc[rows1]).reset_index(drop=True)
+                    values2 = _widen(df2[col].iloc[rows2]).reset_index(drop=True)
+                    abs_diff = (values2 - values1).abs()
                     
                     # Calculate statistics on non-NaN differences
                     non_nan_diffs = abs_diff.dropna()
@@ -122,6 +204,117 @@ def find_diff_stats(df1: pd.DataFrame, df2: pd.DataFrame) -> Dict[str, Any]:
     
     return diff_stats
 
+def _out_of_core_row_diff(
+    preprocessor1: CSVPreprocessor,
+    preprocessor2: CSVPreprocessor,
+    probes: List[FileProbe],
+    diff_stats: Dict[str, Any],
+    spill_dir: Optional[str] = None
+) -> None:
+    """
+    Compute the row-level diff of the entire files.
+    
+    Key columns are read as strings, since the dtype inferred for each chunk
+    could differ and make equal keys look different.
+    
+    Args:
+        preprocessor1: Preprocessor of the first file
+        preprocessor2: Preprocessor of the second file
+        probes: Probes of both files
+        diff_stats: Diff statistics from find_diff_stats, updated in place
+        spill_dir: Directory for temporary partition files (system default if None)
+    """
+    size_mb = max(probe.size for probe in probes) / (1024 * 1024)
+    if "row_fingerprints" in diff_stats:
+        diff_stats["row_fingerprints"] = external_fingerprint_diff(
+            preprocessor1.iter_chunks(),
+            preprocessor2.iter_chunks(),
+            diff_stats["row_fingerprints"]["columns"],
+            n_partitions=partition_count(size_mb),
+            spill_dir=spill_dir
+        )
+    
+    row_diff = diff_stats.get("row_diff")
+    if row_diff is None or row_diff["key_columns"] is None:
+        return
+    key_dtypes = {col: str for col in row_diff["key_columns"]}
+    diff_stats["row_diff"] = external_keyed_diff(
+        preprocessor1.iter_chunks(dtype=key_dtypes),
+        preprocessor2.iter_chunks(dtype=key_dtypes),
+        row_diff["key_columns"],
+        n_partitions=partition_count(size_mb),
+        spill_dir=spill_dir
+    )
+
+def _compare_files(
+    file1: str,
+    file2: str,
+    sep1: Optional[str],
+    sep2: Optional[str],
+    key_columns: Optional[Union[List[str], str]],
+    out_of_core: bool,
+    spill_dir: Optional[str],
+    keyless: bool,
+    use_digest: bool,
+    **preprocessor_options: Any
+) -> Dict[str, Any]:
+    """
+    Probe, analyze and diff two files, for compare_raw and compare.
+    
+    Args:
+        file1: Path to the first CSV file
+        file2: Path to the second CSV file
+        sep1: CSV separator for file1 (auto-detected if None)
+        sep2: CSV separator for file2 (auto-detected if None)
+        key_columns: Columns identifying a row in both files, or 'auto'
+        out_of_core: Whether to diff the rows of the entire files out of core
+        spill_dir: Directory for temporary partition files (system default if None)
+        keyless: Whether to compare rows by their fingerprints
+        use_digest: Whether to compare the digests of the files first
+        **preprocessor_options: Additional arguments for both CSVPreprocessors
+        
+    Returns:
+        Dictionary with 'invalid_file' (1 or 2) and 'error' if a file fails its
+        probe. Otherwise 'digest' and 'digests' with use_digest, 'identical' if
+        the digests match, and else 'metadata1', 'metadata2' and 'diff_stats'
+    """
+    if keyless and key_columns is not None:
+        raise ValueError("keyless cannot be combined with key_columns")
+    if out_of_core and key_columns is None and not keyless:
+        raise ValueError("out_of_core requires key_columns or keyless")
+    columns = _with_key_columns(preprocessor_options.pop("columns", None), key_columns)
+    graph = build_compare_graph(file1, file2, sep1, sep2, columns=columns, **preprocessor_options)
+    probes = list(graph.run(["probe1", "probe2"]).values())
+    for number, probe in enumerate(probes, start=1):
+        if not probe.is_valid:
+            return {"invalid_file": number, "error": probe.error}
+    
+    comparison: Dict[str, Any] = {}
+    if use_digest:
+        digests = graph.run(["digest1", "digest2"])
+        comparison["digests"] = [digests["digest1"], digests["digest2"]]
+        comparison["digest"] = compare_digests(digests["digest1"], digests["digest2"])
+        if comparison["digest"]["identical"]:
+            comparison["identical"] = True
+            return comparison
+    
+    # Preprocess both CSV files at the same time
+    results = graph.run(["preprocessor1", "metadata1", "preprocessor2", "metadata2"])
+    preprocessor1, metadata1 = results["preprocessor1"], results["metadata1"]
+    preprocessor2, metadata2 = results["preprocessor2"], results["metadata2"]
+    
+    # A diff of sampled rows would report rows outside the sample as added or removed
+    full_diff = out_of_core or metadata1["sample_provided"] or metadata2["sample_provided"]
+    diff_stats = find_diff_stats(
+        preprocessor1.df, preprocessor2.df, preprocessor1.source_dtypes, preprocessor2.source_dtypes,
+        key_columns, keyless, diff_rows=not full_diff
+    )
+    if full_diff:
+        _out_of_core_row_diff(preprocessor1, preprocessor2, probes, diff_stats, spill_dir)
+    
+    comparison.update({"metadata1": metadata1, "metadata2": metadata2, "diff_stats": diff_stats})
+    return comparison
+
 def compare_raw(
     file1: str,
     file2: str,
@@ -129,6 +322,21 @@ def compare_raw(
     sep2: Optional[str] = None,
     max_rows_analyzed: int = 150000,
     max_cols_analyzed: Optional[int] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
+    key_columns: Optional[Union[List[str], str]] = None,
+    out_of_core: bool = False,
+    spill_dir: Optional[str] = None,
+    keyless: bool = False,
+    use_digest: bool = False
 ) -> Dict[str, Any]:
     """
     Compare two CSV files and return structured comparison data without using LLM.
@@ -140,39 +348,76 @@ def compare_raw(
         sep2: CSV separator for file2 (auto-detected if None)
         max_rows_analyzed: Maximum number of rows to analyze per file
         max_cols_analyzed: Maximum number of columns to analyze per file
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
+        key_columns: Columns identifying a row in both files for a row-level diff, or
+            'auto' to detect one (rows are compared by position if None). Files with
+            more rows than max_rows_analyzed are diffed over all their rows out of core
+        out_of_core: Whether to diff the rows of the entire files by spilling
+            hash partitions to disk, even when they fit in the analyzed rows
+            (needs key_columns or keyless)
+        spill_dir: Directory for temporary partition files (system default if None)
+        keyless: Whether to count added, removed and unchanged rows by their
+            fingerprints regardless of row order, for files without a key
+        use_digest: Whether to compare order-independent digests of the entire
+            files first (saved next to the files), skipping the analysis if they match
         
     Returns:
         A dictionary containing structured comparison data
     """
-    # Validate the files
-    result = {}
-    for file_path, file_name in [(file1, "file1"), (file2, "file2")]:
-        is_valid, error = validate_file(file_path)
-        if not is_valid:
-            raise ValueError(f"Error in {file_name}: {error}")
-    
-    # Preprocess the first CSV file
-    preprocessor1 = CSVPreprocessor(
-        file_path=file1,
-        sep=sep1,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
-    )
-    metadata1 = preprocessor1.analyze()
-    
-    # Preprocess the second CSV file
-    preprocessor2 = CSVPreprocessor(
-        file_path=file2,
-        sep=sep2,
+    comparison = _compare_files(
+        file1,
+        file2,
+        sep1,
+        sep2,
+        key_columns,
+        out_of_core,
+        spill_dir,
+        keyless,
+        use_digest,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode
     )
-    metadata2 = preprocessor2.analyze()
+    if "invalid_file" in comparison:
+        raise ValueError(f"Error in file{comparison['invalid_file']}: {comparison['error']}")
     
-    # Calculate diff statistics
-    df1 = preprocessor1.df
-    df2 = preprocessor2.df
-    diff_stats = find_diff_stats(df1, df2)
+    # Files with the same digest hold the same rows, nothing else to compare
+    if comparison.get("identical"):
+        digests = comparison["digests"]
+        return {
+            "file1": {
+                "path": file1,
+                "row_count": digests[0]["rows"],
+                "column_count": len(digests[0]["columns"])
+            },
+            "file2": {
+                "path": file2,
+                "row_count": digests[1]["rows"],
+                "column_count": len(digests[1]["columns"])
+            },
+            "comparison": {"digest": comparison["digest"]}
+        }
+    metadata1, metadata2 = comparison["metadata1"], comparison["metadata2"]
+    diff_stats = comparison["diff_stats"]
     
     # Prepare result structure
     result = {
@@ -199,6 +444,12 @@ def compare_raw(
             "value_changes": diff_stats.get("value_changes", {})
         }
     }
+    if "row_diff" in diff_stats:
+        result["comparison"]["row_diff"] = diff_stats["row_diff"]
+    if "row_fingerprints" in diff_stats:
+        result["comparison"]["row_fingerprints"] = diff_stats["row_fingerprints"]
+    if use_digest:
+        result["comparison"]["digest"] = comparison["digest"]
     
     return result
 
@@ -214,6 +465,21 @@ def compare(
     max_cols_analyzed: Optional[int] = None,
     model: Optional[str] = None,
     use_llm: bool = True,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
+    key_columns: Optional[Union[List[str], str]] = None,
+    out_of_core: bool = False,
+    spill_dir: Optional[str] = None,
+    keyless: bool = False,
+    use_digest: bool = False,
     **kwargs
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -231,6 +497,28 @@ def compare(
         max_cols_analyzed: Maximum number of columns to analyze per file
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
+        key_columns: Columns identifying a row in both files for a row-level diff, or
+            'auto' to detect one (rows are compared by position if None). Files with
+            more rows than max_rows_analyzed are diffed over all their rows out of core
+        out_of_core: Whether to diff the rows of the entire files by spilling
+            hash partitions to disk, even when they fit in the analyzed rows
+            (needs key_columns or keyless)
+        spill_dir: Directory for temporary partition files (system default if None)
+        keyless: Whether to count added, removed and unchanged rows by their
+            fingerprints regardless of row order, for files without a key
+        use_digest: Whether to compare order-independent digests of the entire
+            files first (saved next to the files), skipping the analysis if they match
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -245,39 +533,59 @@ def compare(
             sep1=sep1,
             sep2=sep2,
             max_rows_analyzed=max_rows_analyzed,
-            max_cols_analyzed=max_cols_analyzed
+            max_cols_analyzed=max_cols_analyzed,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode,
+            key_columns=key_columns,
+            out_of_core=out_of_core,
+            spill_dir=spill_dir,
+            keyless=keyless,
+            use_digest=use_digest
         )
     
-    # Validate the files
-    for file_path, file_name in [(file1, "File 1"), (file2, "File 2")]:
-        is_valid, error = validate_file(file_path)
-        if not is_valid:
-            return f"Error in {file_name}: {error}"
-    
-    # Preprocess the first CSV file
-    preprocessor1 = CSVPreprocessor(
-        file_path=file1,
-        sep=sep1,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
-    )
-    metadata1 = preprocessor1.analyze()
-    
-    # Preprocess the second CSV file
-    preprocessor2 = CSVPreprocessor(
-        file_path=file2,
-        sep=sep2,
+    comparison = _compare_files(
+        file1,
+        file2,
+        sep1,
+        sep2,
+        key_columns,
+        out_of_core,
+        spill_dir,
+        keyless,
+        use_digest,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode
     )
-    metadata2 = preprocessor2.analyze()
+    if "invalid_file" in comparison:
+        return f"Error in File {comparison['invalid_file']}: {comparison['error']}"
     
-    # Calculate additional diff statistics
-    df1 = preprocessor1.df
-    df2 = preprocessor2.df
-    diff_stats = find_diff_stats(df1, df2)
+    # Files with the same digest hold the same rows, nothing to ask the LLM
+    if comparison.get("identical"):
+        return "The files are identical: they contain the same rows and columns."
+    metadata1, metadata2 = comparison["metadata1"], comparison["metadata2"]
+    diff_stats = comparison["diff_stats"]
     
     # Add diff stats to metadata
+    if use_digest:
+        diff_stats["digest"] = comparison["digest"]
     metadata1["diff_stats"] = diff_stats
     
     # Get the LLM provider
@@ -3,13 +3,13 @@ from typing import Dict, Any, Optional, List, Union
 import os
 import pandas as pd
 
-from ..core.utils import validate_file
-from ..core.preprocessor import CSVPreprocessor
-from ..tasks.validate import validate_raw
+from ..core.probe import FileProbe
+from ..core.cache import AnalysisCache
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
+from ..executor.pipeline import build_analysis_graph
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
-from ..test_generators import get_all_generators
 from ..test_frameworks import get_framework, get_available_frameworks
 
 # Dictionary of available LLM providers
@@ -46,7 +46,19 @@ def generate_tests_raw(
     null_threshold: float = 5.0,
     cardinality_threshold: float = 95.0,
     outlier_threshold: float = 3.0,
-    model_name: Optional[str] = None
+    model_name: Optional[str] = None,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False
 ) -> Dict[str, Any]:
     """
     Generate tests for a CSV file without using LLM.
@@ -61,38 +73,54 @@ def generate_tests_raw(
         cardinality_threshold: Percentage threshold for high cardinality warning
         outlier_threshold: Z-score threshold for identifying outliers
         model_name: Optional name for the model/table (for DBT)
+        use_cache: Whether to reuse metadata and validation results cached on disk
+            for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         
     Returns:
         A dictionary containing generated tests and test code
     """
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        raise ValueError(f"Error: {error}")
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        raise ValueError(f"Error: {probe.error}")
     
-    # Get validation results to identify issues
-    validation_results = validate_raw(
-        file=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Validation, metadata and every test generator share a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
+        outlier_threshold=outlier_threshold,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
-    df = preprocessor.df
-    
-    if df is None:
-        raise ValueError("Failed to load DataFrame")
+    results = graph.run(["validation", "metadata", "tests"])
+    validation_results = results["validation"]
+    metadata = results["metadata"]
     
     # Initialize test results
     test_results = {
@@ -104,23 +132,8 @@ def generate_tests_raw(
         "test_code": "",
     }
     
-    # Get all registered test generators and apply them
-    generators = get_all_generators()
-    all_tests = []
-    
-    # Process each generator
-    for generator in generators:
-        # Generate tests
-        tests = generator.generate_tests(
-            df, 
-            metadata, 
-            validation_results,
-            null_threshold=null_threshold,
-            cardinality_threshold=cardinality_threshold,
-            outlier_threshold=outlier_threshold
-        )
-        
-        all_tests.extend(tests)
+    # Tests from all registered test generators
+    all_tests = list(results["tests"])
     
     # Count tests by type and severity
     test_types = {}
@@ -180,6 +193,18 @@ def generate_tests(
     model_name: Optional[str] = None,
     model: Optional[str] = None,
     use_llm: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
     **kwargs: Any
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -200,6 +225,19 @@ def generate_tests(
         model_name: Optional name for the model/table (for DBT)
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        use_cache: Whether to reuse results cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -217,46 +255,51 @@ def generate_tests(
             null_threshold=null_threshold,
             cardinality_threshold=cardinality_threshold,
             outlier_threshold=outlier_threshold,
-            model_name=model_name
+            model_name=model_name,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode
         )
     
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        return f"Error: {error}"
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        return f"Error: {probe.error}"
     
-    # Get the structured test results
-    test_results = generate_tests_raw(
-        file=file,
-        framework=framework,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Get validation results and metadata from a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
         outlier_threshold=outlier_threshold,
-        model_name=model_name
-    )
-    
-    # Get validation results
-    validation_results = validate_raw(
-        file=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
         max_cols_analyzed=max_cols_analyzed,
-        null_threshold=null_threshold,
-        cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
+    results = graph.run(["validation", "metadata"])
+    validation_results = results["validation"]
+    metadata = results["metadata"]
     
     # Get the LLM provider
     llm = get_provider(provider, api_key)
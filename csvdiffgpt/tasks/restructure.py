@@ -4,13 +4,14 @@ import os
 import re
 import pandas as pd
 
-from ..core.utils import validate_file
-from ..core.preprocessor import CSVPreprocessor
-from ..tasks.validate import validate_raw
+from ..core.probe import FileProbe
+from ..core.cache import AnalysisCache
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
+from ..executor.graph import TaskGraph
+from ..executor.pipeline import build_analysis_graph
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
-from ..restructure_analyzers import get_all_analyzers
 from ..data_models import get_model_adapter, get_available_adapters
 
 # Dictionary of available LLM providers
@@ -47,7 +48,19 @@ def restructure_raw(
     null_threshold: float = 5.0,
     cardinality_threshold: float = 95.0,
     outlier_threshold: float = 3.0,
-    table_name: Optional[str] = None
+    table_name: Optional[str] = None,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False
 ) -> Dict[str, Any]:
     """
     Analyze a CSV file and recommend schema restructuring without using LLM.
@@ -62,38 +75,76 @@ def restructure_raw(
         cardinality_threshold: Percentage threshold for high cardinality warning
         outlier_threshold: Z-score threshold for identifying outliers
         table_name: Optional name for the database table
+        use_cache: Whether to reuse metadata and validation results cached on disk
+            for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         
     Returns:
         A dictionary containing restructuring recommendations and formatted output
     """
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        raise ValueError(f"Error: {error}")
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        raise ValueError(f"Error: {probe.error}")
     
-    # Get validation results to identify issues
-    validation_results = validate_raw(
-        file=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Validation, metadata and every analyzer share a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
+        outlier_threshold=outlier_threshold,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
-    df = preprocessor.df
     
-    if df is None:
-        raise ValueError("Failed to load DataFrame")
+    return _build_restructure_results(graph, file, format, table_name)
+
+
+def _build_restructure_results(
+    graph: TaskGraph,
+    file: str,
+    format: str,
+    table_name: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Build the restructuring results from the nodes of an analysis graph.
+    
+    Args:
+        graph: Analysis graph for the CSV file
+        file: Path to the CSV file
+        format: Output format for recommendations ('sql', 'mermaid', 'python')
+        table_name: Optional name for the database table
+        
+    Returns:
+        A dictionary containing restructuring recommendations and formatted output
+    """
+    results = graph.run(["validation", "metadata", "restructure"])
+    validation_results = results["validation"]
+    metadata = results["metadata"]
     
     # Derive table name if not provided
     if table_name is None:
@@ -113,26 +164,8 @@ def restructure_raw(
         "output_code": "",
     }
     
-    # Get all registered analyzers and apply them
-    analyzers = get_all_analyzers()
-    all_recommendations = []
-    
-    # Process each analyzer
-    for analyzer in analyzers:
-        try:
-            # Generate recommendations
-            recommendations = analyzer.analyze(
-                df, 
-                metadata, 
-                validation_results,
-                null_threshold=null_threshold,
-                cardinality_threshold=cardinality_threshold,
-                outlier_threshold=outlier_threshold
-            )
-            
-            all_recommendations.extend(recommendations)
-        except Exception as e:
-            print(f"Error in {analyzer.get_name()}: {str(e)}")
+    # Recommendations from all registered analyzers
+    all_recommendations = list(results["restructure"])
     
     # Count recommendations by type and severity
     recommendation_types = {}
@@ -192,6 +225,18 @@ def restructure(
     table_name: Optional[str] = None,
     model: Optional[str] = None,
     use_llm: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
     **kwargs: Any
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -212,6 +257,19 @@ def restructure(
         table_name: Optional name for the database table
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        use_cache: Whether to reuse results cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -229,46 +287,51 @@ def restructure(
             null_threshold=null_threshold,
             cardinality_threshold=cardinality_threshold,
             outlier_threshold=outlier_threshold,
-            table_name=table_name
+            table_name=table_name,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode
         )
     
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        return f"Error: {error}"
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        return f"Error: {probe.error}"
     
-    # Get the structured restructuring recommendations
-    restructure_results = restructure_raw(
-        file=file,
-        format=format,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed,
+    # Get recommendations, validation results and metadata from a single parse of the file
+    graph = build_analysis_graph(
+        file,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
         outlier_threshold=outlier_threshold,
-        table_name=table_name
-    )
-    
-    # Get validation results
-    validation_results = validate_raw(
-        file=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
         max_cols_analyzed=max_cols_analyzed,
-        null_threshold=null_threshold,
-        cardinality_threshold=cardinality_threshold,
-        outlier_threshold=outlier_threshold
-    )
-    
-    # Preprocess the CSV file to get metadata
-    preprocessor = CSVPreprocessor(
-        file_path=file,
-        sep=sep,
-        max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        probe=probe
     )
-    metadata = preprocessor.to_dict()
+    restructure_results = _build_restructure_results(graph, file, format, table_name)
+    validation_results = graph.get("validation")
+    metadata = graph.get("metadata")
     
     # Get the LLM provider
     llm = get_provider(provider, api_key)
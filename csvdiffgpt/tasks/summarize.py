@@ -1,9 +1,11 @@
 """Task to summarize a CSV file."""
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Union, List
 import os
 
-from ..core.utils import validate_file
+from ..core.probe import FileProbe
 from ..core.preprocessor import CSVPreprocessor
+from ..core.cache import AnalysisCache
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
@@ -37,6 +39,21 @@ def summarize_raw(
     sep: Optional[str] = None,
     max_rows_analyzed: int = 150000,
     max_cols_analyzed: Optional[int] = None,
+    streaming: bool = False,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    incremental: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False
 ) -> Dict[str, Any]:
     """
     Summarize a CSV file without using LLM and return structured data.
@@ -46,21 +63,54 @@ def summarize_raw(
         sep: CSV separator (auto-detected if None)
         max_rows_analyzed: Maximum number of rows to analyze
         max_cols_analyzed: Maximum number of columns to analyze
+        streaming: Whether to compute column statistics over the entire file in chunks
+        use_cache: Whether to reuse metadata cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        n_workers: Number of threads analyzing columns in parallel (sequential if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        incremental: Whether to save streaming statistics next to the file and only profile
+            rows appended since the previous run (implies streaming)
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+            (over the whole file in streaming mode)
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         
     Returns:
         A dictionary containing metadata and statistics about the CSV file
     """
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        raise ValueError(f"Error: {error}")
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        raise ValueError(f"Error: {probe.error}")
     
     # Preprocess the CSV file
     preprocessor = CSVPreprocessor(
         file_path=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        streaming=streaming,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        n_workers=n_workers,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        incremental=incremental,
+        probe=probe
     )
     
     # Return the raw metadata
@@ -76,6 +126,21 @@ def summarize(
     max_cols_analyzed: Optional[int] = None,
     model: Optional[str] = None,
     use_llm: bool = True,
+    streaming: bool = False,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    incremental: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
     **kwargs
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -91,6 +156,24 @@ def summarize(
         max_cols_analyzed: Maximum number of columns to analyze
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        streaming: Whether to compute column statistics over the entire file in chunks
+        use_cache: Whether to reuse metadata cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        n_workers: Number of threads analyzing columns in parallel (sequential if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        incremental: Whether to save streaming statistics next to the file and only profile
+            rows appended since the previous run (implies streaming)
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+            (over the whole file in streaming mode)
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -103,20 +186,50 @@ def summarize(
             file=file,
             sep=sep,
             max_rows_analyzed=max_rows_analyzed,
-            max_cols_analyzed=max_cols_analyzed
+            max_cols_analyzed=max_cols_analyzed,
+            streaming=streaming,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            n_workers=n_workers,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode,
+            incremental=incremental
         )
     
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        return f"Error: {error}"
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        return f"Error: {probe.error}"
     
     # Preprocess the CSV file
     preprocessor = CSVPreprocessor(
         file_path=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        streaming=streaming,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        n_workers=n_workers,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        incremental=incremental,
+        probe=probe
     )
     metadata = preprocessor.analyze()
     
@@ -1,11 +1,16 @@
 """Task to validate a CSV file for data quality issues."""
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Callable
 import os
 import pandas as pd
 import numpy as np
 
-from ..core.utils import validate_file
+from ..core.utils import is_string_type, unique_count_rows, unique_count_nulls
+from ..core.probe import FileProbe
 from ..core.preprocessor import CSVPreprocessor
+from ..core.cache import AnalysisCache
+from ..core.column_batches import numeric_outlier_stats, string_length_stats
+from ..core.string_lengths import string_length_summary
+from ..core.sketches import DEFAULT_DISTINCT_ERROR
 from ..llm.openai import OpenAIProvider
 from ..llm.gemini import GeminiProvider
 from ..llm.base import LLMProvider
@@ -42,7 +47,22 @@ def validate_raw(
     max_cols_analyzed: Optional[int] = None,
     null_threshold: float = 5.0,
     cardinality_threshold: float = 95.0,
-    outlier_threshold: float = 3.0
+    outlier_threshold: float = 3.0,
+    streaming: bool = False,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    incremental: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False
 ) -> Dict[str, Any]:
     """
     Validate a CSV file and identify data quality issues without using LLM.
@@ -55,29 +75,152 @@ def validate_raw(
         null_threshold: Percentage threshold for flagging columns with missing values
         cardinality_threshold: Percentage threshold for high cardinality warning
         outlier_threshold: Z-score threshold for identifying outliers
+        streaming: Whether to compute column statistics over the entire file in chunks
+        use_cache: Whether to reuse metadata and validation results cached on disk
+            for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        n_workers: Number of threads analyzing columns in parallel (sequential if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        incremental: Whether to save streaming statistics next to the file and only profile
+            rows appended since the previous run (implies streaming)
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+            (over the whole file in streaming mode)
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         
     Returns:
         A dictionary containing validation results
     """
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        raise ValueError(f"Error: {error}")
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        raise ValueError(f"Error: {probe.error}")
     
     # Preprocess the CSV file
     preprocessor = CSVPreprocessor(
         file_path=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
-        max_cols_analyzed=max_cols_analyzed
+        max_cols_analyzed=max_cols_analyzed,
+        streaming=streaming,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        n_workers=n_workers,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        incremental=incremental,
+        probe=probe
     )
     
-    metadata = preprocessor.analyze()
+    return run_validation(
+        preprocessor,
+        null_threshold=null_threshold,
+        cardinality_threshold=cardinality_threshold,
+        outlier_threshold=outlier_threshold
+    )
+
+
+def run_validation(
+    preprocessor: CSVPreprocessor,
+    null_threshold: float = 5.0,
+    cardinality_threshold: float = 95.0,
+    outlier_threshold: float = 3.0
+) -> Dict[str, Any]:
+    """
+    Validate the file of a preprocessor, reusing its cache when it has one.
+    
+    The preprocessor's metadata and data are computed only if needed, so callers
+    that already analyzed the file share the same parse.
+    
+    Args:
+        preprocessor: Preprocessor for the CSV file
+        null_threshold: Percentage threshold for flagging columns with missing values
+        cardinality_threshold: Percentage threshold for high cardinality warning
+        outlier_threshold: Z-score threshold for identifying outliers
+        
+    Returns:
+        A dictionary containing validation results
+    """
+    # Reuse previous validation results for an unchanged file
+    cache = preprocessor.cache
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(preprocessor.file_path, "validation", {
+            **preprocessor.cache_params(),
+            "null_threshold": null_threshold,
+            "cardinality_threshold": cardinality_threshold,
+            "outlier_threshold": outlier_threshold
+        })
+        cached_results = cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results
+    
+    metadata = preprocessor.to_dict()
+    if preprocessor.df is None:
+        # Metadata came from the cache, but the checks below need the data
+        preprocessor.load_data()
     df = preprocessor.df
     
     if df is None:
         raise ValueError("Failed to load DataFrame")
     
+    validation_results = validate_dataframe(
+        df,
+        metadata,
+        null_threshold=null_threshold,
+        cardinality_threshold=cardinality_threshold,
+        outlier_threshold=outlier_threshold,
+        wide_mode=preprocessor.wide_mode,
+        string_lengths=preprocessor.string_length_stats
+    )
+    
+    if cache_key is not None:
+        cache.put(cache_key, validation_results)
+    
+    return validation_results
+
+
+def validate_dataframe(
+    df: pd.DataFrame,
+    metadata: Dict[str, Any],
+    null_threshold: float = 5.0,
+    cardinality_threshold: float = 95.0,
+    outlier_threshold: float = 3.0,
+    wide_mode: bool = False,
+    string_lengths: Optional[Callable[[str], Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Run the data quality checks on already loaded data.
+    
+    Args:
+        df: DataFrame with the analyzed rows
+        metadata: Metadata from the CSV preprocessor
+        null_threshold: Percentage threshold for flagging columns with missing values
+        cardinality_threshold: Percentage threshold for high cardinality warning
+        outlier_threshold: Z-score threshold for identifying outliers
+        wide_mode: Whether to compute outliers and string lengths for batches of
+            columns at once instead of column by column
+        string_lengths: Function returning the string length statistics of a
+            column of df (e.g. CSVPreprocessor.string_length_stats), so lengths
+            measured for the metadata are not measured again
+        
+    Returns:
+        A dictionary containing validation results
+    """
     # Initialize validation results
     validation_results = {
         "file_info": {
@@ -116,8 +259,9 @@ def validate_raw(
             })
     
         # High cardinality check for string/categorical columns
-        if col_meta["type"] == "object" and col_meta["unique_count"] > 0:
-            unique_percentage = (col_meta["unique_count"] / (metadata["analyzed_rows"] - col_meta["nulls"])) * 100 if (metadata["analyzed_rows"] - col_meta["nulls"]) > 0 else 0
+        if is_string_type(col_meta["type"]) and col_meta["unique_count"] > 0:
+            counted_rows = unique_count_rows(metadata, metadata["analyzed_rows"]) - unique_count_nulls(metadata, col_meta)
+            unique_percentage = (col_meta["unique_count"] / counted_rows) * 100 if counted_rows > 0 else 0
             if unique_percentage > cardinality_threshold:
                 validation_results["issues"]["high_cardinality"].append({
                     "column": col,
@@ -127,7 +271,7 @@ def validate_raw(
                 })
     
         # Type issues check (mixed data types)
-        if col_meta["type"] == "object" and "examples" in col_meta:
+        if is_string_type(col_meta["type"]) and "examples" in col_meta:
             # Check if examples look like they could be numeric but are stored as strings
             examples = col_meta["examples"]
             numeric_count = 0
@@ -174,60 +318,67 @@ def validate_raw(
                     })
     
     # Check for outliers in numeric columns
-    for col in df.select_dtypes(include=[np.number]).columns:
+    numeric_columns = list(df.select_dtypes(include=[np.number]).columns)
+    outlier_stats = numeric_outlier_stats(df, numeric_columns, outlier_threshold) if wide_mode else None
+    for col in numeric_columns:
+        if outlier_stats is not None:
+            col_stats = outlier_stats[col]
+        else:
+            col_stats = _column_outlier_stats(df[col], outlier_threshold)
+        
         # Skip columns with too many nulls
-        if df[col].isna().mean() > 0.5:
+        if col_stats["null_fraction"] > 0.5:
             continue
-            
-        # Calculate z-scores for outlier detection
-        mean = df[col].mean()
-        std = df[col].std()
         
         # Skip if std is 0 or close to 0
-        if std < 1e-10:
+        if col_stats["std"] < 1e-10:
             continue
-            
-        # Calculate z-scores
-        z_scores = np.abs((df[col] - mean) / std)
-        
-        # Find values that exceed the threshold
-        outlier_mask = z_scores > outlier_threshold
-        outliers = df[col][outlier_mask]
         
         # Only report if we found outliers
-        if len(outliers) > 0:
-            outlier_percentage = (len(outliers) / len(df[col])) * 100
+        if col_stats["outliers"] > 0:
+            outlier_percentage = (col_stats["outliers"] / len(df)) * 100
             
             # Always report outliers, regardless of percentage
             validation_results["issues"]["outliers"].append({
                 "column": col,
-                "outlier_count": int(len(outliers)),
+                "outlier_count": col_stats["outliers"],
                 "outlier_percentage": round(outlier_percentage, 2),
-                "min_value": float(df[col].min()),
-                "max_value": float(df[col].max()),
-                "mean": float(mean),
-                "std": float(std),
+                "min_value": col_stats["min"],
+                "max_value": col_stats["max"],
+                "mean": col_stats["mean"],
+                "std": col_stats["std"],
                 "severity": "high" if outlier_percentage > 5 else "medium" if outlier_percentage > 1 else "low"
             })
     
     # Check for inconsistent formats in string columns
-    for col in df.select_dtypes(include=['object']).columns:
+    string_columns = list(df.select_dtypes(include=['object', 'string', 'category']).columns)
+    batched_lengths = string_length_stats(df, string_columns) if wide_mode and string_lengths is None else {}
+    for col in string_columns:
+        if col in batched_lengths:
+            col_stats = batched_lengths[col]
+        elif string_lengths is not None:
+            # Lengths already measured for the column metadata
+            col_stats = string_lengths(col)
+        else:
+            col_stats = string_length_summary(df[col])
+        if col_stats["nulls"] + col_stats["count"] < len(df):
+            # Some values are not strings, measure them by their string form
+            col_stats = string_length_summary(df[col], as_str=True)
+        
         # Skip columns with too many nulls
-        if df[col].isna().mean() > 0.5:
+        if col_stats["nulls"] > len(df) * 0.5:
             continue
-            
+        
         # Check string length consistency
-        non_null_strings = df[col].dropna().astype(str)
-        if len(non_null_strings) > 0:
-            lengths = non_null_strings.str.len()
-            length_mean = lengths.mean()
-            length_std = lengths.std()
+        if col_stats["count"] > 0:
+            length_mean = col_stats["avg_length"]
+            length_std = col_stats["std_length"]
             
             # If standard deviation of string length is high relative to mean
-            if length_std > 0 and length_mean > 0 and (length_std / length_mean) > 0.5:
+            if length_std is not None and length_std > 0 and length_mean > 0 and (length_std / length_mean) > 0.5:
                 # Check if there are very different lengths
-                min_length = lengths.min()
-                max_length = lengths.max()
+                min_length = col_stats["min_length"]
+                max_length = col_stats["max_length"]
                 
                 if max_length > min_length * 2:  # If max is more than double min
                     validation_results["issues"]["inconsistent_values"].append({
@@ -259,6 +410,30 @@ def validate_raw(
     return validation_results
 
 
+def _column_outlier_stats(values: pd.Series, outlier_threshold: float) -> Dict[str, Any]:
+    """
+    Count the z-score outliers of one numeric column.
+    
+    Args:
+        values: Values of the column
+        outlier_threshold: Z-score threshold for identifying outliers
+        
+    Returns:
+        Dictionary with the same fields as numeric_outlier_stats
+    """
+    mean = values.mean()
+    std = values.std()
+    z_scores = np.abs((values - mean) / std)
+    return {
+        "null_fraction": float(values.isna().mean()),
+        "mean": float(mean),
+        "std": float(std),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "outliers": int((z_scores > outlier_threshold).sum())
+    }
+
+
 def validate(
     file: str,
     question: str = "Validate this dataset and identify data quality issues",
@@ -272,6 +447,21 @@ def validate(
     outlier_threshold: float = 3.0,
     model: Optional[str] = None,
     use_llm: bool = True,
+    streaming: bool = False,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    engine: str = "c",
+    sampling: str = "head",
+    random_state: Optional[int] = None,
+    optimize_dtypes: bool = False,
+    incremental: bool = False,
+    columns: Optional[Union[List[str], str]] = None,
+    exclude_columns: Optional[Union[List[str], str]] = None,
+    approx_distinct: bool = False,
+    distinct_error: float = DEFAULT_DISTINCT_ERROR,
+    compact_metadata: bool = False,
+    wide_mode: bool = False,
     **kwargs: Any
 ) -> Union[str, Dict[str, Any]]:
     """
@@ -290,6 +480,24 @@ def validate(
         outlier_threshold: Z-score threshold for identifying outliers
         model: Specific model to use (provider-dependent)
         use_llm: Whether to use LLM for generating summary (if False, returns raw data)
+        streaming: Whether to compute column statistics over the entire file in chunks
+        use_cache: Whether to reuse results cached on disk for an unchanged file
+        cache_dir: Directory of the on-disk cache (default location if None)
+        n_workers: Number of threads analyzing columns in parallel (sequential if None)
+        engine: CSV parser to use ('c', 'python' or 'pyarrow')
+        sampling: How to sample files with more rows than max_rows_analyzed
+            ('head' or 'random')
+        random_state: Seed for random sampling
+        optimize_dtypes: Whether to hold the loaded data in compact dtypes to save memory
+        incremental: Whether to save streaming statistics next to the file and only profile
+            rows appended since the previous run (implies streaming)
+        columns: Names or regular expressions of the columns to analyze (all columns if None)
+        exclude_columns: Names or regular expressions of columns to leave out
+        approx_distinct: Whether to estimate distinct counts with HyperLogLog sketches
+            (over the whole file in streaming mode)
+        distinct_error: Relative standard error of approximate distinct counts
+        compact_metadata: Whether to hold column metadata in one typed table (for very wide files)
+        wide_mode: Whether to compute column statistics for batches of columns at once (for very wide files)
         **kwargs: Additional parameters for the LLM provider
         
     Returns:
@@ -305,20 +513,55 @@ def validate(
             max_cols_analyzed=max_cols_analyzed,
             null_threshold=null_threshold,
             cardinality_threshold=cardinality_threshold,
-            outlier_threshold=outlier_threshold
+            outlier_threshold=outlier_threshold,
+            streaming=streaming,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            n_workers=n_workers,
+            engine=engine,
+            sampling=sampling,
+            random_state=random_state,
+            optimize_dtypes=optimize_dtypes,
+            columns=columns,
+            exclude_columns=exclude_columns,
+            approx_distinct=approx_distinct,
+            distinct_error=distinct_error,
+            compact_metadata=compact_metadata,
+            wide_mode=wide_mode,
+            incremental=incremental
         )
     
     # Validate the file
-    is_valid, error = validate_file(file)
-    if not is_valid:
-        return f"Error: {error}"
+    probe = FileProbe(file)
+    if not probe.is_valid:
+        return f"Error: {probe.error}"
     
-    # Get the structured validation results
-    validation_results = validate_raw(
-        file=file,
+    # Preprocess the CSV file, reusing the probe
+    preprocessor = CSVPreprocessor(
+        file_path=file,
         sep=sep,
         max_rows_analyzed=max_rows_analyzed,
         max_cols_analyzed=max_cols_analyzed,
+        streaming=streaming,
+        cache=AnalysisCache(cache_dir) if use_cache else None,
+        n_workers=n_workers,
+        engine=engine,
+        sampling=sampling,
+        random_state=random_state,
+        optimize_dtypes=optimize_dtypes,
+        columns=columns,
+        exclude_columns=exclude_columns,
+        approx_distinct=approx_distinct,
+        distinct_error=distinct_error,
+        compact_metadata=compact_metadata,
+        wide_mode=wide_mode,
+        incremental=incremental,
+        probe=probe
+    )
+    
+    # Get the structured validation results
+    validation_results = run_validation(
+        preprocessor,
         null_threshold=null_threshold,
         cardinality_threshold=cardinality_threshold,
         outlier_threshold=outlier_threshold
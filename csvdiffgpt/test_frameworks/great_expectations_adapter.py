@@ -4,6 +4,7 @@ import os
 import json
 
 from .base import BaseTestFramework, register_framework
+from ..readers import pandas_read_code
 
 # Register with both naming conventions to ensure compatibility
 @register_framework
@@ -76,7 +77,6 @@ class GreatExpectationsAdapter(BaseTestFramework):
             Setup code as a string
         """
         suite_name = kwargs.get("suite_name", "data_quality_suite")
-        separator = metadata.get("separator", ",")
         
         setup_code = [
             "# Initialize the data context",
@@ -86,7 +86,7 @@ class GreatExpectationsAdapter(BaseTestFramework):
             f"expectation_suite = ExpectationSuite(expectation_suite_name='{suite_name}')",
             "",
             "# Load the data",
-            f"df = pd.read_csv('{os.path.basename(file_path)}', sep='{separator}')",
+            f"df = {pandas_read_code(os.path.basename(file_path), metadata)}",
             "",
             "# Create a Great Expectations DataFrame",
             "ge_df = ge.from_pandas(df)"
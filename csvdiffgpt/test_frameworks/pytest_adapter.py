@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional, Callable
 import os
 
 from .base import BaseTestFramework, register_framework
+from ..readers import pandas_read_code
 
 @register_framework
 class PytestAdapter(BaseTestFramework):
@@ -110,14 +111,12 @@ class PytestAdapter(BaseTestFramework):
         Returns:
             Setup code as a string
         """
-        separator = metadata.get("separator", ",")
-        
         setup_code = [
             "@pytest.fixture",
             "def df():",
             f"    \"\"\"Load the CSV file into a pandas DataFrame.\"\"\"",
             f"    # Load the CSV file",
-            f"    return pd.read_csv('{os.path.basename(file_path)}', sep='{separator}')"
+            f"    return {pandas_read_code(os.path.basename(file_path), metadata)}"
         ]
         
         return "\n".join(setup_code)
\ No newline at end of file
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 
 from .base import BaseTestGenerator, register_generator
+from ..core.utils import is_numeric_type, is_string_type
 
 @register_generator
 class ValueTestGenerator(BaseTestGenerator):
@@ -29,7 +30,7 @@ class ValueTestGenerator(BaseTestGenerator):
             col_type = details.get("type", "")
             
             # Value range tests for numeric columns
-            if np.issubdtype(np.dtype(col_type), np.number):
+            if is_numeric_type(col_type):
                 # Only generate if min and max are available
                 if "min" in details and "max" in details:
                     min_val = details["min"]
@@ -69,7 +70,7 @@ class ValueTestGenerator(BaseTestGenerator):
                     })
             
             # String length tests for string columns
-            elif col_type == "object" and "min_length" in details and "max_length" in details:
+            elif is_string_type(col_type) and "min_length" in details and "max_length" in details:
                 min_length = details["min_length"]
                 max_length = details["max_length"]
                 
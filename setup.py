@@ -25,6 +25,8 @@ setup(
         "openai": ["openai>=1.0.0"],
         "gemini": ["google-generativeai>=0.8.5"],
         "claude": ["anthropic>=0.5.0"],
+        "arrow": ["pyarrow>=10.0.0"],
+        "zstd": ["zstandard>=0.15.0"],
         "dev": [
             "pytest>=6.0.0",
             "black>=21.5b2",
@@ -35,6 +37,8 @@ setup(
         "all": [
             "openai>=1.0.0",
             "google-generativeai>=0.8.5",
+            "pyarrow>=10.0.0",
+            "zstandard>=0.15.0",
         ],
     },
     entry_points={
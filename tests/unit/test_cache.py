@@ -0,0 +1,82 @@
+"""Tests for the on-disk analysis cache."""
+import os
+import time
+import pytest
+
+from csvdiffgpt.core.cache import AnalysisCache, file_fingerprint
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt import validate_raw
+
+
+def test_cache_put_get(temp_csv_dir):
+    """Test storing and retrieving a value."""
+    cache = AnalysisCache(os.path.join(temp_csv_dir, "cache"))
+    cache.put("abc", {"value": 1})
+    assert cache.get("abc") == {"value": 1}
+    assert cache.get("missing") is None
+
+
+def test_cache_key_changes_with_content(temp_csv_file, temp_csv_dir):
+    """Test that cache keys change when the file or parameters change."""
+    cache = AnalysisCache(os.path.join(temp_csv_dir, "cache"))
+    key = cache.make_key(temp_csv_file, "metadata", {"sep": ","})
+    
+    assert key == cache.make_key(temp_csv_file, "metadata", {"sep": ","})
+    assert key != cache.make_key(temp_csv_file, "metadata", {"sep": ";"})
+    assert key != cache.make_key(temp_csv_file, "validation", {"sep": ","})
+    
+    with open(temp_csv_file, "a") as f:
+        f.write("d,4,false\n")
+    assert key != cache.make_key(temp_csv_file, "metadata", {"sep": ","})
+
+
+def test_file_fingerprint(temp_csv_file):
+    """Test the sampled file fingerprint."""
+    fingerprint = file_fingerprint(temp_csv_file)
+    assert fingerprint["size"] == os.path.getsize(temp_csv_file)
+    assert fingerprint == file_fingerprint(temp_csv_file)
+
+
+def test_cache_lru_eviction(temp_csv_dir):
+    """Test that least recently used entries are evicted first."""
+    cache = AnalysisCache(os.path.join(temp_csv_dir, "cache"), max_size_mb=0.01)
+    payload = "x" * 4000
+    
+    cache.put("first", payload)
+    cache.put("second", payload)
+    # Touch 'first' so that 'second' becomes the least recently used entry
+    old = time.time() - 100
+    os.utime(os.path.join(cache.cache_dir, "second.pkl"), (old, old))
+    cache.get("first")
+    cache.put("third", payload)
+    
+    assert cache.get("first") == payload
+    assert cache.get("second") is None
+    assert cache.get("third") == payload
+
+
+def test_preprocessor_uses_cache(simple_csv_path, temp_csv_dir):
+    """Test that a second analysis of an unchanged file skips loading data."""
+    cache = AnalysisCache(os.path.join(temp_csv_dir, "cache"))
+    first = CSVPreprocessor(simple_csv_path, cache=cache)
+    metadata = first.analyze()
+    
+    second = CSVPreprocessor(simple_csv_path, cache=cache)
+    cached = second.analyze()
+    
+    assert second.df is None
+    assert cached["total_rows"] == metadata["total_rows"]
+    assert cached["columns"].keys() == metadata["columns"].keys()
+
+
+def test_validate_raw_uses_cache(simple_csv_path, temp_csv_dir, monkeypatch):
+    """Test that validate_raw reuses cached validation results."""
+    cache_dir = os.path.join(temp_csv_dir, "cache")
+    first = validate_raw(simple_csv_path, use_cache=True, cache_dir=cache_dir)
+    
+    def fail_load(self):
+        raise AssertionError("data should not be loaded on a cache hit")
+    monkeypatch.setattr(CSVPreprocessor, "load_data", fail_load)
+    
+    second = validate_raw(simple_csv_path, use_cache=True, cache_dir=cache_dir)
+    assert second == first
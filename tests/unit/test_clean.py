@@ -100,6 +100,24 @@ def test_clean_raw_with_outliers():
             os.remove('temp_outliers.csv')
 
 
+def test_winsorize_bounds_cover_whole_file():
+    """Test that winsorizing uses profile percentiles only when they cover every row."""
+    from csvdiffgpt.cleaners.outliers import OutlierCleaner
+    
+    cleaner = OutlierCleaner()
+    issues = [{"column": "value", "outlier_percentage": 20.0, "outlier_count": 4}]
+    columns = {"value": {"percentiles": {"p5": 1.5, "p95": 98.25}}}
+    
+    # Percentiles of the analyzed sample would clip the whole file to the sample's range
+    sample = cleaner.generate_recommendations(None, {"profile_mode": "sample", "columns": columns}, issues)
+    assert "df['value'].quantile(0.05)" in sample[0]["code"]
+    assert "bounds" not in sample[0]["impact"]
+    
+    streaming = cleaner.generate_recommendations(None, {"profile_mode": "streaming", "columns": columns}, issues)
+    assert "lower_bound = 1.5\nupper_bound = 98.25" in streaming[0]["code"]
+    assert streaming[0]["impact"]["bounds"] == [1.5, 98.25]
+
+
 def test_clean_raw_with_type_issues():
     """Test clean_raw function with type issues."""
     # Create a temporary CSV with type issues
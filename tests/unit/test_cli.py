@@ -35,6 +35,18 @@ def test_parse_args_summarize_with_options():
         assert args.use_llm is False
 
 
+def test_parse_args_column_selection():
+    """Test parsing column selection options."""
+    with patch.object(sys, 'argv', [
+        'csvdiffgpt', 'validate', 'test.csv',
+        '--columns', 'id', 'price_.*',
+        '--exclude-columns', 'price_old'
+    ]):
+        args = parse_args()
+        assert args.columns == ['id', 'price_.*']
+        assert args.exclude_columns == ['price_old']
+
+
 def test_parse_args_compare():
     """Test parsing compare command arguments."""
     with patch.object(sys, 'argv', ['csvdiffgpt', 'compare', 'file1.csv', 'file2.csv']):
@@ -54,7 +66,8 @@ def test_parse_args_compare_with_options():
         '--provider', 'openai',
         '--api-key', 'test-key',
         '--sep1', ';',
-        '--no-llm'
+        '--no-llm',
+        '--key', 'id', 'date'
     ]):
         args = parse_args()
         assert args.command == 'compare'
@@ -65,6 +78,7 @@ def test_parse_args_compare_with_options():
         assert args.api_key == 'test-key'
         assert args.sep1 == ';'
         assert args.use_llm is False
+        assert args.key_columns == ['id', 'date']
 
 
 @patch('csvdiffgpt.cli.summarize')
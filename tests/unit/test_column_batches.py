@@ -0,0 +1,102 @@
+"""Tests for the batched column statistics of wide mode."""
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt.core.column_batches import (
+    profile_columns, string_length_stats, numeric_outlier_stats, distinct_counts, column_fingerprints
+)
+from csvdiffgpt.core.column_profile import ColumnProfile
+from csvdiffgpt.core.preprocessor import CSVPreprocessor, _numeric_column_stats
+from csvdiffgpt.tasks.validate import validate_dataframe
+
+
+def _wide_frame():
+    """Build a small table mixing every kind of column."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, 200)
+    values[[3, 17]] = [500, -400]
+    return pd.DataFrame({
+        "ints": rng.integers(0, 5, 200),
+        "floats": np.where(rng.random(200) < 0.1, np.nan, values),
+        "codes": rng.choice(["a", "bb", "cccccc", None], 200),
+        "text": rng.choice(["x", "a much longer value", "mid size"], 200),
+        "category": pd.Categorical(rng.choice(["low", "high"], 200)),
+        "flags": rng.random(200) < 0.5,
+        "nullable": pd.array(rng.integers(0, 3, 200), dtype="Int64"),
+        "when": pd.date_range("2024-01-01", periods=200, freq="h")
+    })
+
+
+def test_profile_columns_matches_column_profiles():
+    """Test that batched metadata matches the metadata of each column."""
+    df = _wide_frame()
+    profiles = profile_columns(df, _numeric_column_stats(df), random_state=42)
+
+    assert list(profiles) == list(df.columns)
+    for col in df.columns:
+        expected = ColumnProfile(df[col], _numeric_column_stats(df).get(col)).to_dict()
+        actual = profiles[col]
+        assert list(actual) == list(expected)
+        examples = actual.pop("examples")
+        expected.pop("examples")
+        assert actual == expected
+        assert len(examples) == min(5, expected["unique_count"])
+        assert all(example in set(df[col].dropna()) for example in examples)
+
+    # Approximate distinct counts stay close to the exact ones
+    approx = distinct_counts(df, list(df.columns), distinct_error=0.01)
+    exact = distinct_counts(df, list(df.columns))
+    for col in df.columns:
+        assert exact[col] == df[col].nunique()
+        assert abs(approx[col] - exact[col]) <= max(1, exact[col] * 0.05)
+
+
+def test_batched_validation_stats(tmp_path):
+    """Test batched outlier and string length statistics against pandas."""
+    df = _wide_frame()
+
+    outliers = numeric_outlier_stats(df, ["ints", "floats"], 3.0)
+    floats = df["floats"]
+    z_scores = np.abs((floats - floats.mean()) / floats.std())
+    assert outliers["floats"]["outliers"] == int((z_scores > 3.0).sum()) == 2
+    assert np.isclose(outliers["floats"]["std"], floats.std())
+    assert outliers["ints"]["outliers"] == 0
+
+    lengths = string_length_stats(df, ["codes", "text", "category"], as_str=True)
+    text_lengths = df["text"].str.len()
+    assert lengths["text"]["min_length"] == 1
+    assert lengths["text"]["max_length"] == 19
+    assert np.isclose(lengths["text"]["std_length"], text_lengths.std())
+    assert lengths["codes"]["nulls"] == int(df["codes"].isna().sum())
+    assert lengths["category"]["count"] == 200
+
+    # Both modes report the same issues
+    file_path = tmp_path / "wide.csv"
+    df.to_csv(file_path, index=False)
+    preprocessor = CSVPreprocessor(str(file_path), wide_mode=True)
+    metadata = preprocessor.analyze()
+    batched = validate_dataframe(preprocessor.df, metadata, wide_mode=True)
+    assert batched == validate_dataframe(preprocessor.df, metadata)
+    assert batched["issues"]["outliers"][0]["column"] == "floats"
+
+    # Columns printing the same values share a fingerprint
+    df["copy"] = df["text"].astype("category")
+    fingerprints = column_fingerprints(df)
+    assert fingerprints["copy"] == fingerprints["text"]
+    assert fingerprints["codes"] != fingerprints["text"]
+
+
+def test_batched_stats_keep_large_integers_exact():
+    """Test that integer IDs above 2**53 are counted and fingerprinted exactly."""
+    ids = np.arange(2 ** 62, 2 ** 62 + 1000, dtype=np.int64)
+    df = pd.DataFrame({"id": ids, "other_id": ids + 1, "score": np.arange(1000.0)})
+    # As floats the IDs collapse into a handful of values
+    assert df["id"].astype(float).nunique() < 5
+
+    assert distinct_counts(df, list(df.columns)) == {"id": 1000, "other_id": 1000, "score": 1000}
+    approx = distinct_counts(df, list(df.columns), distinct_error=0.01)
+    assert abs(approx["id"] - 1000) <= 50
+    assert abs(approx["other_id"] - 1000) <= 50
+
+    fingerprints = column_fingerprints(df)
+    assert fingerprints["id"] != fingerprints["other_id"]
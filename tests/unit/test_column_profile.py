@@ -0,0 +1,73 @@
+"""Tests for lazily computed column profiles."""
+import json
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from csvdiffgpt.core.column_profile import ColumnProfile
+from csvdiffgpt.core.preprocessor import CSVPreprocessor, _analyze_column
+
+
+def test_column_profile_computes_groups_on_access():
+    """Test that only the groups of the fields read are computed."""
+    profile = ColumnProfile(pd.Series(["a", "bb", None, "a"]))
+    
+    assert profile["nulls"] == 1
+    assert list(profile.computed) == ["basic"]
+    
+    assert "min" not in profile
+    assert profile["max_length"] == 2
+    assert list(profile.computed) == ["basic", "stats"]
+    
+    profile["unique_count"] = 10
+    assert profile["unique_count"] == 10
+    assert "examples" not in profile.computed
+
+
+def test_column_profile_matches_eager_metadata():
+    """Test that a fully computed profile has the same fields and order as eager analysis."""
+    for values in [pd.Series([1.5, None, 3.0, 3.0]), pd.Series(["x", "yy", None]), pd.Series([1, 2, 3])]:
+        profile = ColumnProfile(values).to_dict()
+        eager = _analyze_column(values)
+        
+        assert list(profile) == list(eager)
+        profile.pop("examples")
+        eager.pop("examples")
+        assert profile == eager
+
+
+def test_column_profile_concurrent_reads():
+    """Test that threads reading a profile while it is computed see complete fields."""
+    values = pd.Series(["a", "bb", None, "a", "ccc"] * 200)
+    expected = ColumnProfile(values).to_dict()
+    expected.pop("examples")
+    
+    for _ in range(20):
+        profile = ColumnProfile(values)
+        barrier = threading.Barrier(4)
+        
+        def read(i):
+            barrier.wait()
+            if i % 2:
+                return {key: value for key, value in profile.items() if key != "examples"}
+            return {key: profile[key] for key in expected}
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(read, range(4)))
+        assert all(result == expected for result in results)
+
+
+def test_preprocessor_metadata_serializes(simple_csv_path):
+    """Test that lazy metadata serializes to JSON and pickles to plain dictionaries."""
+    metadata = CSVPreprocessor(simple_csv_path).analyze()
+    assert isinstance(metadata["columns"]["age"], ColumnProfile)
+    
+    serialized = json.loads(json.dumps(metadata, default=str))
+    assert serialized["columns"]["age"]["mean"] == metadata["columns"]["age"]["mean"]
+    assert set(serialized["columns"]["name"]) == set(metadata["columns"]["name"])
+    
+    restored = pickle.loads(pickle.dumps(metadata))
+    assert type(restored["columns"]["age"]) is dict
+    assert restored["columns"]["age"] == metadata["columns"]["age"]
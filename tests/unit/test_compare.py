@@ -109,4 +109,196 @@ def test_find_diff_stats():
     
     # Check for specific change count
     assert diff_stats['value_changes']['A']['diff_count'] == 1  # One value changed
-    assert diff_stats['value_changes']['A']['diff_percentage'] == 25.0  # 1 out of 4 values
\ No newline at end of file
+    assert diff_stats['value_changes']['A']['diff_percentage'] == 25.0  # 1 out of 4 values
+
+def test_find_diff_stats_compact_dtypes():
+    """Test that compact integer dtypes neither overflow nor count as type changes."""
+    from csvdiffgpt.tasks.compare import find_diff_stats
+    import pandas as pd
+    import numpy as np
+    
+    df1 = pd.DataFrame({"a": np.array([-100, 0], dtype=np.int8)})
+    df2 = pd.DataFrame({"a": np.array([100, 0], dtype=np.int16)})
+    
+    diff_stats = find_diff_stats(df1, df2, {"a": "int64"}, {"a": "int64"})
+    
+    assert diff_stats["type_changes"] == {}
+    assert diff_stats["value_changes"]["a"]["max_abs_diff"] == 200.0
+
+def test_compare_raw_keyed(simple_csv_path, modified_csv_path):
+    """Test that rows are matched on their key instead of their position."""
+    comparison = compare_raw(simple_csv_path, modified_csv_path, key_columns="auto")
+    row_diff = comparison['comparison']['row_diff']
+    
+    assert row_diff['key_columns'] == ['id']
+    assert (row_diff['rows_added'], row_diff['rows_removed'], row_diff['rows_changed']) == (1, 1, 2)
+    assert row_diff['added_rows'] == [{'id': 6}]
+    assert row_diff['removed_rows'] == [{'id': 4}]
+    assert row_diff['column_changes'] == {'age': 1, 'score': 1}
+    assert row_diff['changed_rows'][0] == {'key': {'id': 1}, 'changes': {'age': {'file1': 28, 'file2': 29}}}
+    
+    # The removed row no longer shifts the values of later rows
+    assert comparison['comparison']['value_changes']['score']['diff_count'] == 1
+    assert compare_raw(simple_csv_path, modified_csv_path, key_columns=['id'])['comparison']['row_diff'] == row_diff
+    
+    # Without a key, rows are compared by position
+    assert 'row_diff' not in compare_raw(simple_csv_path, modified_csv_path)['comparison']
+
+
+def test_find_diff_stats_keyed():
+    """Test keyed diffs with multi-column, missing and repeated keys."""
+    from csvdiffgpt.tasks.compare import find_diff_stats
+    import pandas as pd
+    import numpy as np
+    
+    df1 = pd.DataFrame({"region": ["eu", "eu", "us", None], "year": [2023, 2024, 2024, 2024], "sales": [1.0, 2.0, np.nan, 4.0]})
+    df2 = pd.DataFrame({"region": [None, "us", "eu"], "year": [2024, 2024, 2024], "sales": [5.0, np.nan, 2.0]})
+    
+    row_diff = find_diff_stats(df1, df2, key_columns=["region", "year"])["row_diff"]
+    assert row_diff["removed_rows"] == [{"region": "eu", "year": 2023}]
+    assert row_diff["rows_matched"] == 3
+    assert row_diff["changed_rows"] == [{"key": {"region": None, "year": 2024}, "changes": {"sales": {"file1": 4.0, "file2": 5.0}}}]
+    
+    with pytest.raises(ValueError, match="uniquely"):
+        find_diff_stats(df1, df2, key_columns="year")
+    with pytest.raises(ValueError, match="not found"):
+        find_diff_stats(df1, df2, key_columns="missing")
+    
+    # No column qualifies as a key
+    assert find_diff_stats(df1, df2, key_columns="auto")["row_diff"]["key_columns"] is None
+
+
+def test_out_of_core_keyed_diff(tmp_path):
+    """Test that the partitioned diff of whole files matches the in-memory diff."""
+    from csvdiffgpt.core.diff import external_keyed_diff, keyed_diff
+    import pandas as pd
+    import numpy as np
+    
+    rng = np.random.default_rng(0)
+    df1 = pd.DataFrame({
+        "id": rng.permutation(500),
+        "group": rng.choice(["a", "b", None], 500),
+        "value": rng.normal(size=500)
+    })
+    df2 = df1.sample(frac=0.9, random_state=1)
+    df2.loc[df2.index[:40], "value"] += 1
+    df2.loc[df2.index[30:50], "group"] = "c"
+    df2 = pd.concat([df2, pd.DataFrame({"id": [1000, 1001], "group": ["a", "b"], "value": [0.0, 1.0]})])
+    df2 = df2.reset_index(drop=True)
+    
+    expected = keyed_diff(df1, df2, ["id", "group"], max_rows=5)
+    chunks1 = (df1.iloc[start:start + 64] for start in range(0, len(df1), 64))
+    chunks2 = (df2.iloc[start:start + 100] for start in range(0, len(df2), 100))
+    actual = external_keyed_diff(chunks1, chunks2, ["id", "group"], n_partitions=7, spill_dir=str(tmp_path), max_rows=5)
+    assert actual == expected
+    assert list(tmp_path.iterdir()) == []
+    
+    # compare_raw diffs every row, not only the analyzed ones
+    df1.to_csv(tmp_path / "file1.csv", index=False)
+    df2.to_csv(tmp_path / "file2.csv", index=False)
+    comparison = compare_raw(
+        str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"),
+        max_rows_analyzed=100, key_columns="id", out_of_core=True
+    )
+    row_diff = comparison['comparison']['row_diff']
+    assert (row_diff['rows_matched'], row_diff['rows_removed'], row_diff['rows_added']) == (450, 50, 2)
+    
+    with pytest.raises(ValueError, match="key_columns"):
+        compare_raw(str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"), out_of_core=True)
+
+
+
+def test_keyed_diff_of_sampled_files(tmp_path):
+    """Test that files with more rows than analyzed are diffed over all their rows."""
+    import pandas as pd
+    import numpy as np
+    
+    df = pd.DataFrame({"id": np.arange(400), "value": np.arange(400) * 2})
+    df.to_csv(tmp_path / "file1.csv", index=False)
+    df.sample(frac=1, random_state=0).to_csv(tmp_path / "file2.csv", index=False)
+    
+    comparison = compare_raw(
+        str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"), max_rows_analyzed=100, key_columns=["id"]
+    )
+    row_diff = comparison["comparison"]["row_diff"]
+    assert (row_diff["rows_matched"], row_diff["rows_added"], row_diff["rows_removed"]) == (400, 0, 0)
+    
+    comparison = compare_raw(
+        str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"), max_rows_analyzed=100, keyless=True
+    )
+    fingerprints = comparison["comparison"]["row_fingerprints"]
+    assert (fingerprints["rows_unchanged"], fingerprints["rows_added"], fingerprints["rows_removed"]) == (400, 0, 0)
+
+
+def test_out_of_core_keys_with_changing_chunk_dtypes(tmp_path):
+    """Test that keys read as numbers in some chunks and as strings in others still match."""
+    from csvdiffgpt.core.diff import keyed_diff
+    from csvdiffgpt.core.preprocessor import CSVPreprocessor
+    from csvdiffgpt.core.probe import FileProbe
+    from csvdiffgpt.tasks.compare import find_diff_stats, _out_of_core_row_diff
+    import pandas as pd
+    
+    df1 = pd.DataFrame({"id": [str(i) for i in range(10)] + ["X1"], "value": range(11)})
+    df2 = pd.concat([df1.iloc[10:], df1.iloc[:10]])
+    df1.to_csv(tmp_path / "file1.csv", index=False)
+    df2.to_csv(tmp_path / "file2.csv", index=False)
+    files = [str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv")]
+    preprocessors = [CSVPreprocessor(file, chunk_size=5) for file in files]
+    for preprocessor in preprocessors:
+        preprocessor.load_data()
+    
+    # Only the key is resolved when the entire files are diffed
+    diff_stats = find_diff_stats(preprocessors[0].df, preprocessors[1].df, key_columns="id", diff_rows=False)
+    assert diff_stats["row_diff"] == {"key_columns": ["id"]}
+    
+    _out_of_core_row_diff(preprocessors[0], preprocessors[1], [FileProbe(file) for file in files], diff_stats)
+    expected = keyed_diff(pd.read_csv(files[0]), pd.read_csv(files[1]), "id")
+    row_diff = diff_stats["row_diff"]
+    assert (row_diff["rows_matched"], row_diff["rows_added"], row_diff["rows_removed"]) == (11, 0, 0)
+    assert row_diff == expected
+
+
+def test_keyless_fingerprint_diff(tmp_path):
+    """Test that rows are compared as multisets regardless of their order."""
+    from csvdiffgpt.core.diff import fingerprint_diff, external_fingerprint_diff
+    import pandas as pd
+    import numpy as np
+    
+    df1 = pd.DataFrame({"x": [1, 2, 2, 3, None], "y": ["a", "b", "b", "c", None]})
+    # Re-sorted, with reordered columns and integers read as floats
+    df2 = pd.DataFrame({"y": ["c", "b", None, "d"], "x": [3.0, 2.0, np.nan, 4.0]})
+    
+    diff = fingerprint_diff(df1, df2)
+    assert diff["columns"] == ["x", "y"]
+    assert (diff["rows_unchanged"], diff["rows_added"], diff["rows_removed"]) == (3, 1, 2)
+    assert diff["added_rows"] == [{"x": 4.0, "y": "d"}]
+    # The second copy of a repeated row has no counterpart
+    assert diff["removed_rows"] == [{"x": 1.0, "y": "a"}, {"x": 2.0, "y": "b"}]
+    
+    # Integers beyond the precision of floats are compared exactly
+    ids1 = pd.DataFrame({"id": [1234567890123456789, 7]})
+    ids2 = pd.DataFrame({"id": [1234567890123456788, 7]})
+    large = fingerprint_diff(ids1, ids2)
+    assert (large["rows_unchanged"], large["rows_added"], large["rows_removed"]) == (1, 1, 1)
+    assert fingerprint_diff(ids1, ids1.astype("Int64"))["rows_unchanged"] == 2
+    
+    chunks1 = [df1.iloc[:2], df1.iloc[2:]]
+    external = external_fingerprint_diff(chunks1, [df2], n_partitions=3, spill_dir=str(tmp_path))
+    # Missing values are NaN, which never compares equal
+    assert external.pop("unchanged_rows")[:2] == diff.pop("unchanged_rows")[:2]
+    assert external == diff
+    
+    # compare_raw counts rows over the whole files out of core
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 50, 400), "b": rng.choice(["u", "v"], 400)})
+    df.to_csv(tmp_path / "file1.csv", index=False)
+    df.iloc[10:].sample(frac=1, random_state=0).to_csv(tmp_path / "file2.csv", index=False)
+    comparison = compare_raw(
+        str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"),
+        max_rows_analyzed=100, keyless=True, out_of_core=True
+    )
+    fingerprints = comparison["comparison"]["row_fingerprints"]
+    assert (fingerprints["rows_unchanged"], fingerprints["rows_added"], fingerprints["rows_removed"]) == (390, 0, 10)
+    
+    with pytest.raises(ValueError, match="keyless"):
+        compare_raw(str(tmp_path / "file1.csv"), str(tmp_path / "file2.csv"), keyless=True, key_columns="a")
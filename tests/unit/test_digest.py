@@ -0,0 +1,102 @@
+"""Tests for order-independent dataset digests."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt import compare_raw
+from csvdiffgpt.core.digest import dataset_digest, compare_digests, digest_path_for
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+
+
+def _frame():
+    """Build a small table with numbers, strings and missing values."""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(100),
+        "name": rng.choice(["a", "b", None], 100),
+        "score": rng.normal(size=100)
+    })
+
+
+def test_dataset_digest_ignores_order():
+    """Test that row order, column order and chunking do not change the digest."""
+    df = _frame()
+    digest = dataset_digest([df])
+
+    shuffled = df.sample(frac=1, random_state=1)[["score", "id", "name"]]
+    chunks = [shuffled.iloc[:30], shuffled.iloc[30:]]
+    comparison = compare_digests(digest, dataset_digest(chunks))
+    assert comparison["identical"]
+    assert comparison["rows"] == {"file1": 100, "file2": 100}
+
+    # A changed value is reported by its column
+    changed = df.copy()
+    changed.loc[5, "score"] += 1
+    comparison = compare_digests(digest, dataset_digest([changed]))
+    assert not comparison["identical"]
+    assert comparison["changed_columns"] == ["score"]
+
+    # Swapping values between rows keeps the column digests but not the row digest
+    swapped = df.copy()
+    swapped.loc[[0, 1], "score"] = swapped.loc[[1, 0], "score"].to_numpy()
+    comparison = compare_digests(digest, dataset_digest([swapped]))
+    assert not comparison["identical"]
+    assert comparison["changed_columns"] == []
+
+    comparison = compare_digests(digest, dataset_digest([df.drop(columns="name")]))
+    assert comparison["only_in_file1"] == ["name"]
+    assert not comparison["identical"]
+
+
+def test_compare_raw_digest(tmp_path):
+    """Test that compare_raw stops early when the digests of the files match."""
+    df = _frame()
+    file1 = str(tmp_path / "file1.csv")
+    file2 = str(tmp_path / "file2.csv")
+    df.to_csv(file1, index=False)
+    df.iloc[::-1].to_csv(file2, index=False)
+
+    result = compare_raw(file1, file2, use_digest=True)
+    assert result["comparison"] == {"digest": compare_digests(dataset_digest([df]), dataset_digest([df]))}
+    assert result["file1"]["row_count"] == 100
+    assert os.path.exists(digest_path_for(file1))
+
+    # The saved digest is reused while the file is unchanged
+    preprocessor = CSVPreprocessor(file1)
+    with open(digest_path_for(file1), "r+", encoding="utf-8") as f:
+        saved = f.read()
+        f.seek(0)
+        f.write(saved.replace('"rows": 100', '"rows": 101'))
+        f.truncate()
+    assert preprocessor.digest()["rows"] == 101
+
+    # Different files get the full comparison with the changed columns
+    df.loc[3, "name"] = "changed"
+    df.to_csv(file2, index=False)
+    result = compare_raw(file1, file2, use_digest=True)
+    assert result["comparison"]["digest"]["changed_columns"] == ["name"]
+    assert "structural_changes" in result["comparison"]
+
+
+def test_digest_hashes_numbers_exactly(tmp_path):
+    """Test that large integers differ and integers read as floats match."""
+    file1 = str(tmp_path / "file1.csv")
+    file2 = str(tmp_path / "file2.csv")
+    pd.DataFrame({"id": [1234567890123456789, 7]}).to_csv(file1, index=False)
+    pd.DataFrame({"id": [1234567890123456788, 7]}).to_csv(file2, index=False)
+
+    result = compare_raw(file1, file2, use_digest=True)
+    assert not result["comparison"]["digest"]["identical"]
+    assert result["comparison"]["digest"]["changed_columns"] == ["id"]
+
+    # The same values as integers and as floats (next to a missing value)
+    ints = pd.DataFrame({"value": [1, 2, 3], "other": [0.5, 1.5, 2.5]})
+    floats = pd.DataFrame({"value": [1.0, 2.0, 3.0, np.nan], "other": [0.5, 1.5, 2.5, 3.5]})
+    assert compare_digests(dataset_digest([ints]), dataset_digest([floats.iloc[:3]]))["identical"]
+    assert not compare_digests(dataset_digest([ints]), dataset_digest([floats]))["identical"]
+    # Floats without an integer value do not collide with integers
+    assert not compare_digests(
+        dataset_digest([pd.DataFrame({"v": [0.5]})]),
+        dataset_digest([pd.DataFrame({"v": [int(np.float64(0.5).view(np.int64))]})])
+    )["identical"]
@@ -0,0 +1,132 @@
+"""Tests for the task graph executor."""
+import threading
+import pytest
+import pandas as pd
+
+from csvdiffgpt.executor import TaskGraph, build_analysis_graph, build_compare_graph
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt.core.column_profile import ColumnProfile, GROUP_FIELDS
+from csvdiffgpt import clean_raw, generate_tests_raw, restructure_raw, validate_raw, compare_raw
+
+
+def test_task_graph_memoizes_nodes():
+    """Test that each node is computed once and receives its dependencies."""
+    calls = []
+    graph = TaskGraph()
+    graph.add("a", lambda: calls.append("a") or 1)
+    graph.add("b", lambda a: calls.append("b") or a + 1, ["a"])
+    graph.add("c", lambda a, b: calls.append("c") or a + b, ["a", "b"])
+
+    assert graph.run(["c"]) == {"c": 3}
+    assert graph.get("b") == 2
+    assert calls == ["a", "b", "c"]
+
+
+def test_task_graph_runs_independent_nodes_concurrently():
+    """Test that nodes without dependencies between them run at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+    graph = TaskGraph(max_workers=2)
+    graph.add("left", lambda: barrier.wait() is not None)
+    graph.add("right", lambda: barrier.wait() is not None)
+
+    # Would time out if the nodes ran one after the other
+    assert graph.run() == {"left": True, "right": True}
+
+
+def test_task_graph_errors():
+    """Test unknown nodes, cycles and failing nodes."""
+    graph = TaskGraph()
+    graph.add("a", lambda b: b, ["b"])
+    graph.add("b", lambda a: a, ["a"])
+    graph.add("fail", lambda: 1 / 0)
+
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: 1)
+    with pytest.raises(ValueError):
+        graph.run(["missing"])
+    with pytest.raises(ValueError, match="cycle"):
+        graph.run(["a"])
+    with pytest.raises(ZeroDivisionError):
+        graph.run(["fail"])
+
+
+def test_analysis_graph_parses_once(temp_csv_file, monkeypatch):
+    """Test that all stages share a single load of the file."""
+    loads = []
+    original_load = CSVPreprocessor.load_data
+
+    def counting_load(self):
+        loads.append(self.file_path)
+        return original_load(self)
+
+    monkeypatch.setattr(CSVPreprocessor, "load_data", counting_load)
+
+    graph = build_analysis_graph(temp_csv_file)
+    results = graph.run(["cleaning", "tests", "restructure"])
+
+    assert len(loads) == 1
+    assert isinstance(results["cleaning"], list)
+    assert isinstance(results["tests"], list)
+    assert isinstance(results["restructure"], list)
+
+
+def test_analysis_graph_stages_share_inputs_read_only(temp_csv_file):
+    """Test that concurrent stages match a serial run and leave their shared inputs unchanged."""
+    groups = ["cleaning", "tests", "restructure"]
+    serial = build_analysis_graph(temp_csv_file, max_workers=1).run(groups)
+
+    graph = build_analysis_graph(temp_csv_file, max_workers=8)
+    metadata = graph.get("metadata")
+    # Lazy column profiles are complete before any stage reads them
+    for col_meta in metadata["columns"].values():
+        assert isinstance(col_meta, ColumnProfile)
+        assert set(col_meta.computed) == set(GROUP_FIELDS)
+    metadata_before = {col: col_meta.to_dict() for col, col_meta in metadata["columns"].items()}
+    data_before = graph.get("data").copy()
+
+    for _ in range(3):
+        concurrent = build_analysis_graph(temp_csv_file, max_workers=8).run(groups)
+        assert concurrent == serial
+
+    assert graph.run(groups) == serial
+    pd.testing.assert_frame_equal(graph.get("data"), data_before)
+    assert {col: col_meta.to_dict() for col, col_meta in metadata["columns"].items()} == metadata_before
+
+
+def test_graph_tasks_match_validate(simple_csv_path):
+    """Test that graph-based tasks see the same validation results as validate_raw."""
+    validation_results = validate_raw(simple_csv_path)
+
+    assert clean_raw(simple_csv_path)["issues_summary"] == validation_results["summary"]
+    assert restructure_raw(simple_csv_path)["file_info"] == validation_results["file_info"]
+
+
+def test_graph_tasks_with_pyarrow_engine(temp_csv_file):
+    """Test that the composite tasks run on Arrow-backed string columns."""
+    pytest.importorskip("pyarrow")
+
+    assert clean_raw(temp_csv_file, engine="pyarrow")["file_info"]["total_rows"] > 0
+    assert generate_tests_raw(temp_csv_file, engine="pyarrow")["test_count"] > 0
+    assert restructure_raw(temp_csv_file, engine="pyarrow")["output_code"]
+
+
+def test_compare_graph_analyzes_files_concurrently(simple_csv_path, modified_csv_path, monkeypatch):
+    """Test that both files of a comparison are analyzed at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+    original_analyze = CSVPreprocessor.analyze
+
+    def waiting_analyze(self):
+        barrier.wait()
+        return original_analyze(self)
+
+    monkeypatch.setattr(CSVPreprocessor, "analyze", waiting_analyze)
+
+    # Would time out if the files were analyzed one after the other
+    graph = build_compare_graph(simple_csv_path, modified_csv_path)
+    results = graph.run(["metadata1", "metadata2"])
+    assert results["metadata1"]["file_path"] == simple_csv_path
+    assert results["metadata2"]["file_path"] == modified_csv_path
+
+    comparison = compare_raw(simple_csv_path, modified_csv_path)
+    assert comparison["file1"]["path"] == simple_csv_path
+    assert comparison["file2"]["path"] == modified_csv_path
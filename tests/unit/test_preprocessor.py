@@ -1,9 +1,10 @@
 """Tests for CSV preprocessor."""
 import os
 import pytest
+import numpy as np
 import pandas as pd
 
-from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt.core.preprocessor import CSVPreprocessor, _numeric_column_stats
 
 
 def test_preprocessor_init(simple_csv_path):
@@ -63,6 +64,24 @@ def test_preprocessor_column_limit(simple_csv_path):
     assert len(preprocessor.df.columns) == 2
 
 
+def test_preprocessor_column_selection(simple_csv_path):
+    """Test selecting columns by name or regular expression."""
+    preprocessor = CSVPreprocessor(simple_csv_path, columns=["score", "n.*"])
+    metadata = preprocessor.analyze()
+    
+    # Columns keep their file order and only selected columns are parsed
+    assert list(preprocessor.df.columns) == ['name', 'score']
+    assert list(metadata['columns'].keys()) == ['name', 'score']
+    assert metadata['total_rows'] == 5
+    
+    preprocessor = CSVPreprocessor(simple_csv_path, exclude_columns="id|age", max_cols_analyzed=1)
+    preprocessor.load_data()
+    assert list(preprocessor.df.columns) == ['name']
+    
+    with pytest.raises(ValueError, match="Columns not found"):
+        CSVPreprocessor(simple_csv_path, columns=["missing"]).load_data()
+
+
 def test_preprocessor_row_limit(simple_csv_path):
     """Test row limit functionality."""
     # Limit to first 3 rows
@@ -84,4 +103,183 @@ def test_preprocessor_to_json(simple_csv_path):
     assert 'columns' in json_str
     # The path will be escaped in JSON, so we can't do a direct match
     # Instead, check if the filename is present
-    assert 'simple.csv' in json_str
\ No newline at end of file
+    assert 'simple.csv' in json_str
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_preprocessor_parallel_columns(simple_csv_path, backend):
+    """Test that parallel column analysis matches sequential analysis."""
+    sequential = CSVPreprocessor(simple_csv_path).analyze()
+    parallel = CSVPreprocessor(simple_csv_path, n_workers=2, parallel_backend=backend).analyze()
+    
+    assert list(parallel["columns"]) == list(sequential["columns"])
+    for col, col_meta in sequential["columns"].items():
+        # Examples are sampled randomly, everything else must match
+        expected = {k: v for k, v in col_meta.items() if k != "examples"}
+        actual = {k: v for k, v in parallel["columns"][col].items() if k != "examples"}
+        assert actual == expected
+
+
+def test_preprocessor_invalid_parallel_backend(simple_csv_path):
+    """Test that an unknown parallel backend is rejected."""
+    with pytest.raises(ValueError):
+        CSVPreprocessor(simple_csv_path, parallel_backend="gpu")
+
+
+@pytest.mark.filterwarnings("ignore:Mean of empty slice")
+def test_numeric_column_stats_match_pandas():
+    """Test that the batched numeric statistics match per-column pandas results."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "ints": rng.integers(-100, 100, size=50),
+        "floats": rng.normal(size=50),
+        "with_nans": np.where(rng.random(50) < 0.3, np.nan, rng.normal(size=50)),
+        "all_nan": np.full(50, np.nan),
+        "text": ["x"] * 50
+    })
+    
+    stats = _numeric_column_stats(df, batch_bytes=1)
+    
+    assert set(stats) == {"ints", "floats", "with_nans", "all_nan"}
+    for col in stats:
+        col_data = df[col]
+        assert stats[col]["nulls"] == int(col_data.isna().sum())
+        assert stats[col]["min"] == (None if pd.isna(col_data.min()) else col_data.min())
+        assert stats[col]["max"] == (None if pd.isna(col_data.max()) else col_data.max())
+        for stat in ["mean", "median", "std"]:
+            value = getattr(col_data, stat)()
+            assert stats[col][stat] == (None if pd.isna(value) else round(float(value), 2))
+    
+    # Integer min/max keep their integer type
+    assert isinstance(stats["ints"]["min"], np.integer)
+
+
+def test_preprocessor_pyarrow_engine(simple_csv_path):
+    """Test that the pyarrow engine produces the same metadata with Arrow-backed strings."""
+    pytest.importorskip("pyarrow")
+    default = CSVPreprocessor(simple_csv_path).analyze()
+    preprocessor = CSVPreprocessor(simple_csv_path, engine="pyarrow")
+    metadata = preprocessor.analyze()
+    
+    assert metadata["total_rows"] == default["total_rows"]
+    assert list(metadata["columns"]) == list(default["columns"])
+    for col, col_meta in default["columns"].items():
+        arrow_meta = metadata["columns"][col]
+        if col_meta["type"] == "object":
+            assert arrow_meta["type"] == "string"
+            assert str(preprocessor.df[col].dtype.storage) == "pyarrow"
+        else:
+            assert arrow_meta["type"] == col_meta["type"]
+        for key in ["nulls", "unique_count", "min", "max", "mean", "min_length", "max_length", "avg_length"]:
+            assert arrow_meta.get(key) == col_meta.get(key)
+
+
+def test_preprocessor_pyarrow_engine_null_strings(temp_csv_dir):
+    """Test that empty and NA cells of string columns are nulls with either engine."""
+    pytest.importorskip("pyarrow")
+    file_path = os.path.join(temp_csv_dir, "null_strings.csv")
+    with open(file_path, "w") as f:
+        f.write('id,name,score\n1,alice,1.5\n2,,NA\n3,NA,2.5\n4,bob,\n5,"",null\n6,alice,3.0\n')
+    
+    default = CSVPreprocessor(file_path).analyze()
+    arrow = CSVPreprocessor(file_path, engine="pyarrow").analyze()
+    
+    assert default["columns"]["name"]["nulls"] == 3
+    for col in ["name", "score"]:
+        for key in ["nulls", "null_percentage", "unique_count"]:
+            assert arrow["columns"][col][key] == default["columns"][col][key]
+
+
+def test_preprocessor_invalid_engine(simple_csv_path):
+    """Test that an unknown engine is rejected."""
+    with pytest.raises(ValueError):
+        CSVPreprocessor(simple_csv_path, engine="fast")
+
+
+def test_preprocessor_random_block_sampling(temp_csv_dir):
+    """Test that random block sampling covers the whole file and is reproducible."""
+    file_path = os.path.join(temp_csv_dir, "ordered.csv")
+    with open(file_path, "w") as f:
+        f.write("id,label\n")
+        for i in range(20000):
+            f.write(f"{i},row{i}\n")
+    
+    preprocessor = CSVPreprocessor(file_path, max_rows_analyzed=500, sampling="random", random_state=7)
+    sample = preprocessor._read_random_blocks()
+    
+    assert len(sample) == 500
+    assert list(sample.columns) == ["id", "label"]
+    # Every row was read whole and the sample reaches the end of the file
+    assert (sample["label"] == "row" + sample["id"].astype(str)).all()
+    assert sample["id"].is_monotonic_increasing
+    assert sample["id"].max() > 15000
+    
+    again = CSVPreprocessor(file_path, max_rows_analyzed=500, sampling="random", random_state=7)
+    assert again._read_random_blocks()["id"].tolist() == sample["id"].tolist()
+
+
+def test_preprocessor_random_sampling_small_file(temp_csv_dir):
+    """Test random row sampling for files that are loaded completely."""
+    file_path = os.path.join(temp_csv_dir, "small.csv")
+    with open(file_path, "w") as f:
+        f.write("id\n")
+        for i in range(1000):
+            f.write(f"{i}\n")
+    
+    preprocessor = CSVPreprocessor(file_path, max_rows_analyzed=100, sampling="random", random_state=1)
+    preprocessor.load_data()
+    
+    assert len(preprocessor.df) == 100
+    assert preprocessor.df["id"].max() > 100
+    assert preprocessor.row_count == 1000
+    
+    with pytest.raises(ValueError):
+        CSVPreprocessor(file_path, sampling="tail")
+
+
+def test_preprocessor_optimize_dtypes(temp_csv_dir):
+    """Test that compact dtypes save memory without changing the metadata."""
+    file_path = os.path.join(temp_csv_dir, "compact.csv")
+    with open(file_path, "w") as f:
+        f.write("id,status,score,ratio\n")
+        for i in range(5000):
+            f.write(f"{i},{['open', 'closed', 'pending'][i % 3]},{i % 100},{i % 4 * 0.5}\n")
+    
+    default = CSVPreprocessor(file_path).analyze()
+    preprocessor = CSVPreprocessor(file_path, optimize_dtypes=True)
+    optimized = preprocessor.analyze()
+    
+    assert str(preprocessor.df["status"].dtype) == "category"
+    assert preprocessor.df["score"].dtype == np.int8
+    assert preprocessor.df["ratio"].dtype == np.float32
+    assert optimized["memory_optimization"]["bytes_saved"] > 0
+    for col, col_meta in default["columns"].items():
+        for key, value in col_meta.items():
+            if key != "examples":
+                assert optimized["columns"][col][key] == value, (col, key)
+
+
+def test_preprocessor_compressed_file(temp_csv_dir):
+    """Test that compressed files are analyzed without decompressing them to disk."""
+    import gzip
+    
+    file_path = os.path.join(temp_csv_dir, "data.csv.gz")
+    with gzip.open(file_path, "wt") as f:
+        f.write("id,label\n")
+        for i in range(2000):
+            f.write(f"{i},row{i % 10}\n")
+    
+    head = CSVPreprocessor(file_path, max_rows_analyzed=100).analyze()
+    assert head["compression"] == "gzip"
+    assert head["total_rows"] == 2000
+    assert head["analyzed_rows"] == 100
+    assert head["columns"]["id"]["max"] == 99
+    
+    preprocessor = CSVPreprocessor(file_path, max_rows_analyzed=100, sampling="random", random_state=3, chunk_size=300)
+    sample = preprocessor.analyze()
+    assert sample["total_rows"] == 2000
+    assert len(preprocessor.df) == 100
+    assert preprocessor.df["id"].is_monotonic_increasing
+    assert preprocessor.df["id"].max() > 1000
+    
+    with pytest.raises(ValueError):
+        CSVPreprocessor(file_path, incremental=True)
@@ -0,0 +1,73 @@
+"""Tests for the file probe."""
+import os
+import pytest
+
+from csvdiffgpt.core.probe import FileProbe, vote_separator
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+
+
+def test_vote_separator_ignores_quoted_fields():
+    """Test that separators inside quoted fields do not win the vote."""
+    lines = [
+        'name;comment;score',
+        '"Smith, John";"likes a, b, c";1',
+        '"Doe, Jane";"no commas here";2',
+    ]
+    assert vote_separator(lines) == ';'
+    assert vote_separator(["single column", "values"]) == ','
+
+
+def test_probe_reads_header_and_encoding(temp_csv_dir):
+    """Test that one probe finds the separator, header, encoding and size."""
+    file_path = os.path.join(temp_csv_dir, "bom.csv")
+    with open(file_path, "wb") as f:
+        f.write(b"\xef\xbb\xbfid|name\n1|caf\xc3\xa9\n2|b\n")
+    
+    probe = FileProbe(file_path)
+    
+    assert probe.is_valid
+    assert probe.sep == '|'
+    assert probe.header == ["id", "name"]
+    assert probe.encoding == "utf-8-sig"
+    assert probe.size == os.path.getsize(file_path)
+    assert probe.to_dict()["separator"] == '|'
+
+
+def test_probe_samples_blocks_across_large_files(temp_csv_dir):
+    """Test that the vote uses blocks beyond the head of the file."""
+    file_path = os.path.join(temp_csv_dir, "wide_head.csv")
+    with open(file_path, "w") as f:
+        # A head with a single column, the rest of the file is tab-separated
+        for i in range(50):
+            f.write(f"note {i}\n")
+        for i in range(5000):
+            f.write(f"{i}\tvalue{i}\t{i * 2}\n")
+    
+    assert FileProbe(file_path, sample_size=256).sep == '\t'
+
+
+def test_probe_invalid_files(temp_csv_dir):
+    """Test that probing reports missing and undecodable files instead of raising."""
+    missing = FileProbe(os.path.join(temp_csv_dir, "missing.csv"))
+    assert not missing.is_valid
+    assert "not found" in missing.error
+    
+    binary_path = os.path.join(temp_csv_dir, "binary.csv")
+    with open(binary_path, "wb") as f:
+        f.write(b"\xff\xfe\xfa\x00\x01")
+    binary = FileProbe(binary_path)
+    assert not binary.is_valid
+    assert "Error reading file" in binary.error
+
+
+def test_preprocessor_uses_probe(simple_csv_path):
+    """Test that a probe handed to the preprocessor provides separator and size."""
+    probe = FileProbe(simple_csv_path)
+    preprocessor = CSVPreprocessor(simple_csv_path, probe=probe)
+    
+    assert preprocessor.probe is probe
+    assert preprocessor.sep == probe.sep
+    assert preprocessor.file_size_mb == probe.size_mb
+    
+    with pytest.raises(FileNotFoundError):
+        CSVPreprocessor("missing.csv")
@@ -0,0 +1,127 @@
+"""Tests for the array-backed profile store."""
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt.core.profile_store import ProfileStore, metadata_to_json
+
+
+def test_profile_store_matches_metadata(simple_csv_path):
+    """Test that compact metadata reads like the dictionary metadata."""
+    default = CSVPreprocessor(simple_csv_path).analyze()
+    preprocessor = CSVPreprocessor(simple_csv_path, compact_metadata=True)
+    compact = preprocessor.analyze()
+
+    columns = compact["columns"]
+    assert isinstance(columns, ProfileStore)
+    assert list(columns) == list(default["columns"])
+    for col, col_meta in default["columns"].items():
+        expected = {k: v for k, v in col_meta.items() if k != "examples"}
+        actual = {k: v for k, v in columns[col].items() if k != "examples"}
+        assert actual == expected
+        assert list(columns[col]) == list(col_meta)
+        assert len(columns[col]["examples"]) > 0
+
+    assert "age" in columns
+    assert columns["age"]["min"] == 22 and isinstance(columns["age"]["min"], int)
+    assert columns["name"].get("mean") is None
+
+    # JSON output has the same content as encoding the dictionaries
+    parsed = json.loads(preprocessor.to_json())
+    assert parsed["columns"] == json.loads(json.dumps(columns.to_dict()))
+    assert parsed["total_rows"] == 5
+
+
+def test_profile_store_unusual_values():
+    """Test that values without a typed field are kept as they are."""
+    timestamps = [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-06-30")]
+    fields = {
+        "type": "datetime64[ns]",
+        "nulls": 0,
+        "null_percentage": 0.0,
+        "min": 2 ** 60,
+        "max": None,
+        "examples": timestamps,
+        "source": "parquet"
+    }
+    store = ProfileStore.from_columns({"when": fields})
+
+    assert store["when"] == fields
+    assert list(store["when"]) == list(fields)
+    assert store["when"]["examples"][0] is timestamps[0]
+
+    # Assigned fields are written back to the store
+    store["when"]["nulls"] = 3
+    store["other"] = {"type": "int64", "nulls": 1}
+    del store["when"]["source"]
+    assert store["when"]["nulls"] == 3
+    assert "source" not in store["when"]
+    assert list(store) == ["when", "other"]
+
+    restored = pickle.loads(pickle.dumps(store))
+    assert restored.to_dict() == store.to_dict()
+    assert json.loads(metadata_to_json({"columns": restored}))["columns"]["other"] == {"type": "int64", "nulls": 1}
+
+    del restored["when"]
+    assert list(restored) == ["other"]
+    assert restored["other"]["nulls"] == 1
+
+
+def test_profile_store_reuses_text_buffer():
+    """Test that rewriting a column does not grow the text buffer without bound."""
+    store = ProfileStore.from_columns({
+        col: {"type": "object", "examples": [f"{col}-{i}" for i in range(5)]} for col in ["a", "b", "c"]
+    })
+    size = len(store.text)
+
+    # Text that fits is written over the previous text of the column
+    store["b"]["examples"] = ["short"]
+    assert len(store.text) == size
+    assert store["b"]["examples"] == ["short"]
+
+    # Longer text is appended and the buffer compacted once mostly unused
+    for i in range(200):
+        store["a"]["examples"] = [f"a much longer example {i}"] * (i % 7 + 1)
+        store["a"]["value_distribution"] = {f"value {j}": 1.5 for j in range(i % 5)}
+    assert len(store.text) <= 2 * size + 200
+    assert store["a"]["examples"] == ["a much longer example 199"] * 4
+    assert store["a"]["value_distribution"] == {f"value {j}": 1.5 for j in range(4)}
+    assert store["b"]["examples"] == ["short"]
+    assert store["c"]["examples"] == [f"c-{i}" for i in range(5)]
+
+    del store["c"]
+    store.compact_text()
+    assert store.dead_text == 0
+    assert store.to_dict() == {
+        "a": {"type": "object", "examples": ["a much longer example 199"] * 4,
+              "value_distribution": {f"value {j}": 1.5 for j in range(4)}},
+        "b": {"type": "object", "examples": ["short"]}
+    }
+
+
+def test_profile_store_json_matches_numpy_scalars():
+    """Test that NumPy scalars serialize like the dictionary metadata."""
+    columns = {
+        "a": {
+            "type": "int64",
+            "nulls": np.int64(2),
+            "unique_count": np.int64(3),
+            "min": np.int64(1),
+            "mean": np.float64(1.5),
+            "examples": [np.int64(1), np.int64(2)],
+            "value_distribution": {"1": np.float64(50.0)}
+        },
+        "b": {"type": "bool", "nulls": 0, "examples": [np.bool_(True), "x"]}
+    }
+    store = ProfileStore.from_columns(columns)
+
+    # Examples of NumPy scalars are held as text rather than Python objects
+    assert not store.overflow
+    assert store["a"]["examples"] == [1, 2]
+    parsed = json.loads(metadata_to_json({"columns": store}))
+    assert parsed == json.loads(metadata_to_json({"columns": columns}))
+    assert parsed["columns"]["a"]["nulls"] == 2
+    assert parsed["columns"]["b"]["examples"] == [True, "x"]
@@ -0,0 +1,167 @@
+"""Tests for streaming column profiling."""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt.core.profiler import ColumnAccumulator, StreamingProfiler, profile_chunks
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt.core.incremental import load_state, save_state, state_path_for
+
+
+def test_accumulator_matches_pandas():
+    """Test that accumulated numeric stats match pandas on the same data."""
+    values = pd.Series([1.5, 2.0, np.nan, 7.25, -3.0, 4.0])
+    accumulator = ColumnAccumulator("x")
+    accumulator.update(values)
+    meta = accumulator.to_metadata()
+    
+    assert meta["nulls"] == 1
+    assert meta["min"] == -3.0
+    assert meta["max"] == 7.25
+    assert meta["mean"] == round(values.mean(), 2)
+    assert meta["std"] == round(values.std(), 2)
+
+
+def test_accumulator_merge_equals_single_pass():
+    """Test that merging chunk accumulators gives the same result as one pass."""
+    values = pd.Series(np.random.RandomState(0).normal(10, 3, 1000))
+    single = ColumnAccumulator("x")
+    single.update(values)
+    
+    merged = ColumnAccumulator("x")
+    for start in range(0, 1000, 137):
+        part = ColumnAccumulator("x")
+        part.update(values.iloc[start:start + 137])
+        merged.merge(part)
+    
+    assert merged.count == single.count
+    assert merged.mean == pytest.approx(single.mean)
+    assert merged.m2 == pytest.approx(single.m2)
+    
+    # Quantiles come from sketches, which are only equal up to their rank error
+    merged_meta = merged.to_metadata()
+    single_meta = single.to_metadata()
+    for meta in (merged_meta, single_meta):
+        meta.pop("percentiles")
+    assert merged_meta.pop("median") == pytest.approx(single_meta.pop("median"), abs=0.2)
+    assert merged_meta == single_meta
+
+
+def test_accumulator_string_lengths():
+    """Test string length statistics."""
+    accumulator = ColumnAccumulator("s")
+    accumulator.update(pd.Series(["a", "abc", None]))
+    accumulator.update(pd.Series(["abcdef"]))
+    meta = accumulator.to_metadata()
+    
+    assert meta["nulls"] == 1
+    assert meta["min_length"] == 1
+    assert meta["max_length"] == 6
+    assert meta["avg_length"] == round(10 / 3, 2)
+
+
+def test_accumulator_mixed_kinds_drop_stats():
+    """Test that columns with mixed chunk kinds do not report partial stats."""
+    accumulator = ColumnAccumulator("m")
+    accumulator.update(pd.Series([1, 2, 3]))
+    accumulator.update(pd.Series(["x", "y"]))
+    meta = accumulator.to_metadata()
+    
+    assert "mean" not in meta
+    assert "min_length" not in meta
+
+
+def test_profile_chunks_row_count(simple_csv_path):
+    """Test profiling a chunked CSV reader."""
+    profiler = profile_chunks(pd.read_csv(simple_csv_path, chunksize=2))
+    assert isinstance(profiler, StreamingProfiler)
+    assert profiler.row_count == 5
+    assert profiler.column_metadata()["age"]["max"] == 45
+
+
+def test_preprocessor_streaming_matches_sample(simple_csv_path):
+    """Test that streaming mode covers the whole file and matches in-memory stats."""
+    in_memory = CSVPreprocessor(simple_csv_path).analyze()
+    streamed = CSVPreprocessor(simple_csv_path, streaming=True, chunk_size=2).analyze()
+    
+    assert streamed["profile_mode"] == "streaming"
+    assert streamed["total_rows"] == 5
+    for col in ["age", "score"]:
+        for stat in ["nulls", "min", "max", "mean", "std"]:
+            assert streamed["columns"][col][stat] == in_memory["columns"][col][stat]
+    assert streamed["columns"]["name"]["max_length"] == in_memory["columns"]["name"]["max_length"]
+
+
+def test_preprocessor_streaming_uses_whole_file(temp_csv_dir):
+    """Test that streaming stats are not limited to max_rows_analyzed."""
+    file_path = os.path.join(temp_csv_dir, "long.csv")
+    pd.DataFrame({"v": range(100)}).to_csv(file_path, index=False)
+    
+    metadata = CSVPreprocessor(file_path, max_rows_analyzed=10, streaming=True, chunk_size=7).analyze()
+    
+    assert metadata["analyzed_rows"] == 10
+    assert metadata["columns"]["v"]["max"] == 99
+    assert metadata["columns"]["v"]["mean"] == 49.5
+
+
+def test_profiler_state_round_trip():
+    """Test that a profiler rebuilt from its state gives the same metadata."""
+    profiler = profile_chunks([pd.DataFrame({"x": [1.5, None, 3.0], "s": ["a", "bb", None]})])
+    restored = StreamingProfiler.from_state(profiler.to_state())
+    
+    assert restored.row_count == profiler.row_count
+    assert restored.column_metadata() == profiler.column_metadata()
+
+
+def test_preprocessor_incremental_appends(temp_csv_dir):
+    """Test that an incremental run only profiles appended rows and matches a full pass."""
+    file_path = os.path.join(temp_csv_dir, "log.csv")
+    pd.DataFrame({"v": range(100), "s": ["x"] * 100}).to_csv(file_path, index=False)
+    
+    CSVPreprocessor(file_path, incremental=True, chunk_size=7).analyze()
+    first_offset = os.path.getsize(file_path)
+    
+    with open(file_path, "a") as f:
+        for i in range(100, 150):
+            f.write(f"{i},longer\n")
+    
+    state = load_state(file_path, {"sep": ",", "columns": ["v", "s"], "usecols": None})
+    assert state["offset"] == first_offset
+    assert state["profiler"].row_count == 100
+    
+    incremental = CSVPreprocessor(file_path, incremental=True, chunk_size=7).analyze()
+    full = CSVPreprocessor(file_path, streaming=True).analyze()
+    
+    assert incremental["total_rows"] == 150
+    for col in ["v", "s"]:
+        for stat, value in full["columns"][col].items():
+            if stat != "examples":
+                assert incremental["columns"][col][stat] == value
+
+
+def test_preprocessor_incremental_rescans_changed_file(temp_csv_dir):
+    """Test that a file changed before the saved offset is profiled from the start."""
+    file_path = os.path.join(temp_csv_dir, "rewritten.csv")
+    pd.DataFrame({"v": range(100)}).to_csv(file_path, index=False)
+    CSVPreprocessor(file_path, incremental=True).analyze()
+    
+    pd.DataFrame({"v": range(1000, 1200)}).to_csv(file_path, index=False)
+    metadata = CSVPreprocessor(file_path, incremental=True).analyze()
+    
+    assert os.path.exists(state_path_for(file_path))
+    assert metadata["total_rows"] == 200
+    assert metadata["columns"]["v"]["min"] == 1000
+
+
+def test_save_state_serializes_numpy_values(temp_csv_dir):
+    """Test that state holding NumPy scalars is saved instead of silently dropped."""
+    file_path = os.path.join(temp_csv_dir, "numpy_params.csv")
+    pd.DataFrame({"v": range(10)}).to_csv(file_path, index=False)
+    profiler = profile_chunks([pd.read_csv(file_path)])
+    
+    save_state(file_path, {"max_rows": np.int64(10)}, os.path.getsize(file_path), profiler)
+    
+    state = load_state(file_path, {"max_rows": 10})
+    assert state is not None
+    assert state["profiler"].row_count == 10
@@ -0,0 +1,137 @@
+"""Tests for non-CSV input readers."""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt.readers import get_reader, pandas_read_code, sample_chunks, NdjsonReader
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt import summarize_raw, validate_raw
+
+
+@pytest.fixture
+def sample_frame():
+    """Create a DataFrame with numeric, string and missing values."""
+    return pd.DataFrame({
+        "id": np.arange(1000),
+        "score": np.where(np.arange(1000) % 10 == 0, np.nan, np.arange(1000) * 0.5),
+        "label": [f"item{i % 7}" for i in range(1000)]
+    })
+
+
+def test_get_reader_by_extension(temp_csv_dir):
+    """Test that readers are chosen by extension, including compressed NDJSON."""
+    assert get_reader(os.path.join(temp_csv_dir, "data.csv")) is None
+    assert isinstance(get_reader(os.path.join(temp_csv_dir, "data.jsonl.gz")), NdjsonReader)
+    assert pandas_read_code("data.jsonl", {"format": "ndjson"}) == "pd.read_json('data.jsonl', lines=True)"
+    assert pandas_read_code("data.csv", {"separator": ";"}) == "pd.read_csv('data.csv', sep=';')"
+
+
+def test_sample_chunks_is_uniform_and_ordered():
+    """Test that sampling chunks keeps file order and counts every row."""
+    chunks = (pd.DataFrame({"v": range(start, start + 100)}) for start in range(0, 1000, 100))
+    sample, row_total = sample_chunks(chunks, 50, random_state=0)
+
+    assert row_total == 1000
+    assert len(sample) == 50
+    assert sample["v"].is_monotonic_increasing
+    assert sample["v"].max() > 500
+
+
+def test_ndjson_reader(temp_csv_dir, sample_frame):
+    """Test reading NDJSON files through the preprocessor."""
+    file_path = os.path.join(temp_csv_dir, "data.jsonl")
+    sample_frame.to_json(file_path, orient="records", lines=True)
+
+    metadata = CSVPreprocessor(file_path, max_rows_analyzed=100, max_cols_analyzed=2).analyze()
+
+    assert metadata["format"] == "ndjson"
+    assert metadata["total_rows"] == 1000
+    assert metadata["analyzed_rows"] == 100
+    assert list(metadata["columns"]) == ["id", "score"]
+
+
+def test_parquet_reader_uses_footer_statistics(temp_csv_dir, sample_frame):
+    """Test row group reads and full-file statistics from the Parquet footer."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    file_path = os.path.join(temp_csv_dir, "data.parquet")
+    pq.write_table(pa.Table.from_pandas(sample_frame, preserve_index=False), file_path, row_group_size=100)
+
+    reader = get_reader(file_path)
+    assert reader.count_rows() == 1000
+    assert list(reader.read(columns=["label"], nrows=150).columns) == ["label"]
+
+    sample = reader.sample(250, random_state=1)
+    assert len(sample) == 250
+    assert sample["id"].is_monotonic_increasing
+
+    metadata = summarize_raw(file_path, max_rows_analyzed=100)
+    assert metadata["format"] == "parquet"
+    assert metadata["analyzed_rows"] == 100
+    # Statistics cover the whole file, not only the analyzed rows
+    assert metadata["columns"]["id"]["max"] == 999
+    assert metadata["columns"]["score"]["nulls"] == 100
+    assert metadata["columns"]["score"]["null_percentage"] == 10.0
+    assert metadata["columns"]["score"]["sample_nulls"] == 10
+
+
+def test_parquet_footer_nulls_keep_unique_ratios(temp_csv_dir):
+    """Test that whole-file null counts from the footer do not skew sample unique ratios."""
+    pytest.importorskip("pyarrow")
+
+    # 24% nulls and 257 categories
+    cats = [None if i % 25 < 6 else f"c{i % 257}" for i in range(20000)]
+    file_path = os.path.join(temp_csv_dir, "long.parquet")
+    pd.DataFrame({"id": np.arange(20000), "cat": cats}).to_parquet(file_path, row_group_size=1000)
+
+    result = validate_raw(file_path, max_rows_analyzed=5000)
+    assert result["issues"]["high_cardinality"] == []
+    missing = next(item for item in result["issues"]["missing_values"] if item["column"] == "cat")
+    assert missing["null_count"] == 4800
+
+
+def test_feather_reader_matches_csv(temp_csv_dir, sample_frame):
+    """Test that a Feather file gives the same metadata as the same data in CSV."""
+    pytest.importorskip("pyarrow")
+
+    feather_path = os.path.join(temp_csv_dir, "data.feather")
+    csv_path = os.path.join(temp_csv_dir, "data.csv")
+    sample_frame.to_feather(feather_path)
+    sample_frame.to_csv(csv_path, index=False)
+
+    from_feather = validate_raw(feather_path)
+    from_csv = validate_raw(csv_path)
+
+    assert from_feather["summary"] == from_csv["summary"]
+    assert from_feather["file_info"]["total_rows"] == 1000
+
+
+def test_feather_reader_closes_file_and_samples_batches(temp_csv_dir, sample_frame):
+    """Test that reads release the file and a sample only loads the batches it needs."""
+    pa = pytest.importorskip("pyarrow")
+
+    feather_path = os.path.join(temp_csv_dir, "data.feather")
+    table = pa.Table.from_pandas(sample_frame, preserve_index=False)
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(feather_path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        for batch in table.to_batches(max_chunksize=100):
+            writer.write_batch(batch)
+
+    reader = get_reader(feather_path)
+    sample = reader.sample(150, random_state=0)
+    # Two batches of 100 rows hold enough rows, the others are not loaded
+    assert len(sample) == 150
+    assert len(set(sample["id"] // 100)) == 2
+    assert sample["id"].is_monotonic_increasing
+
+    assert reader.count_rows() == 1000
+    assert len(reader.read(nrows=10)) == 10
+    assert sum(len(chunk) for chunk in reader.iter_chunks(chunk_size=64)) == 1000
+    # No handle stays open, so the file can be replaced and removed
+    if os.path.isdir("/proc/self/fd"):
+        handles = [os.readlink(os.path.join("/proc/self/fd", fd)) for fd in os.listdir("/proc/self/fd")
+                   if os.path.exists(os.path.join("/proc/self/fd", fd))]
+        assert os.path.abspath(feather_path) not in handles
+    os.remove(feather_path)
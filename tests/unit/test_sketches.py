@@ -0,0 +1,103 @@
+"""Tests for probabilistic sketches."""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from csvdiffgpt.core.sketches import HyperLogLog, KLLSketch, approx_distinct
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt import validate_raw
+
+
+@pytest.mark.parametrize("n", [0, 1, 50, 5000, 200000])
+def test_hyperloglog_accuracy(n):
+    """Test that estimates stay within a few standard errors of the exact count."""
+    values = pd.Series([f"user-{i}" for i in range(n)] * 2)
+    estimate = approx_distinct(values, error_rate=0.01)
+    
+    assert abs(estimate - n) <= max(1, 0.04 * n)
+
+
+def test_hyperloglog_merge_and_state():
+    """Test that merged sketches equal a sketch of all values and survive serialization."""
+    values = pd.Series(np.arange(30000))
+    full = HyperLogLog()
+    full.update(values)
+    
+    first = HyperLogLog()
+    first.update(values[:20000])
+    second = HyperLogLog()
+    # Integers and floats of the same value hash equally
+    second.update(values[10000:].astype(float))
+    first.merge(second)
+    
+    assert first.count() == full.count()
+    assert HyperLogLog.from_state(first.to_state()).count() == full.count()
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(error_rate=0.05))
+
+
+def test_hyperloglog_ignores_nulls():
+    """Test that nulls are not counted as a distinct value."""
+    assert approx_distinct(pd.Series(["a", None, "b", "a", np.nan])) == 2
+
+
+def test_preprocessor_approx_distinct_streaming(temp_csv_dir):
+    """Test that streaming mode gives full-file approximate distinct counts."""
+    file_path = os.path.join(temp_csv_dir, "events.csv")
+    pd.DataFrame({
+        "event_id": [f"e{i:06d}" for i in range(20000)],
+        "kind": [f"k{i % 4}" for i in range(20000)]
+    }).to_csv(file_path, index=False)
+    
+    metadata = CSVPreprocessor(
+        file_path, max_rows_analyzed=1000, streaming=True, chunk_size=3000, approx_distinct=True
+    ).analyze()
+    
+    assert metadata["unique_counts"]["rows"] == 20000
+    assert abs(metadata["columns"]["event_id"]["unique_count"] - 20000) <= 800
+    assert metadata["columns"]["kind"]["unique_count"] == 4
+    
+    results = validate_raw(file_path, max_rows_analyzed=1000, streaming=True, approx_distinct=True)
+    assert [issue["column"] for issue in results["issues"]["high_cardinality"]] == ["event_id"]
+
+
+def test_kll_quantiles_and_merge():
+    """Test that quantile estimates stay within the rank error, also after merging."""
+    values = np.random.default_rng(0).lognormal(size=200000)
+    sorted_values = np.sort(values)
+    
+    single = KLLSketch()
+    for chunk in np.array_split(values, 7):
+        single.update(chunk)
+    merged = KLLSketch()
+    for chunk in np.array_split(values, 3):
+        part = KLLSketch()
+        part.update(chunk)
+        merged.merge(part)
+    
+    for sketch in (single, merged, KLLSketch.from_state(merged.to_state())):
+        assert sketch.count == len(values)
+        assert sketch.quantile(0) == values.min()
+        assert sketch.quantile(1) == values.max()
+        for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+            rank = np.searchsorted(sorted_values, sketch.quantile(q)) / len(values)
+            assert abs(rank - q) < 0.02
+
+
+def test_preprocessor_streaming_quantiles(temp_csv_dir):
+    """Test that streaming mode reports full-file median and percentiles."""
+    file_path = os.path.join(temp_csv_dir, "values.csv")
+    pd.DataFrame({"v": np.arange(10000)}).to_csv(file_path, index=False)
+    
+    preprocessor = CSVPreprocessor(file_path, max_rows_analyzed=100, streaming=True, chunk_size=1000)
+    metadata = preprocessor.analyze()
+    column = metadata["columns"]["v"]
+    
+    # The first 100 rows alone would give a median of 49.5
+    assert abs(column["median"] - 5000) < 200
+    assert abs(column["percentiles"]["p95"] - 9500) < 200
+    assert abs(preprocessor.quantile("v", 0.99) - 9900) < 200
+    
+    sample = CSVPreprocessor(file_path, max_rows_analyzed=100).analyze()
+    assert sample["columns"]["v"]["percentiles"]["p25"] == 24.75
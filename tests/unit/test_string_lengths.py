@@ -0,0 +1,50 @@
+"""Tests for the shared string length statistics."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from csvdiffgpt.core.preprocessor import CSVPreprocessor
+from csvdiffgpt.core.string_lengths import value_lengths, string_length_summary
+from csvdiffgpt.tasks.validate import run_validation
+
+
+@pytest.mark.parametrize("dtype", [object, "string", "category"])
+def test_string_length_summary(dtype):
+    """Test that every string representation is measured like Series.str.len."""
+    values = pd.Series(["a", "日本語", None, "abcdef", "a"], dtype=dtype)
+    summary = string_length_summary(values)
+    lengths = values.dropna().astype(str).str.len()
+
+    assert summary["nulls"] == 1
+    assert summary["count"] == 4
+    assert summary["min_length"] == 1
+    assert summary["max_length"] == 6
+    assert summary["avg_length"] == pytest.approx(lengths.mean())
+    assert summary["std_length"] == pytest.approx(lengths.std())
+
+    # Values that are not strings have no length unless measured as strings
+    mixed = pd.Series(["ab", 12345, None], dtype=object)
+    assert np.isnan(value_lengths(mixed.dropna())).tolist() == [False, True]
+    assert string_length_summary(mixed, as_str=True)["max_length"] == 5
+
+
+def test_arrow_string_lengths():
+    """Test that Arrow-backed strings are measured in characters."""
+    pytest.importorskip("pyarrow")
+    values = pd.Series(["a", "日本語", None], dtype="string[pyarrow]")
+    summary = string_length_summary(values)
+
+    assert (summary["nulls"], summary["count"]) == (1, 2)
+    assert (summary["min_length"], summary["max_length"]) == (1, 3)
+
+
+def test_lengths_shared_by_metadata_and_validation(simple_csv_path):
+    """Test that validation reuses the lengths measured for the metadata."""
+    preprocessor = CSVPreprocessor(simple_csv_path)
+    metadata = preprocessor.analyze()
+    assert metadata["columns"]["name"]["max_length"] > 0
+
+    measured = preprocessor.length_stats["name"]
+    run_validation(preprocessor)
+    assert preprocessor.length_stats["name"] is measured
+    assert measured["max_length"] == metadata["columns"]["name"]["max_length"]
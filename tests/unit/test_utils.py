@@ -1,9 +1,16 @@
 """Tests for core utility functions."""
 import os
+import gzip
+import bz2
 import pytest
 import tempfile
+import numpy as np
+import pandas as pd
 
-from csvdiffgpt.core.utils import detect_separator, validate_file, get_file_size_mb
+from csvdiffgpt.core.utils import (
+    detect_separator, validate_file, get_file_size_mb, count_rows, is_numeric_type, is_string_type,
+    ROW_COUNT_CACHE_SIZE, _count_file_rows
+)
 
 
 def test_detect_separator_comma():
@@ -84,4 +91,97 @@ def test_get_file_size_mb():
         # Allow small variation due to filesystem overhead
         assert 0.9 <= size_mb <= 1.1
     finally:
-        os.unlink(temp_path)
\ No newline at end of file
+        os.unlink(temp_path)
+
+
+def test_count_rows(temp_csv_file):
+    """Test counting data rows in a CSV file."""
+    assert count_rows(temp_csv_file) == 3
+
+
+def test_count_rows_without_trailing_newline():
+    """Test that a final line without a newline is counted."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        f.write("a,b\n1,2\n3,4")
+        temp_path = f.name
+    
+    try:
+        assert count_rows(temp_path) == 2
+    finally:
+        os.unlink(temp_path)
+
+
+def test_count_rows_quote_aware():
+    """Test that quote-aware counting ignores newlines inside quoted fields."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        f.write('id,text\n1,"line one\nline two"\n2,"say ""hi""\nagain"\n3,plain\n')
+        temp_path = f.name
+    
+    try:
+        # Small blocks split quoted fields across block boundaries
+        assert count_rows(temp_path, quote_aware=True, block_size=5, workers=4) == 3
+        assert count_rows(temp_path, block_size=5, workers=4) == 5
+    finally:
+        os.unlink(temp_path)
+
+
+def test_count_rows_parallel_blocks():
+    """Test that counting across threads matches a single-threaded count."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        f.write("x,y\n")
+        for i in range(1000):
+            f.write(f"{i},{i * 2}\n")
+        temp_path = f.name
+    
+    try:
+        assert count_rows(temp_path, workers=1, block_size=97) == 1000
+        assert count_rows(temp_path, workers=4, block_size=97, quote_aware=True) == 1000
+    finally:
+        os.unlink(temp_path)
+
+
+def test_count_rows_cache_is_bounded(temp_csv_dir):
+    """Test that cached row counts are bounded and follow changes to the file."""
+    file_path = os.path.join(temp_csv_dir, "grow.csv")
+    with open(file_path, 'w') as f:
+        f.write("a,b\n1,2\n")
+    
+    assert count_rows(file_path) == 1
+    with open(file_path, 'a') as f:
+        f.write("3,4\n")
+    assert count_rows(file_path) == 2
+    
+    for i in range(ROW_COUNT_CACHE_SIZE + 10):
+        other_path = os.path.join(temp_csv_dir, f"other_{i}.csv")
+        with open(other_path, 'w') as f:
+            f.write("a\n1\n")
+        count_rows(other_path)
+    assert _count_file_rows.cache_info().currsize <= ROW_COUNT_CACHE_SIZE
+
+
+@pytest.mark.parametrize("suffix,module", [(".csv.gz", gzip), (".csv.bz2", bz2)])
+def test_compressed_file_helpers(temp_csv_dir, suffix, module):
+    """Test separator detection, validation and row counting on decompressed contents."""
+    file_path = os.path.join(temp_csv_dir, "data" + suffix)
+    with module.open(file_path, 'wt') as f:
+        f.write('id;text\n1;"line one\nline two"\n2;plain\n3;end')
+    
+    assert detect_separator(file_path) == ';'
+    assert validate_file(file_path) == (True, None)
+    # Small blocks split quoted fields across block boundaries
+    assert count_rows(file_path, quote_aware=True, block_size=5) == 3
+    assert count_rows(file_path, block_size=5) == 4
+
+
+def test_dtype_helpers():
+    """Test numeric and string type detection from dtypes and type names."""
+    assert is_numeric_type("int64")
+    assert is_numeric_type(np.dtype("float32"))
+    assert not is_numeric_type("bool")
+    assert not is_numeric_type("object")
+    assert not is_numeric_type("string")
+    
+    assert is_string_type("object")
+    assert is_string_type("string")
+    assert is_string_type(pd.StringDtype())
+    assert not is_string_type("int64")
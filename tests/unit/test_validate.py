@@ -75,6 +75,21 @@ def test_validate_with_llm(simple_csv_path, monkeypatch):
     
     # Check that the mock was called
     assert mock_provider.query.called
+    
+    # The file is probed once and the prompt gets the same results as validate_raw
+    from csvdiffgpt.tasks import validate as validate_module
+    probes = []
+    original_probe = validate_module.FileProbe
+    
+    def counting_probe(file_path, *args, **kwargs):
+        probes.append(file_path)
+        return original_probe(file_path, *args, **kwargs)
+    
+    monkeypatch.setattr(validate_module, "FileProbe", counting_probe)
+    validate(file=simple_csv_path, provider='gemini', api_key='fake-key')
+    assert probes == [simple_csv_path]
+    prompt_data = mock_provider.format_prompt.call_args[0][1]
+    assert prompt_data["metadata"] == validate_module.validate_raw(simple_csv_path)
 
 
 def test_validate_without_llm(simple_csv_path):
@@ -170,4 +185,22 @@ def test_validate_missing_values():
     finally:
         # Clean up
         if os.path.exists('temp_missing.csv'):
-            os.remove('temp_missing.csv')
\ No newline at end of file
+            os.remove('temp_missing.csv')
+
+def test_validate_cardinality_with_streaming(tmp_path):
+    """Test that unique ratios use the nulls of the rows the unique counts cover."""
+    file_path = tmp_path / "long.csv"
+    with open(file_path, 'w') as f:
+        f.write("id,cat\n")
+        for i in range(20000):
+            # 24% nulls and 257 categories
+            f.write(f"{i},{'' if i % 25 < 6 else f'c{i % 257}'}\n")
+    
+    sampled = validate_raw(str(file_path), max_rows_analyzed=5000)
+    streamed = validate_raw(str(file_path), max_rows_analyzed=5000, streaming=True)
+    assert sampled["issues"]["high_cardinality"] == []
+    assert streamed["issues"]["high_cardinality"] == []
+    
+    # Missing values are still counted over the whole file
+    missing = next(item for item in streamed["issues"]["missing_values"] if item["column"] == "cat")
+    assert missing["null_count"] == 4800